@@ -0,0 +1,64 @@
+import numpy as np
+
+# Degrés couverts par le corpus
+DEGREES = (2, 3, 5, 10, 20, 50, 100)
+# Densité : tous les coefficients non nuls, ou quelques termes seulement
+DENSITIES = ("dense", "sparse")
+# Taille des coefficients entiers : |c| <= 9, ou jusqu'à 10^12
+COEFFICIENT_SIZES = {"small": 9, "large": 10 ** 12}
+# Nombre de termes non nuls (hors terme dominant et constante) d'un polynôme creux
+SPARSE_TERMS = 3
+
+
+def format_polynomial(coefficients):
+    """Écrit un polynôme (coefficients entiers, degré décroissant) sous la forme `3*x^4 - 2*x + 7`."""
+    degree = len(coefficients) - 1
+    terms = []
+    for power, coefficient in zip(range(degree, -1, -1), coefficients):
+        if coefficient == 0:
+            continue
+        sign = "-" if coefficient < 0 else "+"
+        magnitude = abs(int(coefficient))
+        if power == 0:
+            body = str(magnitude)
+        else:
+            monomial = "x" if power == 1 else f"x^{power}"
+            body = monomial if magnitude == 1 else f"{magnitude}*{monomial}"
+        terms.append((sign, body))
+    if not terms:
+        return "0"
+    first_sign, first_body = terms[0]
+    text = ("-" if first_sign == "-" else "") + first_body
+    return text + "".join(f" {sign} {body}" for sign, body in terms[1:])
+
+
+def generate_corpus(seed=42, per_bucket=5, degrees=DEGREES):
+    """
+    Corpus reproductible de polynômes à coefficients entiers, réparti en classes
+    `d<degré>-<densité>-<taille>` ; chaque élément porte son équation et ses coefficients.
+    """
+    rng = np.random.default_rng(seed)
+    corpus = []
+    for degree in degrees:
+        for density in DENSITIES:
+            for size_name, bound in COEFFICIENT_SIZES.items():
+                bucket = f"d{degree}-{density}-{size_name}"
+                for _ in range(per_bucket):
+                    values = rng.integers(-bound, bound, size=degree + 1, endpoint=True)
+                    if density == "sparse" and degree > SPARSE_TERMS + 1:
+                        # Terme dominant, constante et quelques termes intermédiaires
+                        keep = np.zeros(degree + 1, dtype=bool)
+                        keep[[0, degree]] = True
+                        keep[rng.choice(np.arange(1, degree), SPARSE_TERMS, replace=False)] = True
+                        values = np.where(keep, values, 0)
+                    # Le terme dominant et la constante ne sont jamais nuls
+                    values[0] = values[0] or 1
+                    values[-1] = values[-1] or 1
+                    coefficients = [int(value) for value in values]
+                    corpus.append({
+                        "bucket": bucket,
+                        "degree": degree,
+                        "equation": format_polynomial(coefficients),
+                        "coefficients": coefficients,
+                    })
+    return corpus
@@ -0,0 +1,295 @@
+"""
+Test de charge de bout en bout des six services Python.
+
+    python benchmarks/load_test.py --rate 40 --duration 30 --mix recommend_solve=4,plot=1,plot_points=2,factor=2,roots=2
+
+Les services sont lancés en sous-processus sur des bases SQLite et un registre Eureka local
+(`EurekaStub`), sauf avec --no-start (services déjà démarrés). Les requêtes arrivent à débit fixe
+(boucle ouverte : la latence est mesurée depuis l'instant d'arrivée prévu, attente côté client
+comprise). Une fraction --repeat-ratio des requêtes réutilise un petit ensemble d'équations
+« chaudes » pour exercer les caches. Le rapport donne, par endpoint et par parcours, le débit,
+les percentiles de latence et le taux d'erreur.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np  # noqa: E402
+import requests  # noqa: E402
+from requests.adapters import HTTPAdapter  # noqa: E402
+
+from corpus import format_polynomial  # noqa: E402
+from polynome_commun.eureka import EurekaStub  # noqa: E402
+
+# Dossier, port et route de santé de chaque service
+SERVICES = {
+    "factorisation": ("service-factorisation-py", 5000, "/factoriser/health"),
+    "newton": ("service-newton-py", 5001, "/newton/health"),
+    "racines": ("service-racines-py", 5002, "/racines/health"),
+    "quadratique": ("service-quadratique-py", 5003, "/quadratique/health"),
+    "graph": ("service-graph", 5004, "/plot/health"),
+    "recommendation": ("service-recommendation-py", 5006, "/recommend/health"),
+}
+
+DEFAULT_MIX = "recommend_solve=4,plot=1,plot_points=2,factor=2,roots=2"
+# Taille de l'ensemble d'équations réutilisées
+HOT_SET_SIZE = 20
+
+
+def start_services(host, registry_url, workdir, server_mode, ready_timeout):
+    """Lance chaque service dans son dossier avec une base SQLite dédiée ; attend sa route de santé."""
+    processes = {}
+    for name, (directory, port, _) in SERVICES.items():
+        env = dict(
+            os.environ,
+            POLYNOME_DATABASE_URL=f"sqlite:///{os.path.join(workdir, name + '.db')}",
+            POLYNOME_EUREKA_SERVER=registry_url,
+            POLYNOME_SERVER_MODE=server_mode,
+            POLYNOME_MIGRATE_ON_START="1",  # Tables créées au lancement sur la base SQLite vierge
+        )
+        log = open(os.path.join(workdir, name + ".log"), "w")
+        processes[name] = subprocess.Popen(
+            [sys.executable, "app.py"], cwd=os.path.join(BACKEND, directory), env=env, stdout=log, stderr=log
+        )
+
+    ready = {}
+    expires = time.monotonic() + ready_timeout
+    for name, (_, port, health) in SERVICES.items():
+        while time.monotonic() < expires and processes[name].poll() is None:
+            try:
+                if requests.get(f"http://{host}:{port}{health}", timeout=1).status_code == 200:
+                    ready[name] = True
+                    break
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        if not ready.get(name):
+            print(f"Service {name} indisponible (journal : {os.path.join(workdir, name + '.log')})")
+    return processes, ready
+
+
+def startup_times(host):
+    """Temps de démarrage publiés par chaque service (GET <prefix>/startup), en secondes."""
+    times = {}
+    for name, (_, port, health) in SERVICES.items():
+        try:
+            response = requests.get(f"http://{host}:{port}{health.rsplit('/', 1)[0]}/startup", timeout=2)
+            if response.status_code == 200:
+                times[name] = response.json()
+        except requests.RequestException:
+            pass
+    return times
+
+
+def stop_services(processes):
+    for process in processes.values():
+        if process.poll() is None:
+            process.terminate()
+    for process in processes.values():
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+class Recorder:
+    """Latences et erreurs par endpoint (appels HTTP) et par parcours (enchaînements d'appels)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+
+    def record(self, name, latency, ok):
+        with self._lock:
+            self.samples.setdefault(name, []).append((latency, ok))
+
+    def report(self, duration):
+        report = {}
+        with self._lock:
+            samples = dict(self.samples)
+        for name, values in sorted(samples.items()):
+            latencies = np.array([latency for latency, _ in values]) * 1000
+            errors = sum(1 for _, ok in values if not ok)
+            report[name] = {
+                "count": len(values),
+                "throughput_rps": round(len(values) / duration, 2),
+                "error_rate": round(errors / len(values), 4),
+                "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+                "p90_ms": round(float(np.percentile(latencies, 90)), 2),
+                "p99_ms": round(float(np.percentile(latencies, 99)), 2),
+                "max_ms": round(float(latencies.max()), 2),
+            }
+        return report
+
+
+class Traffic:
+    """Génère les parcours du mélange de trafic et les exécute contre les services."""
+
+    def __init__(self, host, recorder, repeat_ratio, seed):
+        self.host = host
+        self.recorder = recorder
+        self.repeat_ratio = repeat_ratio
+        self.rng = np.random.default_rng(seed)
+        self._rng_lock = threading.Lock()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(SERVICES), pool_maxsize=256)
+        self.session.mount("http://", adapter)
+        self.hot_set = [self._random_coefficients() for _ in range(HOT_SET_SIZE)]
+
+    def _random_coefficients(self):
+        # Surtout des degrés 2 et 3 (trafic réel), parfois jusqu'au degré 10
+        degree = int(self.rng.choice([2, 2, 2, 3, 3, 4, 5, 10]))
+        coefficients = self.rng.integers(-9, 9, size=degree + 1, endpoint=True)
+        coefficients[0] = coefficients[0] or 1
+        return [int(c) for c in coefficients]
+
+    def coefficients(self):
+        with self._rng_lock:
+            if self.rng.random() < self.repeat_ratio:
+                return self.hot_set[int(self.rng.integers(len(self.hot_set)))]
+            return self._random_coefficients()
+
+    def call(self, endpoint, service, path, payload):
+        start = time.perf_counter()
+        try:
+            response = self.session.post(f"http://{self.host}:{SERVICES[service][1]}{path}", json=payload, timeout=60)
+            ok = response.status_code < 400
+            body = response.json() if ok and response.headers.get("Content-Type", "").startswith("application/json") else None
+        except (requests.RequestException, ValueError):
+            ok, body = False, None
+        self.recorder.record(endpoint, time.perf_counter() - start, ok)
+        return ok, body
+
+    def recommend_solve(self):
+        # Parcours des clients : recommandation puis appel du solveur recommandé
+        coefficients = self.coefficients()
+        equation = format_polynomial(coefficients)
+        ok, body = self.call("POST /recommend", "recommendation", "/recommend", {"polynomial": equation})
+        if not ok:
+            return False
+        if body.get("recommended_method") == "Quadratique" and len(coefficients) == 3:
+            a, b, c = coefficients
+            ok, _ = self.call("POST /quadratique", "quadratique", "/quadratique", {"a": a, "b": b, "c": c})
+        else:
+            ok, _ = self.call("POST /newton", "newton", "/newton", {"equation": equation, "initial_guess": 1.0})
+        return ok
+
+    def solve(self):
+        # Parcours combiné : recommandation et solveur en un seul appel
+        equation = format_polynomial(self.coefficients())
+        return self.call("POST /solve", "recommendation", "/solve", {"equation": equation, "initial_guess": 1.0})[0]
+
+    def plot(self):
+        equation = format_polynomial(self.coefficients())
+        return self.call("POST /plot", "graph", "/plot", {"equation": equation})[0]
+
+    def plot_points(self):
+        equation = format_polynomial(self.coefficients())
+        return self.call("POST /plot/points", "graph", "/plot/points", {"equation": equation})[0]
+
+    def factor(self):
+        equation = format_polynomial(self.coefficients())
+        return self.call("POST /factoriser", "factorisation", "/factoriser", {"equation": equation})[0]
+
+    def roots(self):
+        equation = format_polynomial(self.coefficients())
+        return self.call("POST /racines", "racines", "/racines", {"equation": equation})[0]
+
+    def run_flow(self, flow, scheduled):
+        ok = getattr(self, flow)()
+        # Latence du parcours depuis l'arrivée prévue : l'attente d'un thread libre est comptée
+        self.recorder.record(f"flow {flow}", time.perf_counter() - scheduled, ok)
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("recommend_solve", "solve", "plot", "plot_points", "factor", "roots"):
+            raise SystemExit(f"Parcours inconnu : {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def generate_load(traffic, mix, rate, duration, concurrency, seed):
+    """Arrivées à intervalles fixes (1/rate) ; chaque arrivée exécute un parcours tiré selon le mélange."""
+    flows = list(mix)
+    weights = np.array([mix[flow] for flow in flows])
+    rng = np.random.default_rng(seed + 1)
+    choices = rng.choice(len(flows), size=int(rate * duration), p=weights / weights.sum())
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for index, choice in enumerate(choices):
+            scheduled = start + index / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(traffic.run_flow, flows[choice], scheduled)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Test de charge des services Python.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--rate", type=float, default=20, help="arrivées par seconde")
+    parser.add_argument("--duration", type=float, default=20, help="durée en secondes")
+    parser.add_argument("--concurrency", type=int, default=64, help="requêtes simultanées côté client")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="poids des parcours")
+    parser.add_argument("--repeat-ratio", type=float, default=0.5, help="part des équations réutilisées")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--server-mode", default="dev", choices=("dev", "prod"))
+    parser.add_argument("--no-start", action="store_true", help="utiliser des services déjà démarrés")
+    parser.add_argument("--ready-timeout", type=float, default=120)
+    parser.add_argument("--output", help="fichier JSON du rapport")
+    arguments = parser.parse_args(argv)
+
+    mix = parse_mix(arguments.mix)
+    processes, registry = {}, None
+    workdir = tempfile.mkdtemp(prefix="polynome-load-")
+    try:
+        if not arguments.no_start:
+            registry = EurekaStub(arguments.host)
+            registry_url = registry.start()
+            processes, _ = start_services(arguments.host, registry_url, workdir, arguments.server_mode,
+                                          arguments.ready_timeout)
+
+        recorder = Recorder()
+        traffic = Traffic(arguments.host, recorder, arguments.repeat_ratio, arguments.seed)
+        elapsed = generate_load(traffic, mix, arguments.rate, arguments.duration, arguments.concurrency,
+                                arguments.seed)
+        report = {
+            "config": {**vars(arguments), "mix": mix},
+            "registered": sorted(registry.applications()) if registry else None,
+            "startup": startup_times(arguments.host),
+            "results": recorder.report(elapsed),
+        }
+    finally:
+        stop_services(processes)
+        if registry is not None:
+            registry.stop()
+
+    for name, stats in report["startup"].items():
+        print(f"{name:22} importé en {stats['import_seconds']:.2f} s, prêt en {stats['ready_seconds'] or 0:.2f} s")
+    for name, stats in report["results"].items():
+        print(f"{name:22} {stats['count']:6d} req  {stats['throughput_rps']:7.2f} req/s  "
+              f"p50={stats['p50_ms']:8.2f} ms  p99={stats['p99_ms']:8.2f} ms  erreurs={stats['error_rate']:.2%}")
+    print(f"Journaux des services : {workdir}")
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
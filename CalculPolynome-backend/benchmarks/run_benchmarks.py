@@ -0,0 +1,248 @@
+"""
+Bancs d'essai des solveurs sur un corpus gradué (degré, densité, taille des coefficients).
+
+    python benchmarks/run_benchmarks.py --output benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json --threshold 1.25
+
+Chaque appel mesure le chemin « à froid » : les caches de résultats et d'expressions sont vidés
+avant chaque mesure. Les écritures en base vont dans une base SQLite temporaire et les calculs
+symboliques s'exécutent dans le processus (sans pool ni délai). La comparaison échoue (code 1)
+si la médiane d'une classe dépasse `threshold` fois celle de la référence.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Avant tout import des services : base SQLite jetable et calcul symbolique dans le processus
+os.environ.setdefault("POLYNOME_DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'benchmarks.db')}")
+os.environ.setdefault("POLYNOME_SYMBOLIC_WORKERS", "0")
+
+sys.path.insert(0, BACKEND)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np  # noqa: E402
+
+from corpus import DEGREES, generate_corpus  # noqa: E402
+from polynome_commun import sampler  # noqa: E402
+from polynome_commun.expression_cache import expression_cache  # noqa: E402
+
+# Écart minimal (ms) pour qu'un ralentissement soit considéré comme une régression et non du bruit
+NOISE_FLOOR_MS = 0.05
+
+
+class _NoCache:
+    # Remplace le cache de résultats d'un solveur : chaque mesure exécute réellement le calcul
+    def get(self, key, database=True):
+        return None
+
+    def put(self, key, result):
+        pass
+
+
+def load_module(service, module):
+    """
+    Importe `module` depuis le dossier d'un service. Les services ont tous un module `models` :
+    celui du service précédent est retiré de sys.modules avant l'import.
+    """
+    directory = os.path.join(BACKEND, service)
+    sys.modules.pop("models", None)
+    sys.path.insert(0, directory)
+    previous = os.getcwd()
+    os.chdir(directory)  # Fichiers chargés par chemin relatif (modèle de recommandation)
+    try:
+        spec = importlib.util.spec_from_file_location(f"{service.replace('-', '_')}_{module}",
+                                                      os.path.join(directory, f"{module}.py"))
+        loaded = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(loaded)
+    finally:
+        os.chdir(previous)
+        sys.path.remove(directory)
+    models = sys.modules.get("models")
+    if models is not None and hasattr(models, "engine"):
+        models.engine.echo = False
+        if hasattr(models, "migrate"):
+            models.migrate()  # Les tables ne sont plus créées à l'import
+    if hasattr(loaded, "result_cache"):
+        loaded.result_cache = _NoCache()
+    return loaded
+
+
+def _check(result):
+    # Les solveurs qui ne lèvent pas d'exception signalent l'échec par success=False
+    if isinstance(result, dict) and result.get("success") is False:
+        raise ValueError(result.get("error"))
+    return result
+
+
+def define_benchmarks():
+    """
+    Retourne {nom: (fonction(élément), degré maximal)} ; un service impossible à importer
+    (dépendance absente) est signalé puis ignoré.
+    """
+    benchmarks = {}
+    skipped = {}
+
+    def add(service, module, entries):
+        try:
+            loaded = load_module(service, module)
+        except Exception as e:
+            for name in entries:
+                skipped[name] = f"{type(e).__name__}: {e}"
+            return
+        for name, (build, max_degree) in entries.items():
+            benchmarks[name] = (build(loaded), max_degree)
+
+    add("service-newton-py", "newton_solver", {
+        "newton_method": (lambda m: lambda item: m.newton_method(item["equation"], "x", 1.0), 100),
+    })
+    add("service-racines-py", "polynomial_solver", {
+        "find_roots": (lambda m: lambda item: _check(m.find_roots(item["equation"], "x")), 100),
+        "find_roots_exact": (lambda m: lambda item: _check(m.find_roots(item["equation"], "x", exact=True)), 5),
+    })
+    add("service-factorisation-py", "factorisation_solver", {
+        "advanced_factorization": (lambda m: lambda item: m.advanced_factorization(item["equation"], "x"), 50),
+    })
+    add("service-quadratique-py", "quadratique_solver", {
+        "resolution_quadratique": (lambda m: lambda item: m.resolution_quadratique(*item["coefficients"]), 2),
+    })
+    add("service-recommendation-py", "app", {
+        "parse_polynomial": (lambda m: lambda item: m.parse_polynomial(item["equation"]), 100),
+    })
+    benchmarks["graph_evaluation"] = (
+        lambda item: sampler.adaptive_sample(sampler.evaluator(item["equation"])[0], -10.0, 10.0), 100
+    )
+    return benchmarks, skipped
+
+
+def _measure(function, item):
+    expression_cache.clear()
+    start = time.perf_counter()
+    try:
+        function(item)
+        failed = False
+    except Exception:
+        failed = True
+    return (time.perf_counter() - start) * 1000, failed
+
+
+def run_benchmark(function, items, repeat):
+    """Latences (ms) par classe sur `repeat` passes, puis pic mémoire par classe sur une passe tracée."""
+    buckets = {}
+    for item in items:
+        buckets.setdefault(item["bucket"], []).append(item)
+
+    results = {}
+    for bucket, bucket_items in buckets.items():
+        latencies, errors = [], 0
+        for _ in range(repeat):
+            for item in bucket_items:
+                elapsed, failed = _measure(function, item)
+                latencies.append(elapsed)
+                errors += failed
+
+        # Passe séparée : tracemalloc ralentit l'exécution et fausserait les latences
+        peak = 0
+        for item in bucket_items:
+            tracemalloc.start()
+            _measure(function, item)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        latencies = np.array(latencies)
+        results[bucket] = {
+            "count": int(latencies.size),
+            "errors": int(errors),
+            "mean_ms": float(latencies.mean()),
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p90_ms": float(np.percentile(latencies, 90)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+            "max_ms": float(latencies.max()),
+            "peak_memory_kb": round(peak / 1024, 1),
+        }
+    return results
+
+
+def compare(current, baseline, threshold):
+    """Liste des régressions : classes dont la médiane dépasse `threshold` fois celle de la référence."""
+    regressions = []
+    for name, buckets in current["results"].items():
+        for bucket, stats in buckets.items():
+            reference = baseline.get("results", {}).get(name, {}).get(bucket)
+            if reference is None:
+                continue
+            ratio = stats["p50_ms"] / reference["p50_ms"] if reference["p50_ms"] else float("inf")
+            if ratio > threshold and stats["p50_ms"] - reference["p50_ms"] > NOISE_FLOOR_MS:
+                regressions.append({
+                    "benchmark": name,
+                    "bucket": bucket,
+                    "baseline_p50_ms": reference["p50_ms"],
+                    "p50_ms": stats["p50_ms"],
+                    "ratio": round(ratio, 2),
+                })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bancs d'essai des solveurs de polynômes.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--per-bucket", type=int, default=5, help="polynômes par classe")
+    parser.add_argument("--repeat", type=int, default=3, help="passes de mesure par polynôme")
+    parser.add_argument("--max-degree", type=int, default=max(DEGREES))
+    parser.add_argument("--only", help="bancs à exécuter, séparés par des virgules")
+    parser.add_argument("--output", help="fichier JSON des résultats (référence)")
+    parser.add_argument("--compare", help="fichier JSON de référence à comparer")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    arguments = parser.parse_args(argv)
+
+    corpus = generate_corpus(arguments.seed, arguments.per_bucket,
+                             tuple(d for d in DEGREES if d <= arguments.max_degree))
+    benchmarks, skipped = define_benchmarks()
+    selected = set(arguments.only.split(",")) if arguments.only else None
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": arguments.seed,
+            "per_bucket": arguments.per_bucket,
+            "repeat": arguments.repeat,
+            "max_degree": arguments.max_degree,
+        },
+        "results": {},
+        "skipped": skipped,
+    }
+    for name, (function, max_degree) in benchmarks.items():
+        if selected is not None and name not in selected:
+            continue
+        items = [item for item in corpus if item["degree"] <= max_degree]
+        report["results"][name] = run_benchmark(function, items, arguments.repeat)
+        for bucket, stats in report["results"][name].items():
+            print(f"{name:24} {bucket:22} p50={stats['p50_ms']:9.3f} ms  p99={stats['p99_ms']:9.3f} ms  "
+                  f"peak={stats['peak_memory_kb']:9.1f} KiB  errors={stats['errors']}/{stats['count']}")
+    for name, reason in skipped.items():
+        print(f"{name:24} ignoré : {reason}")
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare, encoding="utf-8") as reference:
+            regressions = compare(report, json.load(reference), arguments.threshold)
+        for regression in regressions:
+            print(f"RÉGRESSION {regression['benchmark']} {regression['bucket']} : "
+                  f"{regression['baseline_p50_ms']:.3f} -> {regression['p50_ms']:.3f} ms (x{regression['ratio']})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
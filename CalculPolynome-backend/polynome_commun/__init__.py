@@ -0,0 +1,6 @@
+"""
+Code partagé entre les microservices Python de CalculPolynome.
+
+Chaque service ajoute le dossier CalculPolynome-backend à son `sys.path`
+pour pouvoir importer ce paquet (voir l'en-tête des modules solveurs).
+"""
@@ -0,0 +1,217 @@
+import math
+import os
+import threading
+import time
+from collections import deque
+
+from polynome_commun.polynomial_parser import PolynomialDegreeError, PolynomialSyntaxError, parse_terms
+
+# Coût estimé (ms) au-delà duquel une requête passe par la voie lente
+DEFAULT_FAST_THRESHOLD = float(os.environ.get("POLYNOME_FAST_LANE_THRESHOLD", 50))
+# Requêtes exécutées simultanément dans chaque voie
+DEFAULT_FAST_CONCURRENCY = int(os.environ.get("POLYNOME_FAST_LANE_CONCURRENCY", 8))
+DEFAULT_SLOW_CONCURRENCY = int(os.environ.get("POLYNOME_SLOW_LANE_CONCURRENCY", 2))
+# Requêtes autorisées à attendre dans la voie lente avant le rejet (429)
+DEFAULT_SLOW_QUEUE = int(os.environ.get("POLYNOME_SLOW_LANE_QUEUE", 4))
+# Attente maximale dans la voie rapide, en secondes
+DEFAULT_FAST_WAIT = float(os.environ.get("POLYNOME_FAST_LANE_WAIT", 30))
+
+# Coût d'une entrée hors grammaire polynomiale (traitée symboliquement)
+UNPARSED_COST = 1000.0
+# Nombre de requêtes récentes conservées pour comparer coût estimé et coût réel
+HISTORY_SIZE = 256
+
+
+def estimate_cost(equation, variable, operation):
+    """
+    Estime le coût (en ms) d'une opération à partir du degré, de la taille des coefficients en bits
+    et du nombre de termes, sans analyse SymPy.
+    Opérations : factor, roots (numérique), roots_exact, newton.
+    """
+    try:
+        terms = parse_terms(equation, variable)
+    except (PolynomialSyntaxError, PolynomialDegreeError):
+        # Degré trop grand : refusé ensuite par le solveur, sans calcul
+        return UNPARSED_COST
+
+    degree = max(terms, default=0)
+    count = max(len(terms), 1)
+    bits = max(
+        (max(abs(c.numerator), abs(c.denominator)).bit_length() if hasattr(c, "numerator") else 53
+         for c in terms.values()),
+        default=1
+    )
+
+    if operation == "factor":
+        # Factorisation modulaire : quadratique en degré, sensible à la taille des coefficients et au nombre de termes
+        return 0.5 + 0.02 * degree ** 2 * (1 + bits / 16) * (1 + count / (degree + 1))
+    if operation == "roots_exact":
+        # Radicaux au-delà du degré 2 : croissance très rapide
+        return 1.0 + 0.5 * degree ** 3 * (1 + bits / 32)
+    if operation == "roots":
+        # Valeurs propres de la matrice compagnon
+        return 0.2 + 1e-4 * degree ** 3
+    if operation == "newton":
+        return 0.2 + 0.01 * degree
+    raise ValueError(f"Opération inconnue : {operation}.")
+
+
+class AdmissionRejected(Exception):
+    """La voie lente est saturée : la requête est refusée avec un délai de nouvelle tentative."""
+
+    def __init__(self, lane, retry_after):
+        super().__init__(f"Service saturé, réessayez dans {retry_after} s.")
+        self.lane = lane
+        self.retry_after = retry_after
+
+    def to_dict(self):
+        return {"success": False, "error": str(self), "lane": self.lane, "retry_after": self.retry_after}
+
+
+class _Lane:
+    def __init__(self, name, concurrency, max_waiting, max_wait):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_waiting = max_waiting
+        self.max_wait = max_wait
+        self.condition = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_observed_wait = 0.0
+        self.total_actual = 0.0
+
+    def retry_after(self):
+        # Temps pour écouler la file au rythme moyen observé (1 s au minimum)
+        average = self.total_actual / self.admitted / 1000 if self.admitted else 1.0
+        return max(1, math.ceil(average * (self.waiting + 1) / max(self.concurrency, 1)))
+
+    def acquire(self):
+        start = time.monotonic()
+        with self.condition:
+            if self.in_flight >= self.concurrency and self.waiting >= self.max_waiting:
+                self.rejected += 1
+                raise AdmissionRejected(self.name, self.retry_after())
+            self.waiting += 1
+            try:
+                expires = start + self.max_wait
+                while self.in_flight >= self.concurrency:
+                    remaining = expires - time.monotonic()
+                    if remaining <= 0 or not self.condition.wait(remaining):
+                        if self.in_flight >= self.concurrency:
+                            self.rejected += 1
+                            raise AdmissionRejected(self.name, self.retry_after())
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+            self.admitted += 1
+            wait = time.monotonic() - start
+            self.total_wait += wait
+            self.max_observed_wait = max(self.max_observed_wait, wait)
+        return wait
+
+    def release(self, actual):
+        with self.condition:
+            self.in_flight -= 1
+            self.total_actual += actual
+            self.condition.notify()
+
+    def stats(self):
+        with self.condition:
+            return {
+                "concurrency": self.concurrency,
+                "max_waiting": self.max_waiting,
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "avg_wait": self.total_wait / self.admitted if self.admitted else 0.0,
+                "max_wait": self.max_observed_wait,
+            }
+
+
+class AdmissionController:
+    """
+    Contrôle d'admission selon le coût : chaque requête est estimée avant exécution puis envoyée
+    dans la voie rapide ou la voie lente, chacune avec sa propre limite de concurrence.
+    Quand la voie lente est saturée, `admit` lève `AdmissionRejected` (réponse 429 + Retry-After).
+    """
+
+    def __init__(self, fast_threshold=DEFAULT_FAST_THRESHOLD, fast_concurrency=DEFAULT_FAST_CONCURRENCY,
+                 slow_concurrency=DEFAULT_SLOW_CONCURRENCY, slow_queue=DEFAULT_SLOW_QUEUE,
+                 fast_wait=DEFAULT_FAST_WAIT):
+        self.fast_threshold = fast_threshold
+        # La voie rapide fait attendre ; la voie lente rejette dès que sa file est pleine
+        self.fast = _Lane("fast", fast_concurrency, max_waiting=math.inf, max_wait=fast_wait)
+        self.slow = _Lane("slow", slow_concurrency, max_waiting=slow_queue, max_wait=math.inf)
+        self._history = deque(maxlen=HISTORY_SIZE)
+        self._history_lock = threading.Lock()
+
+    def admit(self, equation, variable, operation):
+        """Gestionnaire de contexte : estime le coût, attend une place dans la voie choisie, mesure le coût réel."""
+        return _Ticket(self, equation, variable, operation)
+
+    def run_patiently(self, equation, variable, operation, function):
+        """
+        Exécute `function()` après admission, pour un calcul de fond (travail de masse) : une voie
+        saturée fait patienter le temps indiqué par `retry_after` au lieu de rejeter l'élément.
+        """
+        while True:
+            ticket = self.admit(equation, variable, operation)
+            try:
+                ticket.__enter__()
+            except AdmissionRejected as e:
+                time.sleep(e.retry_after)
+                continue
+            try:
+                return function()
+            finally:
+                ticket.__exit__(None, None, None)
+
+    def _record(self, ticket, actual):
+        with self._history_lock:
+            self._history.append({
+                "operation": ticket.operation,
+                "lane": ticket.lane.name,
+                "estimated_ms": round(ticket.estimated, 3),
+                "actual_ms": round(actual, 3),
+                "queue_wait_ms": round(ticket.wait * 1000, 3),
+            })
+
+    def stats(self):
+        with self._history_lock:
+            history = list(self._history)
+        ratios = [entry["actual_ms"] / entry["estimated_ms"] for entry in history if entry["estimated_ms"] > 0]
+        return {
+            "fast_threshold": self.fast_threshold,
+            "lanes": {"fast": self.fast.stats(), "slow": self.slow.stats()},
+            # Rapport coût réel / coût estimé : proche de 1 si les estimations sont bien calibrées
+            "cost_ratio": sum(ratios) / len(ratios) if ratios else None,
+            "recent": history[-20:],
+        }
+
+
+class _Ticket:
+    def __init__(self, controller, equation, variable, operation):
+        self.controller = controller
+        self.operation = operation
+        self.estimated = estimate_cost(equation, variable, operation)
+        self.lane = controller.fast if self.estimated <= controller.fast_threshold else controller.slow
+        self.wait = 0.0
+
+    def __enter__(self):
+        self.wait = self.lane.acquire()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        actual = (time.perf_counter() - self._start) * 1000
+        self.lane.release(actual)
+        self.controller._record(self, actual)
+        return False
+
+
+# Contrôleur partagé par les routes d'un même processus
+admission = AdmissionController()
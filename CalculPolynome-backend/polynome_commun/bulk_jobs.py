@@ -0,0 +1,356 @@
+import csv
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+# Dossier des travaux (entrée déposée, résultats NDJSON, état), partagé par les workers pré-forkés
+DIRECTORY = os.environ.get("POLYNOME_JOB_DIR", os.path.join(tempfile.gettempdir(), "polynome-jobs"))
+# Threads de calcul partagés par les travaux d'un processus
+WORKERS = int(os.environ.get("POLYNOME_JOB_WORKERS", os.cpu_count() or 1))
+# Éléments soumis au pool sans résultat écrit (borne la mémoire, quelle que soit la taille de l'entrée)
+MAX_IN_FLIGHT = int(os.environ.get("POLYNOME_JOB_MAX_IN_FLIGHT", 64))
+# Taille maximale d'un fichier d'entrée, en octets
+MAX_INPUT_BYTES = int(os.environ.get("POLYNOME_JOB_MAX_INPUT_BYTES", 1024 * 1024 * 1024))
+# Durée de conservation d'un travail terminé, en secondes
+RETENTION = float(os.environ.get("POLYNOME_JOB_RETENTION", 24 * 3600))
+
+# Éléments lus à la fois dans l'entrée (et préchargés depuis le cache de résultats)
+CHUNK_SIZE = 256
+# Intervalle minimal entre deux écritures de l'état d'un travail, en secondes
+STATUS_INTERVAL = 0.5
+# Attente entre deux lectures d'un fichier de résultats encore en cours d'écriture
+TAIL_INTERVAL = 0.2
+# Taille des blocs copiés lors du dépôt de l'entrée
+COPY_BUFFER = 1024 * 1024
+
+FORMATS = ("ndjson", "csv")
+
+
+class JobInputError(ValueError):
+    """Entrée de travail refusée (format inconnu, fichier vide ou trop volumineux)."""
+
+
+def _read_items(path, input_format):
+    # Générateur (position, élément ou exception) : une ligne à la fois, mémoire constante
+    with open(path, encoding="utf-8", newline="") as source:
+        if input_format == "csv":
+            for offset, row in enumerate(csv.DictReader(source)):
+                yield offset, {key.strip(): value for key, value in row.items() if key and value not in (None, "")}
+            return
+        offset = 0
+        for line in source:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+                if isinstance(item, str):
+                    item = {"equation": item}
+                elif not isinstance(item, dict):
+                    raise ValueError("Chaque ligne doit être un objet JSON ou une chaîne.")
+                yield offset, item
+            except ValueError as e:
+                yield offset, e
+            offset += 1
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+class JobManager:
+    """
+    Travaux de calcul en masse : l'entrée (NDJSON ou CSV) est déposée sur disque, puis lue comme
+    un générateur et soumise par tranches à un pool de threads, avec au plus `max_in_flight`
+    éléments en attente de résultat. Chaque résultat est ajouté au fichier NDJSON du travail dans
+    l'ordre d'achèvement, avec la position de l'élément dans l'entrée (`offset`) et son résultat
+    ou son erreur. L'état est écrit sur disque pour que tout worker puisse répondre.
+
+    `handler(item)` calcule le résultat d'un élément (dictionnaire) ; `prefetch(items)`, facultatif,
+    reçoit chaque tranche avant sa soumission (par exemple pour charger le cache en une requête).
+    """
+
+    def __init__(self, name, handler, prefetch=None, directory=DIRECTORY, workers=WORKERS,
+                 max_in_flight=MAX_IN_FLIGHT, max_input_bytes=MAX_INPUT_BYTES, retention=RETENTION):
+        self.name = name
+        self.handler = handler
+        self.prefetch = prefetch
+        self.directory = os.path.join(directory, name)
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+        self.max_input_bytes = max_input_bytes
+        self.retention = retention
+        self._executor = None
+        self._lock = threading.Lock()
+        self._running = 0
+        self._in_flight = 0
+
+    def _path(self, job_id, name):
+        return os.path.join(self.directory, job_id, name)
+
+    def _valid(self, job_id):
+        return len(job_id) == 32 and all(c in "0123456789abcdef" for c in job_id)
+
+    def _write_status(self, job_id, status):
+        # Remplacement atomique : un lecteur ne voit jamais un état à moitié écrit
+        path = self._path(job_id, "status.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as output:
+            json.dump(status, output)
+        os.replace(path + ".tmp", path)
+
+    def submit(self, stream, input_format="ndjson"):
+        """Dépose l'entrée lue depuis `stream` et démarre le travail ; retourne son état initial."""
+        if input_format not in FORMATS:
+            raise JobInputError(f"Format d'entrée inconnu : {input_format}.")
+        self._prune()
+
+        job_id = uuid.uuid4().hex
+        os.makedirs(os.path.join(self.directory, job_id))
+        size = 0
+        with open(self._path(job_id, "input"), "wb") as output:
+            while True:
+                block = stream.read(COPY_BUFFER)
+                if not block:
+                    break
+                size += len(block)
+                if size > self.max_input_bytes:
+                    output.close()
+                    shutil.rmtree(os.path.join(self.directory, job_id), ignore_errors=True)
+                    raise JobInputError(f"Entrée trop volumineuse (maximum {self.max_input_bytes} octets).")
+                output.write(block)
+        if size == 0:
+            shutil.rmtree(os.path.join(self.directory, job_id), ignore_errors=True)
+            raise JobInputError("L'entrée du travail est vide.")
+        open(self._path(job_id, "results.ndjson"), "w").close()
+
+        now = time.time()
+        status = {
+            "job_id": job_id,
+            "status": "running",
+            "format": input_format,
+            "input_bytes": size,
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "created_at": now,
+            "updated_at": now,
+            "finished_at": None,
+            "pid": os.getpid(),
+        }
+        self._write_status(job_id, status)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix=f"{self.name}-job")
+            self._running += 1
+        threading.Thread(target=self._run, args=(status,), name=f"{self.name}-job-{job_id[:8]}", daemon=True).start()
+        return dict(status)
+
+    def _process(self, offset, item):
+        try:
+            if isinstance(item, Exception):
+                raise item
+            return {"offset": offset, "result": self.handler(item)}
+        except Exception as e:
+            error = e.to_dict() if hasattr(e, "to_dict") else {"error": str(e), "success": False}
+            return {"offset": offset, "error": error.get("error", str(e))}
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _run(self, status):
+        job_id = status["job_id"]
+        last_status = time.monotonic()
+
+        def record(done, output):
+            nonlocal last_status
+            for future in done:
+                line = future.result()
+                output.write(json.dumps(line, default=str) + "\n")
+                status["completed"] += 1
+                status["failed"] += "error" in line
+            output.flush()
+            if time.monotonic() - last_status >= STATUS_INTERVAL:
+                status["updated_at"] = time.time()
+                self._write_status(job_id, status)
+                last_status = time.monotonic()
+
+        try:
+            with open(self._path(job_id, "results.ndjson"), "a", encoding="utf-8") as output:
+                pending = set()
+                for chunk in _chunks(_read_items(self._path(job_id, "input"), status["format"]), CHUNK_SIZE):
+                    if self.prefetch is not None:
+                        try:
+                            self.prefetch([item for _, item in chunk if not isinstance(item, Exception)])
+                        except Exception as e:
+                            logging.warning(f"Travail {job_id} : préchargement impossible : {e}")
+                    for offset, item in chunk:
+                        # Contre-pression : pas plus de `max_in_flight` éléments sans résultat écrit
+                        while len(pending) >= self.max_in_flight:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            record(done, output)
+                        with self._lock:
+                            self._in_flight += 1
+                        pending.add(self._executor.submit(self._process, offset, item))
+                        status["submitted"] += 1
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    record(done, output)
+            status["status"] = "completed"
+        except Exception as e:
+            logging.error(f"Travail {job_id} interrompu : {e}")
+            status["status"] = "failed"
+            status["error"] = str(e)
+        finally:
+            status["updated_at"] = status["finished_at"] = time.time()
+            self._write_status(job_id, status)
+            with self._lock:
+                self._running -= 1
+
+    def status(self, job_id):
+        """État d'un travail (depuis le disque), ou None s'il n'existe pas."""
+        if not self._valid(job_id):
+            return None
+        try:
+            with open(self._path(job_id, "status.json"), encoding="utf-8") as source:
+                status = json.load(source)
+        except (OSError, ValueError):
+            return None
+        # Worker arrêté en cours de travail : les résultats déjà écrits restent lisibles
+        if status["status"] == "running" and not _alive(status["pid"]):
+            status["status"] = "interrupted"
+        return status
+
+    def results(self, job_id, offset=0, follow=True):
+        """
+        Générateur des lignes de résultats à partir de la ligne `offset` (reprise après coupure).
+        Avec `follow`, suit le fichier jusqu'à la fin du travail.
+        """
+        with open(self._path(job_id, "results.ndjson"), encoding="utf-8") as source:
+            index = 0
+            partial = ""
+            while True:
+                line = source.readline()
+                if line:
+                    partial += line
+                    if not partial.endswith("\n"):
+                        continue  # Ligne en cours d'écriture : complétée à la lecture suivante
+                    if index >= offset:
+                        yield partial
+                    index += 1
+                    partial = ""
+                    continue
+                if not follow:
+                    return
+                status = self.status(job_id)
+                if status is None or status["status"] != "running":
+                    # Dernière lecture après la fin du travail
+                    rest = partial + source.read()
+                    for remaining in io.StringIO(rest):
+                        if remaining.endswith("\n") and index >= offset:
+                            yield remaining
+                        index += 1
+                    return
+                time.sleep(TAIL_INTERVAL)
+
+    def _prune(self):
+        # Suppression des travaux terminés depuis plus de `retention` secondes
+        if not os.path.isdir(self.directory):
+            return
+        now = time.time()
+        for job_id in os.listdir(self.directory):
+            status = self.status(job_id)
+            if status is not None and status["finished_at"] and now - status["finished_at"] > self.retention:
+                shutil.rmtree(os.path.join(self.directory, job_id), ignore_errors=True)
+
+    def stats(self):
+        with self._lock:
+            return {"workers": self.workers, "running": self._running, "in_flight": self._in_flight}
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _input_format(request):
+    content_type = (request.mimetype or "").lower()
+    requested = request.args.get("format")
+    if requested:
+        return requested.lower()
+    if "csv" in content_type:
+        return "csv"
+    return "ndjson"
+
+
+def install(app, prefix, manager):
+    """
+    Ajoute les routes d'un travail de masse :
+    POST `<prefix>/jobs` (corps NDJSON ou CSV, ou fichier multipart `file`) -> 202 et identifiant ;
+    GET `<prefix>/jobs/<id>` -> progression ;
+    GET `<prefix>/jobs/<id>/results?offset=N` -> résultats NDJSON en flux, depuis la ligne N.
+    """
+    from flask import Response, jsonify, request, stream_with_context
+
+    @app.route(f"{prefix}/jobs", methods=["POST"])
+    def submit_job():
+        try:
+            upload = request.files.get("file") if request.mimetype == "multipart/form-data" else None
+            if upload is not None:
+                input_format = request.args.get("format") or (
+                    "csv" if (upload.filename or "").lower().endswith(".csv") else "ndjson")
+                status = manager.submit(upload.stream, input_format)
+            else:
+                status = manager.submit(request.stream, _input_format(request))
+        except JobInputError as e:
+            return jsonify({"error": str(e), "success": False}), 400
+
+        job_id = status["job_id"]
+        return jsonify(dict(
+            status,
+            status_url=f"{prefix}/jobs/{job_id}",
+            results_url=f"{prefix}/jobs/{job_id}/results",
+            success=True
+        )), 202, {"Location": f"{prefix}/jobs/{job_id}"}
+
+    @app.route(f"{prefix}/jobs/<job_id>", methods=["GET"])
+    def job_status(job_id):
+        status = manager.status(job_id)
+        if status is None:
+            return jsonify({"error": "Travail introuvable.", "success": False}), 404
+        return jsonify(status), 200
+
+    @app.route(f"{prefix}/jobs/<job_id>/results", methods=["GET"])
+    def job_results(job_id):
+        if manager.status(job_id) is None:
+            return jsonify({"error": "Travail introuvable.", "success": False}), 404
+        offset = max(request.args.get("offset", 0, type=int), 0)
+        follow = request.args.get("follow", "1") != "0"
+        return Response(stream_with_context(manager.results(job_id, offset, follow)),
+                        mimetype="application/x-ndjson")
+
+    return manager
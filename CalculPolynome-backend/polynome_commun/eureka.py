@@ -0,0 +1,303 @@
+import argparse
+import atexit
+import json
+import logging
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Adresse du serveur Eureka (le serveur Java par défaut, ou un `EurekaStub` local)
+EUREKA_SERVER = os.environ.get("POLYNOME_EUREKA_SERVER", "http://localhost:8761/eureka/apps/")
+# Adresse annoncée par les instances
+EUREKA_HOSTNAME = os.environ.get("POLYNOME_EUREKA_HOSTNAME", "127.0.0.1")
+# Intervalle entre deux renouvellements de bail et durée du bail, en secondes
+RENEWAL_INTERVAL = float(os.environ.get("POLYNOME_EUREKA_RENEWAL_INTERVAL", 30))
+LEASE_DURATION = 90
+# Attente maximale entre deux tentatives après des échecs successifs
+MAX_BACKOFF = 60.0
+# Délais de connexion et de lecture des appels au registre
+REQUEST_TIMEOUT = (2, 5)
+
+
+class EurekaClient:
+    """
+    Client Eureka d'une instance : inscription unique sur une session HTTP persistante, puis
+    renouvellements légers du bail (PUT), avec reprise exponentielle et gigue en cas d'échec,
+    et désinscription (DELETE) à l'arrêt.
+    """
+
+    def __init__(self, service_name, port, hostname=EUREKA_HOSTNAME, server=EUREKA_SERVER,
+                 renewal_interval=RENEWAL_INTERVAL):
+        self.service_name = service_name
+        self.app_name = service_name.upper()
+        self.port = port
+        self.hostname = hostname
+        self.instance_id = f"{service_name}:{port}"
+        self.server = server if server.endswith("/") else server + "/"
+        self.renewal_interval = renewal_interval
+
+        # Une seule connexion réutilisée (keep-alive) pour toutes les requêtes au registre
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.registered = False
+        self.registrations = 0
+        self.renewals = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_renewal = None
+        self.last_error = None
+
+    @property
+    def app_url(self):
+        return self.server + self.app_name
+
+    @property
+    def instance_url(self):
+        return f"{self.app_url}/{self.instance_id}"
+
+    def payload(self):
+        return {
+            "instance": {
+                "instanceId": self.instance_id,
+                "hostName": self.hostname,
+                "app": self.app_name,
+                "ipAddr": self.hostname,
+                "vipAddress": self.service_name,
+                "status": "UP",
+                "port": {"$": self.port, "@enabled": True},
+                "leaseInfo": {"renewalIntervalInSecs": int(self.renewal_interval), "durationInSecs": LEASE_DURATION},
+                "dataCenterInfo": {
+                    "@class": "com.netflix.appinfo.InstanceInfo$DefaultDataCenterInfo",
+                    "name": "MyOwn"
+                }
+            }
+        }
+
+    def register(self):
+        response = self.session.post(self.app_url, json=self.payload(), timeout=REQUEST_TIMEOUT)
+        if response.status_code not in (200, 204):
+            raise RuntimeError(f"Failed to register with Eureka: {response.status_code}, {response.text}")
+        with self._lock:
+            self.registered = True
+            self.registrations += 1
+            self.last_renewal = time.time()
+        logging.info(f"Service {self.instance_id} registered successfully with Eureka!")
+
+    def renew(self):
+        """Renouvelle le bail ; un 404 (bail expiré côté registre) déclenche une nouvelle inscription."""
+        response = self.session.put(self.instance_url, params={"status": "UP"}, timeout=REQUEST_TIMEOUT)
+        if response.status_code == 404:
+            logging.warning(f"Eureka lease for {self.instance_id} not found, registering again.")
+            with self._lock:
+                self.registered = False
+            self.register()
+            return
+        if response.status_code != 200:
+            raise RuntimeError(f"Failed to renew Eureka lease: {response.status_code}, {response.text}")
+        with self._lock:
+            self.renewals += 1
+            self.last_renewal = time.time()
+
+    def deregister(self):
+        with self._lock:
+            if not self.registered:
+                return
+            self.registered = False
+        try:
+            self.session.delete(self.instance_url, timeout=REQUEST_TIMEOUT)
+            logging.info(f"Service {self.instance_id} deregistered from Eureka.")
+        except requests.RequestException as e:
+            logging.error(f"Error deregistering from Eureka: {e}")
+
+    def _next_delay(self):
+        if self.consecutive_failures == 0:
+            return self.renewal_interval
+        # Reprise exponentielle avec gigue : les instances ne retentent pas toutes en même temps
+        backoff = min(MAX_BACKOFF, 2 ** self.consecutive_failures)
+        return backoff * random.uniform(0.5, 1.0)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                if self.registered:
+                    self.renew()
+                else:
+                    self.register()
+                with self._lock:
+                    self.consecutive_failures = 0
+            except Exception as e:
+                with self._lock:
+                    self.failures += 1
+                    self.consecutive_failures += 1
+                    self.last_error = str(e)
+                logging.error(f"Error contacting Eureka: {e}")
+            self._stop.wait(self._next_delay())
+
+    def start(self):
+        """Démarre l'inscription et les renouvellements en arrière-plan."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="eureka-heartbeat", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self, timeout=5):
+        """Arrête les renouvellements et désinscrit l'instance."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.deregister()
+        self.session.close()
+
+    def health(self):
+        with self._lock:
+            lease_age = time.time() - self.last_renewal if self.last_renewal else None
+            return {
+                "server": self.server,
+                "instance_id": self.instance_id,
+                "registered": self.registered,
+                # Bail considéré valide tant qu'il a été renouvelé depuis moins de sa durée
+                "healthy": self.registered and lease_age is not None and lease_age < LEASE_DURATION,
+                "last_renewal_age": lease_age,
+                "registrations": self.registrations,
+                "renewals": self.renewals,
+                "failures": self.failures,
+                "consecutive_failures": self.consecutive_failures,
+                "last_error": self.last_error,
+            }
+
+
+class EurekaStub:
+    """
+    Registre Eureka minimal en mémoire (inscription, renouvellement, désinscription, listing),
+    servi par un serveur HTTP local : permet de démarrer et de tester en charge toute la pile
+    sans le serveur Java. Les baux non renouvelés expirent après leur durée.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.instances = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/eureka/apps/"
+
+    def _expire(self):
+        now = time.time()
+        for key, (_, expires) in list(self.instances.items()):
+            if expires < now:
+                del self.instances[key]
+
+    def applications(self):
+        """Instances inscrites, regroupées par application."""
+        with self._lock:
+            self._expire()
+            applications = {}
+            for (app, _), (instance, _) in self.instances.items():
+                applications.setdefault(app, []).append(instance)
+            return applications
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Connexions persistantes
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body=None):
+                data = json.dumps(body).encode() if body is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _parts(self):
+                path = self.path.split("?", 1)[0].rstrip("/")
+                parts = path.split("/")[3:] if path.startswith("/eureka/apps") else None
+                return parts
+
+            def do_POST(self):
+                parts = self._parts()
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if not parts or len(parts) != 1:
+                    return self._send(404)
+                instance = json.loads(body)["instance"]
+                duration = instance.get("leaseInfo", {}).get("durationInSecs", LEASE_DURATION)
+                with stub._lock:
+                    stub.instances[(parts[0].upper(), instance["instanceId"])] = (instance, time.time() + duration)
+                self._send(204)
+
+            def do_PUT(self):
+                parts = self._parts()
+                if not parts or len(parts) != 2:
+                    return self._send(404)
+                key = (parts[0].upper(), parts[1])
+                with stub._lock:
+                    stub._expire()
+                    if key not in stub.instances:
+                        return self._send(404)
+                    instance, _ = stub.instances[key]
+                    duration = instance.get("leaseInfo", {}).get("durationInSecs", LEASE_DURATION)
+                    stub.instances[key] = (instance, time.time() + duration)
+                self._send(200)
+
+            def do_DELETE(self):
+                parts = self._parts()
+                if not parts or len(parts) != 2:
+                    return self._send(404)
+                with stub._lock:
+                    removed = stub.instances.pop((parts[0].upper(), parts[1]), None)
+                self._send(200 if removed else 404)
+
+            def do_GET(self):
+                parts = self._parts()
+                if parts is None:
+                    return self._send(404)
+                applications = stub.applications()
+                if not parts:
+                    return self._send(200, {"applications": {"application": [
+                        {"name": name, "instance": instances} for name, instances in applications.items()
+                    ]}})
+                instances = applications.get(parts[0].upper())
+                if not instances:
+                    return self._send(404)
+                self._send(200, {"application": {"name": parts[0].upper(), "instance": instances}})
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="eureka-stub", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    # Registre local : python -m polynome_commun.eureka --port 8761
+    parser = argparse.ArgumentParser(description="Registre Eureka local en mémoire.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8761)
+    arguments = parser.parse_args()
+    stub = EurekaStub(arguments.host, arguments.port)
+    logging.basicConfig(level=logging.INFO)
+    logging.info(f"Registre Eureka local sur {stub.url}")
+    stub._server.serve_forever()
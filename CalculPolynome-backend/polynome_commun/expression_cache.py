@@ -0,0 +1,223 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from tokenize import TokenError
+
+import numpy as np
+
+from polynome_commun.polynomial_parser import MAX_DEGREE, PolynomialDegreeError
+from polynome_commun.startup import lazy_import
+
+# SymPy n'est chargé qu'à la première expression analysée (ou au préchauffage du service)
+sp = lazy_import("sympy")
+
+# Taille maximale du cache (nombre d'équations distinctes conservées)
+DEFAULT_MAXSIZE = int(os.environ.get("POLYNOME_EXPRESSION_CACHE_SIZE", 512))
+
+# Noms acceptés dans une équation en plus de la variable : fonctions et constantes SymPy usuelles
+FUNCTIONS = (
+    "sin", "cos", "tan", "asin", "acos", "atan", "sinh", "cosh", "tanh",
+    "exp", "log", "ln", "sqrt", "abs", "Abs", "pi", "E", "I",
+)
+# Noms de FUNCTIONS qui ne sont pas des attributs de SymPy
+_ALIASES = {"ln": "log", "abs": "Abs"}
+# Noms de l'équation (le `e` d'un littéral comme `1e5` n'en est pas un) et accès à un attribut (`x.func`)
+_NAME = re.compile(r"(?<!\w)[A-Za-z_]\w*")
+_ATTRIBUTE = re.compile(r"\.\s*[A-Za-z_]")
+
+
+def sympify_equation(equation, variable="x"):
+    """
+    Construit l'expression SymPy d'une équation sans évaluer de code arbitraire : `__` et les accès
+    aux attributs sont refusés, seuls la variable, les noms de FUNCTIONS et des paramètres d'une
+    lettre (entrées multivariées, symboles inertes) sont admis, et l'analyse (`parse_expr`) se fait
+    sans builtins Python. Lève `SympifyError` pour toute autre entrée.
+    """
+    from sympy.parsing.sympy_parser import parse_expr, standard_transformations
+
+    if "__" in equation or _ATTRIBUTE.search(equation):
+        raise sp.SympifyError(f"« __ » et les attributs sont interdits dans une équation : {equation}")
+    names = set(_NAME.findall(equation)) - set(FUNCTIONS)
+    unknown = sorted(name for name in names if name != variable and len(name) > 1)
+    if unknown:
+        raise sp.SympifyError(f"Noms inconnus ({', '.join(unknown)}) dans l'équation : {equation}")
+
+    local_dict = {name: getattr(sp, _ALIASES.get(name, name)) for name in FUNCTIONS}
+    local_dict.update((name, sp.Symbol(name)) for name in names | {variable})
+    # Seuls les constructeurs produits par les transformations sont visibles
+    global_dict = {"__builtins__": {}, "Integer": sp.Integer, "Float": sp.Float, "Rational": sp.Rational,
+                   "Symbol": sp.Symbol, "factorial": sp.factorial}
+    try:
+        return parse_expr(equation.replace("^", "**"), local_dict=local_dict, global_dict=global_dict,
+                          transformations=standard_transformations)
+    except sp.SympifyError:
+        raise
+    except (SyntaxError, TypeError, ValueError, AttributeError, NameError, TokenError) as e:
+        raise sp.SympifyError(equation, e)
+
+
+def degree_bound(expr, symbol):
+    """
+    Majorant du degré de l'expression en `symbol`, lu sur l'arbre sans rien développer : somme des
+    degrés d'un produit, maximum d'une somme, degré de la base fois l'exposant d'une puissance entière.
+    Les sous-expressions non polynomiales comptent pour 0 (`Poly` les refuse ensuite sans développer).
+    """
+    if not expr.has(symbol):
+        return 0
+    if expr == symbol:
+        return 1
+    if expr.is_Pow:
+        base, exponent = expr.args
+        if exponent.is_Integer and exponent > 0:
+            return degree_bound(base, symbol) * int(exponent)
+        return 0
+    if expr.is_Add:
+        return max(degree_bound(arg, symbol) for arg in expr.args)
+    if expr.is_Mul:
+        return sum(degree_bound(arg, symbol) for arg in expr.args)
+    return 0
+
+
+def canonicalize(equation, variable="x"):
+    """
+    Construit la clé canonique d'une équation : `^` devient `**` et les espaces sont supprimés.
+    """
+    normalized = equation.replace("^", "**")
+    return "".join(normalized.split()), variable
+
+
+class ParsedExpression:
+    """
+    Artefacts d'analyse d'une équation, calculés une seule fois puis réutilisés.
+
+    L'expression SymPy est construite immédiatement ; le `Poly`, la dérivée, les formes
+    simplifiée et factorisée ainsi que les fonctions numériques sont calculés à la demande.
+    """
+
+    def __init__(self, equation, variable="x"):
+        self.equation = equation
+        self.variable = variable
+        self.symbol = sp.symbols(variable)
+        self.expr = sympify_equation(equation, variable)
+        # Réentrant : un artefact peut dépendre d'un autre (f_prime utilise derivative)
+        self._lock = threading.RLock()
+        self._artifacts = {}
+
+    def _get(self, name, build):
+        # Double vérification : le calcul n'est fait qu'une fois même en concurrence
+        if name not in self._artifacts:
+            with self._lock:
+                if name not in self._artifacts:
+                    self._artifacts[name] = build()
+        return self._artifacts[name]
+
+    @property
+    def poly(self):
+        """
+        Le polynôme `Poly` en la variable (lève `PolynomialError` si ce n'en est pas un). Au-delà de
+        MAX_DEGREE (`x^(10^7)`), `PolynomialDegreeError` est levée avant la construction de la forme dense.
+        """
+        def build():
+            if degree_bound(self.expr, self.symbol) > MAX_DEGREE:
+                raise PolynomialDegreeError(f"Degré supérieur à {MAX_DEGREE}.")
+            return sp.Poly(self.expr, self.symbol)
+        return self._get("poly", build)
+
+    @property
+    def coefficients(self):
+        """
+        Coefficients numériques du polynôme (degré décroissant) sous forme de tableau NumPy,
+        ou None si l'expression n'est pas un polynôme à coefficients numériques.
+        """
+        def build():
+            try:
+                return np.array([float(c) for c in self.poly.all_coeffs()], dtype=float)
+            except (sp.PolynomialError, TypeError):
+                return None
+        return self._get("coefficients", build)
+
+    @property
+    def derivative(self):
+        return self._get("derivative", lambda: sp.diff(self.expr, self.symbol))
+
+    @property
+    def simplified(self):
+        return self._get("simplified", lambda: sp.simplify(self.expr))
+
+    @property
+    def factored(self):
+        return self._get("factored", lambda: sp.factor(self.expr))
+
+    @property
+    def f(self):
+        """Fonction numérique f(x)."""
+        return self._get("f", lambda: sp.lambdify(self.symbol, self.expr))
+
+    @property
+    def f_prime(self):
+        """Fonction numérique f'(x)."""
+        return self._get("f_prime", lambda: sp.lambdify(self.symbol, self.derivative))
+
+
+class ExpressionCache:
+    """
+    Cache LRU borné et thread-safe des expressions analysées, avec compteurs de hits/misses/évictions.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, equation, variable="x"):
+        key = canonicalize(equation, variable)
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return parsed
+            self.misses += 1
+
+        # L'analyse se fait hors du verrou ; une erreur de syntaxe n'est pas mise en cache
+        parsed = ParsedExpression(equation, variable)
+
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                return existing
+            self._entries[key] = parsed
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return parsed
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+# Cache partagé par tous les solveurs d'un même processus
+expression_cache = ExpressionCache()
+
+
+def parse_expression(equation, variable="x"):
+    """
+    Retourne l'expression analysée (depuis le cache si possible).
+    """
+    return expression_cache.get(equation, variable)
@@ -0,0 +1,566 @@
+import math
+import os
+import random
+import threading
+import time
+from fractions import Fraction
+from itertools import combinations, zip_longest
+
+from polynome_commun.polynomial_parser import PolynomialSyntaxError, parse_terms
+
+# Degré maximal traité par le chemin rapide (au-delà : SymPy, dans le pool borné par un délai)
+FAST_PATH_MAX_DEGREE = int(os.environ.get("POLYNOME_FAST_FACTOR_MAX_DEGREE", 64))
+# Temps maximal du chemin rapide, en secondes (au-delà : SymPy, dans le pool borné par un délai)
+FAST_PATH_BUDGET = float(os.environ.get("POLYNOME_FAST_FACTOR_BUDGET", 0.1))
+# Au-delà de ce nombre de facteurs modulo p, la recombinaison (exponentielle) est confiée à SymPy
+MAX_MODULAR_FACTORS = 12
+# Valeur absolue maximale des coefficients extrêmes pour la recherche de racines rationnelles
+RATIONAL_ROOT_BOUND = 10 ** 10
+# Nombre maximal de candidats p/q testés par la recherche de racines rationnelles
+MAX_ROOT_CANDIDATES = 4096
+# Petits nombres premiers impairs essayés pour la factorisation modulaire
+PRIMES = (3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97,
+          101, 103, 107, 109, 113, 127, 131, 137, 139, 149, 151, 157, 163, 167, 173, 179, 181, 191, 193, 197)
+# Nombre de premiers utilisables comparés (on garde celui qui donne le moins de facteurs)
+PRIME_TRIALS = 3
+
+# Échéance du chemin rapide pour le thread courant (vérifiée dans les boucles coûteuses)
+_budget = threading.local()
+
+
+class _BudgetExceeded(Exception):
+    """Le chemin rapide a dépassé son temps : la factorisation est confiée à SymPy."""
+
+
+def _check_budget():
+    if time.monotonic() > getattr(_budget, "expires", math.inf):
+        raise _BudgetExceeded()
+
+
+# Les polynômes sont des listes plates de coefficients entiers par degré croissant (indice = degré) ;
+# le polynôme nul est la liste vide.
+
+
+def _trim(f):
+    while f and f[-1] == 0:
+        f.pop()
+    return f
+
+
+def _mul(f, g):
+    if not f or not g:
+        return []
+    result = [0] * (len(f) + len(g) - 1)
+    for i, a in enumerate(f):
+        if a:
+            for j, b in enumerate(g):
+                result[i + j] += a * b
+    return result
+
+
+def _sub(f, g):
+    return _trim([a - b for a, b in zip_longest(f, g, fillvalue=0)])
+
+
+def _derivative(f):
+    return _trim([i * a for i, a in enumerate(f)][1:])
+
+
+def _primitive(f):
+    """Partie primitive, coefficient dominant positif."""
+    content = math.gcd(*f)
+    if f[-1] < 0:
+        content = -content
+    return [a // content for a in f]
+
+
+def _exact_div(f, g):
+    """Quotient exact f / g dans Z[x], ou None si g ne divise pas f."""
+    f = list(f)
+    lead = g[-1]
+    quotient = [0] * max(len(f) - len(g) + 1, 0)
+    for shift in range(len(f) - len(g), -1, -1):
+        _check_budget()
+        coefficient, remainder = divmod(f[shift + len(g) - 1], lead)
+        if remainder:
+            return None
+        quotient[shift] = coefficient
+        if coefficient:
+            for j, b in enumerate(g):
+                f[shift + j] -= coefficient * b
+    return quotient if not any(f[:len(g) - 1]) else None
+
+
+def _pseudo_remainder(f, g):
+    f = list(f)
+    lead = g[-1]
+    while len(f) >= len(g) and f:
+        _check_budget()
+        coefficient = f[-1]
+        shift = len(f) - len(g)
+        f = [a * lead for a in f]
+        for j, b in enumerate(g):
+            f[shift + j] -= coefficient * b
+        _trim(f)
+    return f
+
+
+def _gcd(f, g):
+    # Suite de restes primitifs : la croissance des coefficients reste contenue
+    f, g = _primitive(f), _primitive(g) if g else []
+    while g:
+        r = _pseudo_remainder(f, g)
+        f, g = g, (_primitive(r) if r else [])
+    return f
+
+
+def square_free_decomposition(f):
+    """
+    Décomposition sans facteur carré (algorithme de Yun) d'un polynôme primitif :
+    liste de (facteur primitif, multiplicité) dont le produit des puissances vaut f.
+    """
+    parts = []
+    derivative = _derivative(f)
+    c = _gcd(f, derivative)
+    w = _exact_div(f, c)
+    y = _exact_div(derivative, c)
+    multiplicity = 1
+    while len(w) > 1:
+        z = _sub(y, _derivative(w))
+        g = _gcd(w, z) if z else w
+        if len(g) > 1:
+            parts.append((g, multiplicity))
+        w = _exact_div(w, g)
+        y = _exact_div(z, g) if z else []
+        multiplicity += 1
+    return parts
+
+
+def _divisors(n):
+    small, large = [], []
+    for d in range(1, math.isqrt(n) + 1):
+        if n % d == 0:
+            small.append(d)
+            if d * d != n:
+                large.append(n // d)
+    return small + large[::-1]
+
+
+def _rational_roots(f):
+    """
+    Facteurs linéaires (q x - p) de f primitif sans facteur carré, par recherche des racines p/q
+    (p divise le terme constant, q le coefficient dominant). Retourne (facteurs, reste).
+    """
+    if abs(f[0]) > RATIONAL_ROOT_BOUND or abs(f[-1]) > RATIONAL_ROOT_BOUND:
+        return [], f
+    numerators = _divisors(abs(f[0]))
+    denominators = _divisors(abs(f[-1]))
+    if len(numerators) * len(denominators) * 2 > MAX_ROOT_CANDIDATES:
+        return [], f
+
+    factors = []
+    for q in denominators:
+        _check_budget()
+        for p in numerators:
+            if math.gcd(p, q) != 1:
+                continue
+            for numerator in (p, -p):
+                if len(f) <= 2:
+                    break
+                # q^n f(p/q) par Horner homogène, en entiers
+                n = len(f) - 1
+                value, q_power = f[n], 1
+                for i in range(n - 1, -1, -1):
+                    q_power *= q
+                    value = value * numerator + f[i] * q_power
+                if value == 0:
+                    linear = [-numerator, q]
+                    factors.append(linear)
+                    f = _exact_div(f, linear)
+    return factors, f
+
+
+# Arithmétique dans (Z/pZ)[x], coefficients dans [0, p)
+
+def _pmod(f, p):
+    return _trim([a % p for a in f])
+
+
+def _pmul(f, g, p):
+    return _pmod(_mul(f, g), p)
+
+
+def _pdivmod(f, g, p):
+    f = list(f)
+    inverse = pow(g[-1], -1, p)
+    quotient = [0] * max(len(f) - len(g) + 1, 0)
+    for shift in range(len(f) - len(g), -1, -1):
+        coefficient = f[shift + len(g) - 1] * inverse % p
+        quotient[shift] = coefficient
+        if coefficient:
+            for j, b in enumerate(g):
+                f[shift + j] = (f[shift + j] - coefficient * b) % p
+    return _trim(quotient), _trim(f[:len(g) - 1])
+
+
+def _pmonic(f, p):
+    inverse = pow(f[-1], -1, p)
+    return [a * inverse % p for a in f]
+
+
+def _pgcd(f, g, p):
+    while g:
+        f, g = g, _pdivmod(f, g, p)[1]
+    return _pmonic(f, p) if f else f
+
+
+def _pxgcd(a, b, p):
+    """(s, t) tels que s a + t b = 1 dans (Z/pZ)[x], pour a et b premiers entre eux."""
+    r0, r1 = a, b
+    s0, s1, t0, t1 = [1], [], [], [1]
+    while r1:
+        q, r = _pdivmod(r0, r1, p)
+        r0, r1 = r1, r
+        s0, s1 = s1, _pmod(_sub(s0, _mul(q, s1)), p)
+        t0, t1 = t1, _pmod(_sub(t0, _mul(q, t1)), p)
+    inverse = pow(r0[-1], -1, p)
+    return [a * inverse % p for a in s0], [a * inverse % p for a in t0]
+
+
+def _ppowmod(base, exponent, modulus, p):
+    result = [1]
+    base = _pdivmod(base, modulus, p)[1]
+    while exponent:
+        if exponent & 1:
+            result = _pdivmod(_pmul(result, base, p), modulus, p)[1]
+        exponent >>= 1
+        if exponent:
+            base = _pdivmod(_pmul(base, base, p), modulus, p)[1]
+    return result
+
+
+def _distinct_degree(f, p):
+    # Regroupe les facteurs irréductibles de f (unitaire, sans carré) par degré
+    groups = []
+    x = [0, 1]
+    h = x
+    degree = 0
+    while len(f) - 1 >= 2 * (degree + 1):
+        _check_budget()
+        degree += 1
+        h = _ppowmod(h, p, f, p)
+        g = _pgcd(f, _pmod(_sub(h, x), p), p)
+        if len(g) > 1:
+            groups.append((g, degree))
+            f = _pdivmod(f, g, p)[0]
+            h = _pdivmod(h, f, p)[1]
+    if len(f) > 1:
+        groups.append((f, len(f) - 1))
+    return groups
+
+
+def _equal_degree(f, degree, p, rng):
+    # Cantor–Zassenhaus : sépare un produit de facteurs irréductibles de même degré
+    if len(f) - 1 == degree:
+        return [f]
+    while True:
+        _check_budget()
+        a = _trim([rng.randrange(p) for _ in range(len(f) - 1)])
+        if len(a) < 2:
+            continue
+        g = _pgcd(f, a, p)
+        if len(g) == 1:
+            b = _ppowmod(a, (p ** degree - 1) // 2, f, p)
+            g = _pgcd(f, _pmod(_sub(b, [1]), p), p)
+        if 1 < len(g) < len(f):
+            return _equal_degree(g, degree, p, rng) + _equal_degree(_pdivmod(f, g, p)[0], degree, p, rng)
+
+
+def _modular_factors(f, p, rng):
+    """Facteurs irréductibles unitaires de f modulo p, ou None si f n'y est pas sans facteur carré."""
+    fp = _pmonic(_pmod(f, p), p)
+    if len(_pgcd(fp, _pmod(_derivative(fp), p), p)) != 1:
+        return None
+    factors = []
+    for group, degree in _distinct_degree(fp, p):
+        factors.extend(_equal_degree(group, degree, p, rng))
+    return factors
+
+
+def _symmetric(f, modulus):
+    half = modulus // 2
+    return _trim([a % modulus - (modulus if a % modulus > half else 0) for a in f])
+
+
+def _lift_pair(f, g, h, p, modulus):
+    """
+    Relèvement de Hensel linéaire de f ≡ g h (mod p), h unitaire, jusqu'à `modulus` (puissance de p).
+    """
+    s, t = _pxgcd(_pmod(g, p), _pmod(h, p), p)
+    m = p
+    while m < modulus:
+        _check_budget()
+        e = [(a - b) // m % p for a, b in zip_longest(f, _mul(g, h), fillvalue=0)]
+        q, r = _pdivmod(_pmul(s, e, p), h, p)
+        correction = _pmod([a + b for a, b in zip_longest(_mul(t, e), _mul(q, g), fillvalue=0)], p)
+        g = [a + m * b for a, b in zip_longest(g, correction, fillvalue=0)]
+        h = [a + m * b for a, b in zip_longest(h, r, fillvalue=0)]
+        m *= p
+        g, h = _trim([a % m for a in g]), _trim([a % m for a in h])
+    return g, h
+
+
+def _hensel_lift(f, factors, p, modulus):
+    # Chaque facteur est séparé à son tour du produit des suivants (qui porte le coefficient dominant)
+    lifted = []
+    current = f
+    for i, h in enumerate(factors[:-1]):
+        g = [f[-1] % p]
+        for other in factors[i + 1:]:
+            g = _pmul(g, other, p)
+        g, h = _lift_pair(current, g, h, p, modulus)
+        lifted.append(h)
+        current = g
+    inverse = pow(current[-1], -1, modulus)
+    lifted.append([a * inverse % modulus for a in current])
+    return lifted
+
+
+def _zassenhaus(f, rng):
+    """Facteurs irréductibles de f primitif sans facteur carré (degré ≥ 2), ou None (trop de facteurs modulaires)."""
+    lead = f[-1]
+    best = None
+    trials = 0
+    for p in PRIMES:
+        if lead % p == 0:
+            continue
+        factors = _modular_factors(f, p, rng)
+        if factors is None:
+            continue
+        if best is None or len(factors) < len(best[1]):
+            best = (p, factors)
+        trials += 1
+        if len(factors) == 1 or trials >= PRIME_TRIALS:
+            break
+    if best is None:
+        return None
+    p, factors = best
+    if len(factors) == 1:
+        return [f]
+    if len(factors) > MAX_MODULAR_FACTORS:
+        return None
+
+    # Borne de Mignotte sur les coefficients d'un facteur, multipliée par le coefficient dominant
+    bound = 2 * abs(lead) * (2 ** (len(f) - 1)) * (math.isqrt(sum(a * a for a in f)) + 1)
+    modulus = p
+    while modulus <= bound:
+        modulus *= p
+    lifted = [_symmetric(g, modulus) for g in _hensel_lift(f, factors, p, modulus)]
+
+    # Recombinaison : plus petits sous-ensembles de facteurs modulaires d'abord
+    irreducible = []
+    size = 1
+    while 2 * size <= len(lifted):
+        for subset in combinations(range(len(lifted)), size):
+            _check_budget()
+            lead = f[-1]
+            candidate = [lead]
+            for index in subset:
+                candidate = _symmetric(_mul(candidate, lifted[index]), modulus)
+            if not candidate or candidate[0] == 0 or (lead * f[0]) % candidate[0]:
+                continue
+            candidate = _primitive(candidate)
+            quotient = _exact_div(f, candidate)
+            if quotient is None:
+                continue
+            irreducible.append(candidate)
+            f = quotient
+            lifted = [g for index, g in enumerate(lifted) if index not in subset]
+            break
+        else:
+            size += 1
+    irreducible.append(_primitive(f))
+    return irreducible
+
+
+def _factor_square_free(f, rng):
+    if len(f) <= 2:
+        return [f]
+    linear, rest = _rational_roots(f)
+    if len(rest) <= 2:
+        return linear + ([rest] if len(rest) == 2 else [])
+    others = _zassenhaus(rest, rng)
+    return None if others is None else linear + others
+
+
+def factor_terms(terms, seed=0, budget=FAST_PATH_BUDGET):
+    """
+    Factorisation sur Q d'un polynôme univarié {exposant: coefficient} à coefficients entiers ou rationnels.
+
+    Contenu et dénominateurs sont extraits, puis viennent la décomposition sans facteur carré, la
+    recherche de racines rationnelles et, pour le reste, la factorisation modulo p relevée par Hensel
+    (Zassenhaus). Retourne (contenu, [(coefficients entiers par degré décroissant, multiplicité)]),
+    ou None hors du chemin rapide (coefficient décimal, polynôme nul ou constant, degré trop élevé,
+    recombinaison trop coûteuse, plus de `budget` secondes de calcul ; None : sans limite).
+    """
+    return _within_budget(budget, _factor_terms, terms, seed)
+
+
+def square_free_terms(terms, budget=FAST_PATH_BUDGET):
+    """
+    Décomposition sans facteur carré sur Q d'un polynôme {exposant: coefficient} (entiers, rationnels
+    ou flottants lus comme rationnels exacts) : [(coefficients entiers primitifs par degré décroissant,
+    multiplicité)], facteur x compris. None pour un polynôme constant ou au-delà de `budget` secondes.
+    """
+    return _within_budget(budget, _square_free_terms, terms)
+
+
+def _within_budget(budget, function, *args):
+    _budget.expires = time.monotonic() + budget if budget is not None else math.inf
+    try:
+        return function(*args)
+    except _BudgetExceeded:
+        return None
+    finally:
+        _budget.expires = math.inf
+
+
+def _square_free_terms(terms):
+    terms = {exponent: Fraction(c) for exponent, c in terms.items() if c}
+    if not terms or max(terms) < 1:
+        return None
+    degree = max(terms)
+    denominator = math.lcm(*(c.denominator for c in terms.values()))
+    primitive = _primitive([int(terms.get(exponent, 0) * denominator) for exponent in range(degree + 1)])
+
+    parts = []
+    power = next(i for i, a in enumerate(primitive) if a)
+    if power:
+        parts.append(([0, 1], power))
+        primitive = primitive[power:]
+    if len(primitive) > 1:
+        parts.extend(square_free_decomposition(primitive))
+    return [(part[::-1], multiplicity) for part, multiplicity in parts]
+
+
+def _factor_terms(terms, seed):
+    if not terms or any(isinstance(c, float) for c in terms.values()):
+        return None
+    degree = max(terms)
+    if degree < 1 or degree > FAST_PATH_MAX_DEGREE:
+        return None
+
+    denominator = math.lcm(*(Fraction(c).denominator for c in terms.values()))
+    f = [int(terms.get(exponent, 0) * denominator) for exponent in range(degree + 1)]
+    primitive = _primitive(f)
+    content = Fraction(f[-1] // primitive[-1], denominator)
+
+    factors = []
+    power = next(i for i, a in enumerate(primitive) if a)
+    if power:
+        factors.append(([0, 1], power))
+        primitive = primitive[power:]
+
+    rng = random.Random(seed)
+    if len(primitive) > 1:
+        for part, multiplicity in square_free_decomposition(primitive):
+            found = _factor_square_free(part, rng)
+            if found is None:
+                return None
+            factors.extend((factor, multiplicity) for factor in found)
+
+    factors.sort(key=lambda item: (len(item[0]), sum(1 for a in item[0] if a), item[0][::-1], item[1]))
+    return content, [(factor[::-1], multiplicity) for factor, multiplicity in factors]
+
+
+def format_polynomial(coefficients, variable="x"):
+    """Écriture d'un polynôme (coefficients par degré décroissant) dans le style de SymPy, avec `^`."""
+    degree = len(coefficients) - 1
+    text = ""
+    for i, coefficient in enumerate(coefficients):
+        if coefficient == 0:
+            continue
+        exponent = degree - i
+        magnitude = abs(coefficient)
+        if exponent == 0:
+            term = str(magnitude)
+        else:
+            monomial = variable if exponent == 1 else f"{variable}^{exponent}"
+            term = monomial if magnitude == 1 else f"{magnitude}*{monomial}"
+        if not text:
+            text = f"-{term}" if coefficient < 0 else term
+        else:
+            text += f" - {term}" if coefficient < 0 else f" + {term}"
+    return text or "0"
+
+
+def format_factorization(content, factors, variable="x"):
+    """Écriture de la factorisation : `2*(x - 1)^2*(x + 3)/3`, dans le style de SymPy."""
+    parts = []
+    for coefficients, multiplicity in factors:
+        text = format_polynomial(coefficients, variable)
+        if sum(1 for c in coefficients if c) > 1 and (len(factors) > 1 or multiplicity > 1 or content != 1):
+            text = f"({text})"
+        parts.append(text if multiplicity == 1 else f"{text}^{multiplicity}")
+    text = "*".join(parts)
+    if abs(content.numerator) != 1:
+        text = f"{abs(content.numerator)}*{text}"
+    if content < 0:
+        text = f"-{text}"
+    if content.denominator != 1:
+        text = f"{text}/{content.denominator}"
+    return text
+
+
+def fast_factorization(equation, variable="x"):
+    """
+    Factorisation sans SymPy d'une équation univariée à coefficients entiers ou rationnels.
+    Retourne le résultat structuré (`factorized_result`, `content`, `factors` avec multiplicités),
+    ou None si l'entrée relève du chemin symbolique (y compris au-delà de FAST_PATH_BUDGET).
+    """
+    try:
+        terms = parse_terms(equation, variable)
+    except PolynomialSyntaxError:
+        return None
+    factored = factor_terms(terms)
+    if factored is None:
+        return None
+    content, factors = factored
+    return {
+        "factorized_result": format_factorization(content, factors, variable),
+        "content": str(content),
+        "factors": [
+            {
+                "factor": format_polynomial(coefficients, variable),
+                "multiplicity": multiplicity,
+                "degree": len(coefficients) - 1,
+                "coefficients": coefficients
+            }
+            for coefficients, multiplicity in factors
+        ],
+        "irreducible": len(factors) == 1 and factors[0][1] == 1,
+        "method": "fast"
+    }
+
+
+def symbolic_result(factored):
+    """Résultat structuré à partir d'une factorisation SymPy (entrées multivariées ou symboliques)."""
+    import sympy as sp
+
+    content = sp.Integer(1)
+    factors = []
+    for factor in sp.Mul.make_args(factored):
+        base, exponent = factor.as_base_exp()
+        if factor.is_number:
+            content *= factor
+        else:
+            multiplicity = int(exponent) if exponent.is_Integer else 1
+            base = base if exponent.is_Integer else factor
+            factors.append({"factor": str(base).replace("**", "^"), "multiplicity": multiplicity})
+    return {
+        "factorized_result": str(factored).replace("**", "^"),
+        "content": str(content),
+        "factors": factors,
+        "irreducible": len(factors) == 1 and factors[0]["multiplicity"] == 1,
+        "method": "symbolic"
+    }
@@ -0,0 +1,202 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Bornes des histogrammes de durée, en secondes
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+class Histogram:
+    """Histogramme cumulatif à bornes fixes : une observation coûte une recherche dichotomique et un incrément."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative, running = [], 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            running += bucket_count
+            cumulative.append((bound, running))
+        return cumulative, total, count
+
+
+class MetricsRegistry:
+    """
+    Métriques d'un processus de service au format texte Prometheus.
+
+    Les durées d'étapes (parse, solve, persist, serialize, render, predict...) sont accumulées dans
+    des histogrammes au fil des requêtes ; les valeurs instantanées (caches, files, requêtes en cours)
+    sont fournies par des collecteurs appelés uniquement au moment de la collecte.
+    En mode pré-forké, chaque worker expose ses propres métriques.
+    """
+
+    def __init__(self):
+        self.service = "unknown"
+        self.in_flight = 0
+        self._histograms = {}
+        self._help = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def histogram(self, name, help_text, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+                self._help[name] = help_text
+        return histogram
+
+    def observe_stage(self, stage, seconds):
+        self.histogram("polynome_stage_seconds", "Durée des étapes de traitement des requêtes.",
+                       stage=stage).observe(seconds)
+
+    @contextmanager
+    def stage(self, name):
+        """Mesure la durée d'une étape : `with metrics.stage("solve"): ...`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(name, time.perf_counter() - start)
+
+    def register_collector(self, collector):
+        """
+        Ajoute un collecteur appelé à chaque collecte ; il retourne des échantillons
+        (nom, type, aide, {étiquettes}, valeur).
+        """
+        self._collectors.append(collector)
+
+    def render(self):
+        lines = []
+        service = ("service", self.service)
+
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+        current = None
+        for (name, labels), histogram in histograms:
+            if name != current:
+                lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                current = name
+            base = (service,) + labels
+            cumulative, total, count = histogram.snapshot()
+            for bound, value in cumulative:
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{_labels(base + (('le', le),))} {value}")
+            lines.append(f"{name}_sum{_labels(base)} {total}")
+            lines.append(f"{name}_count{_labels(base)} {count}")
+
+        samples = [
+            ("polynome_http_in_flight", "gauge", "Requêtes HTTP en cours de traitement.", {}, self.in_flight)
+        ]
+        for collector in self._collectors:
+            try:
+                samples.extend(collector())
+            except Exception as e:
+                samples.append(("polynome_collector_errors", "gauge", "Collecteurs en échec lors de la collecte.",
+                                {"collector": getattr(collector, "__name__", "collector"), "error": type(e).__name__}, 1))
+
+        # Le format exige que les échantillons d'une même métrique soient contigus
+        families = {}
+        for name, metric_type, help_text, labels, value in samples:
+            family = families.setdefault(name, (metric_type, help_text, []))
+            if value is not None:
+                family[2].append(f"{name}{_labels((service,) + tuple(sorted(labels.items())))} {float(value)}")
+        for name, (metric_type, help_text, family_lines) in families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(family_lines)
+        return "\n".join(lines) + "\n"
+
+
+def _cache_samples(name, cache):
+    # Caches à compteurs hits/misses, ou mémoire + base (ResultCache)
+    stats = cache.stats()
+    hits = stats["hits"] if "hits" in stats else stats["memory_hits"] + stats["database_hits"]
+    misses = stats["misses"]
+    total = hits + misses
+    labels = {"cache": name}
+    return [
+        ("polynome_cache_hits_total", "counter", "Accès servis depuis le cache.", labels, hits),
+        ("polynome_cache_misses_total", "counter", "Accès absents du cache.", labels, misses),
+        ("polynome_cache_hit_ratio", "gauge", "Taux de succès du cache.", labels, hits / total if total else None),
+    ]
+
+
+def _queue_samples(name, queue):
+    # Files et pools : profondeur (en attente) et éléments en cours de traitement
+    stats = queue.stats()
+    labels = {"queue": name}
+    return [
+        ("polynome_queue_depth", "gauge", "Éléments en attente dans la file ou le pool.", labels,
+         stats.get("depth", stats.get("waiting"))),
+        ("polynome_queue_in_flight", "gauge", "Éléments en cours de traitement dans le pool.", labels,
+         stats.get("in_flight")),
+    ]
+
+
+def install(app, service, caches=None, queues=None, registry=None):
+    """
+    Branche les métriques sur une application Flask : requêtes en cours, durée par route et
+    endpoint GET /metrics. `caches` et `queues` associent un nom à un objet doté de `stats()`,
+    lu uniquement au moment de la collecte.
+    """
+    from flask import Response, g, request
+
+    registry = registry or metrics
+    registry.service = service
+    for name, cache in (caches or {}).items():
+        registry.register_collector(lambda name=name, cache=cache: _cache_samples(name, cache))
+    for name, queue in (queues or {}).items():
+        registry.register_collector(lambda name=name, queue=queue: _queue_samples(name, queue))
+
+    @app.before_request
+    def _start_request():
+        g.metrics_start = time.perf_counter()
+        with registry._lock:
+            registry.in_flight += 1
+
+    @app.teardown_request
+    def _end_request(exc):
+        if "metrics_start" not in g:
+            return
+        with registry._lock:
+            registry.in_flight -= 1
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        registry.histogram("polynome_request_seconds", "Durée totale des requêtes HTTP par route.",
+                           route=route, method=request.method).observe(time.perf_counter() - g.metrics_start)
+
+    @app.route("/metrics", methods=["GET"])
+    def prometheus_metrics():
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
+
+    return registry
+
+
+# Registre partagé par les modules d'un même processus
+metrics = MetricsRegistry()
@@ -0,0 +1,98 @@
+import numpy as np
+
+# Seuil en dessous duquel la dérivée est considérée comme nulle
+DERIVATIVE_EPSILON = 1e-12
+
+
+def horner(coefficients, x):
+    """
+    Évalue p(x) et p'(x) simultanément par le schéma de Horner.
+
+    `coefficients` est un tableau dense de degré décroissant ; `x` peut être un scalaire ou un tableau,
+    réel ou complexe.
+    """
+    x = np.asarray(x)
+    dtype = np.result_type(x.dtype, np.float64)
+    x = x.astype(dtype, copy=False)
+    p = np.full(x.shape, coefficients[0], dtype=dtype)
+    dp = np.zeros(x.shape, dtype=dtype)
+    for c in coefficients[1:]:
+        dp = dp * x + p
+        p = p * x + c
+    return p, dp
+
+
+def default_seeds(coefficients, count=16):
+    """
+    Grille d'estimations initiales couvrant l'intervalle [-R, R] où R est la borne de Cauchy des racines.
+    """
+    coefficients = np.trim_zeros(np.asarray(coefficients, dtype=float), "f")
+    if coefficients.size < 2:
+        return np.zeros(1)
+    bound = 1.0 + np.max(np.abs(coefficients[1:] / coefficients[0]))
+    return np.linspace(-bound, bound, count)
+
+
+def newton_multi_start(coefficients, guesses, tolerance=1e-7, max_iterations=100):
+    """
+    Méthode de Newton lancée depuis toutes les estimations à la fois.
+
+    Chaque estimation est une « voie » ; les voies convergées (ou bloquées sur une dérivée nulle)
+    sont masquées et ne sont plus évaluées. Retourne un dictionnaire de tableaux :
+    `solutions`, `iterations`, `converged` et `stalled`.
+    """
+    coefficients = np.asarray(coefficients, dtype=float)
+    x = np.array(guesses, dtype=float, ndmin=1)
+    iterations = np.zeros(x.shape, dtype=int)
+    converged = np.zeros(x.shape, dtype=bool)
+    stalled = np.zeros(x.shape, dtype=bool)
+    active = np.ones(x.shape, dtype=bool)
+
+    for _ in range(max_iterations):
+        lanes = np.flatnonzero(active)
+        if lanes.size == 0:
+            break
+
+        current = x[lanes]
+        p, dp = horner(coefficients, current)
+        iterations[lanes] += 1
+
+        # Éviter la division par zéro : la voie est arrêtée
+        flat = np.abs(dp) < DERIVATIVE_EPSILON
+        next_guess = current - p / np.where(flat, 1.0, dp)
+        next_guess[flat] = current[flat]
+
+        done = ~flat & (np.abs(next_guess - current) < tolerance)
+        diverged = ~np.isfinite(next_guess)
+
+        x[lanes] = next_guess
+        converged[lanes[done]] = True
+        stalled[lanes[flat]] = True
+        active[lanes[done | flat | diverged]] = False
+
+    return {
+        "solutions": x,
+        "iterations": iterations,
+        "converged": converged,
+        "stalled": stalled,
+    }
+
+
+def distinct_roots(solutions, converged, tolerance=1e-7):
+    """
+    Regroupe les solutions convergées proches les unes des autres et retourne une racine par groupe
+    (triées), avec pour chacune les indices des voies qui y ont convergé.
+    """
+    lanes = np.flatnonzero(converged)
+    if lanes.size == 0:
+        return []
+    order = lanes[np.argsort(solutions[lanes])]
+    threshold = max(10 * tolerance, 1e-9)
+
+    groups = [[order[0]]]
+    for lane in order[1:]:
+        previous = solutions[groups[-1][-1]]
+        if abs(solutions[lane] - previous) > threshold * max(1.0, abs(previous)):
+            groups.append([])
+        groups[-1].append(lane)
+    return [(float(np.mean(solutions[group])), group) for group in groups]
@@ -0,0 +1,235 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+
+from sqlalchemy import insert
+
+# Configuration par défaut (surchargée par variables d'environnement)
+DEFAULT_MAX_SIZE = int(os.environ.get("POLYNOME_WRITE_QUEUE_SIZE", 10000))
+DEFAULT_BATCH_SIZE = int(os.environ.get("POLYNOME_WRITE_BATCH_SIZE", 200))
+DEFAULT_FLUSH_INTERVAL = float(os.environ.get("POLYNOME_WRITE_FLUSH_INTERVAL", 0.5))
+DEFAULT_OVERFLOW_POLICY = os.environ.get("POLYNOME_WRITE_OVERFLOW", "block")  # block | drop | spill
+DEFAULT_SPILL_DIR = os.environ.get("POLYNOME_WRITE_SPILL_DIR", tempfile.gettempdir())
+
+OVERFLOW_POLICIES = ("block", "drop", "spill")
+
+# Marqueur d'arrêt déposé dans la file par close()
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """
+    File d'écriture différée : les lignes à insérer sont mises en file et un thread d'arrière-plan
+    les insère par lots (taille de lot ou fenêtre de temps atteinte), en dehors du chemin de la requête.
+
+    Lorsque la file est pleine, la politique `overflow_policy` s'applique : `block` attend une place,
+    `drop` abandonne la ligne, `spill` l'écrit dans un fichier NDJSON local rejoué au prochain démarrage (par le thread d'écriture).
+    """
+
+    def __init__(self, session_factory, metadata, name="polynome", max_size=DEFAULT_MAX_SIZE,
+                 batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 overflow_policy=DEFAULT_OVERFLOW_POLICY, spill_path=None):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Politique de débordement inconnue : {overflow_policy}")
+        self.session_factory = session_factory
+        self.metadata = metadata
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.spill_path = spill_path or os.path.join(DEFAULT_SPILL_DIR, f"{name}-write-queue.ndjson")
+
+        self._queue = queue.Queue(maxsize=max_size)
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._closed = False
+
+        # Métriques
+        self.enqueued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_flush_latency = 0.0
+        self.max_flush_latency = 0.0
+        self._total_flush_latency = 0.0
+
+    def start(self):
+        """Démarre le thread d'écriture (appelé automatiquement à la première mise en file)."""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name=f"{self.name}-write-behind", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def enqueue(self, model, values):
+        """Met en file une ligne `values` (dictionnaire colonne -> valeur) pour la table du modèle."""
+        self.enqueue_many(model, [values])
+
+    def enqueue_many(self, model, rows):
+        if self._thread is None:
+            self.start()
+        table = model.__table__.name
+        for values in rows:
+            self._put((table, values))
+
+    def _put(self, item):
+        if self._closed:
+            # Après l'arrêt, plus de flusher : on ne perd pas la ligne si un fichier de débordement est prévu
+            self._overflow(item)
+            return
+        try:
+            if self.overflow_policy == "block":
+                self._queue.put(item)
+            else:
+                self._queue.put_nowait(item)
+            self.enqueued += 1
+        except queue.Full:
+            self._overflow(item)
+
+    def _overflow(self, item):
+        if self.overflow_policy == "spill":
+            self._spill([item])
+        else:
+            self.dropped += 1
+            logging.warning(f"File d'écriture {self.name} pleine : ligne abandonnée pour la table {item[0]}.")
+
+    def _spill(self, items):
+        with self._spill_lock:
+            with open(self.spill_path, "a", encoding="utf-8") as spill_file:
+                for table, values in items:
+                    spill_file.write(json.dumps({"table": table, "values": values}) + "\n")
+        self.spilled += len(items)
+
+    def _replay_spill(self):
+        # Les lignes débordées lors d'une exécution précédente sont insérées par le thread d'écriture,
+        # hors du chemin de la requête. Les workers pré-forkés partagent le fichier : chacun tente de le
+        # réclamer (renommage atomique vers un nom propre au processus), un seul y parvient.
+        replay_path = f"{self.spill_path}.{os.getpid()}.replay"
+        try:
+            with self._spill_lock:
+                os.replace(self.spill_path, replay_path)
+        except FileNotFoundError:
+            return  # Rien à rejouer, ou fichier déjà réclamé par un autre worker
+        try:
+            batch = []
+            with open(replay_path, encoding="utf-8") as spill_file:
+                for line in spill_file:
+                    if line.strip():
+                        record = json.loads(line)
+                        batch.append((record["table"], record["values"]))
+                    if len(batch) >= self.batch_size:
+                        self._flush(batch, queued=False)
+                        batch = []
+            if batch:
+                self._flush(batch, queued=False)
+            os.remove(replay_path)
+            logging.info(f"File d'écriture {self.name} : lignes débordées rejouées depuis {self.spill_path}.")
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(f"File d'écriture {self.name} : rejeu impossible de {replay_path} : {e}")
+
+    def _run(self):
+        self._replay_spill()
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            batch = [item]
+
+            # Accumulation jusqu'à la taille de lot ou la fin de la fenêtre de temps
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+        # Vidage complet de la file avant l'arrêt
+        remaining = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.task_done()
+            else:
+                remaining.append(item)
+        for start in range(0, len(remaining), self.batch_size):
+            self._flush(remaining[start:start + self.batch_size])
+
+    def _flush(self, batch, queued=True):
+        # Regroupement par table pour une insertion groupée (executemany) par table ; `queued` : lignes
+        # sorties de la file (sinon, rejeu du fichier de débordement)
+        rows_by_table = {}
+        for table, values in batch:
+            rows_by_table.setdefault(table, []).append(values)
+
+        started = time.perf_counter()
+        session = self.session_factory()
+        try:
+            for table, rows in rows_by_table.items():
+                session.execute(insert(self.metadata.tables[table]), rows)
+            session.commit()
+            self.flushed += len(batch)
+        except Exception as e:
+            session.rollback()
+            self.failed += len(batch)
+            logging.error(f"Erreur lors de l'insertion groupée ({len(batch)} lignes) : {e}")
+            if self.overflow_policy == "spill":
+                self._spill(batch)
+        finally:
+            session.close()
+            latency = time.perf_counter() - started
+            self.batches += 1
+            self.last_flush_latency = latency
+            self.max_flush_latency = max(self.max_flush_latency, latency)
+            self._total_flush_latency += latency
+            if queued:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def join(self):
+        """Attend que toutes les lignes mises en file aient été traitées."""
+        self._queue.join()
+
+    def close(self, timeout=10.0):
+        """Arrêt gracieux : vide la file puis arrête le thread d'écriture."""
+        if self._closed or self._thread is None:
+            self._closed = True
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self):
+        return {
+            "depth": self._queue.qsize(),
+            "max_size": self._queue.maxsize,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_flush_latency": self.last_flush_latency,
+            "max_flush_latency": self.max_flush_latency,
+            "avg_flush_latency": self._total_flush_latency / self.batches if self.batches else 0.0,
+        }
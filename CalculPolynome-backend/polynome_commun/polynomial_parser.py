@@ -0,0 +1,235 @@
+import re
+from fractions import Fraction
+
+import numpy as np
+
+# Degré maximal accepté (protège contre `x^1000000`, y compris sur le repli SymPy)
+MAX_DEGREE = 1000
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<name>[A-Za-z_]\w*)
+      | (?P<op>\*\*|[-+*/^()])
+    )""", re.VERBOSE)
+# Exposants littéraux, repérés dans le texte brut avant le repli SymPy
+_LITERAL_EXPONENT = re.compile(r"(?:\^|\*\*)\s*\(?\s*(\d+)")
+
+
+class PolynomialSyntaxError(ValueError):
+    """L'entrée sort de la grammaire polynomiale de l'analyseur rapide."""
+
+
+class PolynomialDegreeError(ValueError):
+    """
+    Degré supérieur à MAX_DEGREE. Erreur définitive : contrairement à PolynomialSyntaxError,
+    elle ne donne jamais lieu à un repli sur SymPy.
+    """
+
+
+def _degree_error():
+    return PolynomialDegreeError(f"Degré supérieur à {MAX_DEGREE}.")
+
+
+def _tokenize(equation):
+    tokens = []
+    position = 0
+    equation = equation.rstrip()
+    while position < len(equation):
+        match = _TOKEN.match(equation, position)
+        if match is None:
+            raise PolynomialSyntaxError(f"Caractère inattendu à la position {position}.")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "op" and value == "**":
+            value = "^"
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+def _number(text):
+    # Les entiers restent exacts ; un littéral décimal rend le coefficient flottant (comme SymPy)
+    if text.isdigit():
+        return Fraction(int(text))
+    return float(text)
+
+
+def _add(left, right, sign=1):
+    result = dict(left)
+    for exponent, coefficient in right.items():
+        value = result.get(exponent, 0) + sign * coefficient
+        if value == 0:
+            result.pop(exponent, None)
+        else:
+            result[exponent] = value
+    return result
+
+
+def _multiply(left, right):
+    result = {}
+    for e1, c1 in left.items():
+        for e2, c2 in right.items():
+            exponent = e1 + e2
+            if exponent > MAX_DEGREE:
+                raise _degree_error()
+            value = result.get(exponent, 0) + c1 * c2
+            if value == 0:
+                result.pop(exponent, None)
+            else:
+                result[exponent] = value
+    return result
+
+
+def _constant(terms):
+    # Valeur d'un polynôme constant, None s'il dépend de la variable
+    if any(exponent != 0 for exponent in terms):
+        return None
+    return terms.get(0, Fraction(0))
+
+
+class _Parser:
+    """
+    Descente récursive sur la grammaire :
+        somme   := produit (('+' | '-') produit)*
+        produit := unaire (('*' | '/' | implicite) unaire)*
+        unaire  := ('+' | '-') unaire | puissance
+        puissance := atome ('^' unaire)?
+        atome   := nombre | variable | '(' somme ')'
+    Chaque nœud est un polynôme creux {exposant: coefficient}.
+    """
+
+    def __init__(self, tokens, variable):
+        self.tokens = tokens
+        self.variable = variable
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self):
+        terms = self.sum()
+        if self.position != len(self.tokens):
+            raise PolynomialSyntaxError(f"Jeton inattendu : {self.peek()[1]!r}.")
+        return terms
+
+    def sum(self):
+        terms = self.product()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            sign = 1 if self.take()[1] == "+" else -1
+            terms = _add(terms, self.product(), sign)
+        return terms
+
+    def product(self):
+        terms = self.unary()
+        while True:
+            kind, value = self.peek()
+            if (kind, value) == ("op", "*"):
+                self.take()
+                terms = _multiply(terms, self.unary())
+            elif (kind, value) == ("op", "/"):
+                self.take()
+                divisor = _constant(self.unary())
+                if divisor is None or divisor == 0:
+                    raise PolynomialSyntaxError("Division par une expression non constante ou nulle.")
+                terms = {exponent: coefficient / divisor for exponent, coefficient in terms.items()}
+            elif kind == "name" or (kind, value) == ("op", "("):
+                # Multiplication implicite : `3x^2`, `2(x + 1)`
+                terms = _multiply(terms, self.power())
+            else:
+                return terms
+
+    def unary(self):
+        if self.peek() == ("op", "-"):
+            self.take()
+            return {exponent: -coefficient for exponent, coefficient in self.unary().items()}
+        if self.peek() == ("op", "+"):
+            self.take()
+            return self.unary()
+        return self.power()
+
+    def power(self):
+        base = self.atom()
+        if self.peek() != ("op", "^"):
+            return base
+        self.take()
+        exponent = _constant(self.unary())
+        if exponent is None or exponent != int(exponent) or exponent < 0:
+            raise PolynomialSyntaxError("L'exposant doit être un entier positif ou nul.")
+        exponent = int(exponent)
+        if exponent * max(base, default=0) > MAX_DEGREE:
+            raise _degree_error()
+
+        # Exponentiation rapide par carrés successifs
+        result = {0: Fraction(1)}
+        while exponent:
+            if exponent & 1:
+                result = _multiply(result, base)
+            exponent >>= 1
+            if exponent:
+                base = _multiply(base, base)
+        return result
+
+    def atom(self):
+        kind, value = self.take()
+        if kind == "number":
+            number = _number(value)
+            return {0: number} if number != 0 else {}
+        if kind == "name":
+            if value != self.variable:
+                raise PolynomialSyntaxError(f"Symbole inconnu : {value!r}.")
+            return {1: Fraction(1)}
+        if (kind, value) == ("op", "("):
+            terms = self.sum()
+            if self.take() != ("op", ")"):
+                raise PolynomialSyntaxError("Parenthèse fermante manquante.")
+            return terms
+        raise PolynomialSyntaxError("Expression incomplète." if kind is None else f"Jeton inattendu : {value!r}.")
+
+
+def parse_terms(equation, variable="x"):
+    """
+    Analyse un polynôme univarié sans SymPy et retourne sa forme creuse {exposant: coefficient}.
+
+    Accepte `^` et `**`, la multiplication implicite (`3x^2`), les parenthèses, les rationnels (`1/3 x`)
+    et les décimaux. Les coefficients sont des `Fraction` exactes, ou des `float` dès qu'un littéral
+    décimal intervient. Lève `PolynomialSyntaxError` hors de cette grammaire, et
+    `PolynomialDegreeError` au-delà de MAX_DEGREE.
+    """
+    return _Parser(_tokenize(equation), variable).parse()
+
+
+def dense_coefficients(terms):
+    """Coefficients denses par degré décroissant (au moins un coefficient, nul pour le polynôme nul)."""
+    degree = max(terms, default=0)
+    return [terms.get(exponent, Fraction(0)) for exponent in range(degree, -1, -1)]
+
+
+def coefficient_array(equation, variable="x", fallback=True):
+    """
+    Coefficients du polynôme (degré décroissant) en tableau NumPy de flottants.
+
+    Hors de la grammaire polynomiale, l'analyse est confiée à SymPy si `fallback` est vrai
+    (None si l'expression n'est pas un polynôme à coefficients numériques).
+    Lève `PolynomialDegreeError` au-delà de MAX_DEGREE, avec ou sans repli.
+    """
+    try:
+        return np.array([float(c) for c in dense_coefficients(parse_terms(equation, variable))], dtype=float)
+    except PolynomialSyntaxError:
+        if not fallback:
+            raise
+    # Exposant littéral trop grand : refus avant que SymPy ne développe l'expression
+    if any(int(exponent) > MAX_DEGREE for exponent in _LITERAL_EXPONENT.findall(equation)):
+        raise _degree_error()
+    # Import différé : SymPy n'est chargé que pour les entrées hors grammaire
+    from polynome_commun.expression_cache import parse_expression
+    coefficients = parse_expression(equation, variable).coefficients
+    # Degré atteint sans exposant littéral trop grand (puissances imbriquées, produits)
+    if coefficients is not None and coefficients.size - 1 > MAX_DEGREE:
+        raise _degree_error()
+    return coefficients
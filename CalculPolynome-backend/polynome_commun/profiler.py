@@ -0,0 +1,331 @@
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter, deque
+
+# Profilage des requêtes lentes, désactivé par défaut ("1" pour l'activer)
+ENABLED = os.environ.get("POLYNOME_PROFILER", "0") == "1"
+# Durée (s) au-delà de laquelle la pile d'une requête est échantillonnée
+THRESHOLD = float(os.environ.get("POLYNOME_PROFILE_THRESHOLD", 2))
+# Intervalle d'échantillonnage des piles, en secondes
+INTERVAL = float(os.environ.get("POLYNOME_PROFILE_INTERVAL", 0.01))
+# Dossier des captures
+DIRECTORY = os.environ.get("POLYNOME_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "polynome-profiles"))
+# Espace disque maximal occupé par les captures ; les plus anciennes sont supprimées au-delà
+MAX_BYTES = int(os.environ.get("POLYNOME_PROFILE_MAX_BYTES", 50 * 1024 * 1024))
+# Nombre maximal de captures écrites par minute et par processus
+MAX_PER_MINUTE = int(os.environ.get("POLYNOME_PROFILE_MAX_PER_MINUTE", 6))
+
+# Taille maximale d'un paramètre recopié dans les métadonnées d'une capture
+MAX_PARAM_LENGTH = 500
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def collapse(frame, root=None):
+    """
+    Pile d'appels au format « replié » (flame graph) : de la racine vers la fonction en cours, séparées par `;`.
+    `root` (objet code) : la pile commence à cette fonction plutôt qu'à la racine du thread.
+    """
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        if frame.f_code is root:
+            break
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+# Profileur et requête du thread courant, pour les calculs délégués à un autre processus
+_current = threading.local()
+
+
+class _Request:
+    def __init__(self):
+        self.start = time.monotonic()
+        self.stacks = Counter()
+        self.remote = False  # Calcul en cours dans un autre processus, qui s'échantillonne lui-même
+
+
+class RemoteSampling:
+    """
+    Échantillonnage d'un calcul délégué à un processus du pool symbolique : le processus échantillonne
+    sa propre pile (`settings` : délai avant le seuil de la requête, intervalle) et renvoie des piles
+    repliées, ajoutées à la requête sous la pile de l'appelant. Pendant ce temps, le thread de la
+    requête, qui ne fait qu'attendre le résultat, n'est plus échantillonné.
+    """
+
+    def __init__(self, profiler, request, prefix):
+        self.profiler = profiler
+        self.request = request
+        self.prefix = prefix
+        self.settings = (max(profiler.threshold - (time.monotonic() - request.start), 0.0), profiler.interval)
+        request.remote = True
+
+    def add(self, stacks):
+        with self.profiler._lock:
+            for stack, count in stacks.items():
+                self.request.stacks[f"{self.prefix};{stack}"] += count
+
+    def close(self):
+        self.request.remote = False
+
+
+def remote_sampling():
+    """Échantillonnage délégué pour la requête profilée du thread courant, ou None."""
+    profiler = getattr(_current, "profiler", None)
+    if profiler is None:
+        return None
+    with profiler._lock:
+        request = profiler._active.get(threading.get_ident())
+    if request is None:
+        return None
+    return RemoteSampling(profiler, request, collapse(sys._getframe(1)))
+
+
+class SlowRequestProfiler:
+    """
+    Échantillonneur de piles pour les requêtes lentes.
+
+    Un seul thread parcourt les requêtes en cours ; seules celles qui dépassent `threshold`
+    sont échantillonnées (`sys._current_frames`), toutes les `interval` secondes ; un calcul confié
+    au pool symbolique est échantillonné dans son processus (`remote_sampling`). À la fin
+    d'une requête échantillonnée, la pile repliée est écrite dans `directory` (fichier `.folded`,
+    lisible par flamegraph.pl ou speedscope) avec ses métadonnées (`.json` : endpoint, empreinte
+    de l'équation, paramètres, durée). Le nombre de captures par minute et l'espace disque
+    total sont bornés. Sans requête en cours, le thread reste en attente.
+    """
+
+    def __init__(self, service, directory=DIRECTORY, threshold=THRESHOLD, interval=INTERVAL,
+                 max_bytes=MAX_BYTES, max_per_minute=MAX_PER_MINUTE):
+        self.service = service
+        self.directory = directory
+        self.threshold = threshold
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.max_per_minute = max_per_minute
+        self._active = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._written = deque()
+        self._thread = None
+        self.captured = 0
+        self.dropped = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._thread = threading.Thread(target=self._sample_loop, name="slow-request-profiler", daemon=True)
+                self._thread.start()
+
+    def begin(self):
+        """Début d'une requête dans le thread courant."""
+        with self._lock:
+            self._active[threading.get_ident()] = _Request()
+        _current.profiler = self
+        self._wake.set()
+
+    def end(self, tags):
+        """
+        Fin de la requête du thread courant ; retourne l'identifiant de la capture écrite, ou None.
+        `tags` (fonction retournant endpoint, paramètres...) n'est appelée que si la requête a été échantillonnée.
+        """
+        _current.profiler = None
+        with self._lock:
+            request = self._active.pop(threading.get_ident(), None)
+            stacks = Counter(request.stacks) if request is not None else None
+        if not stacks:
+            return None
+        return self._write(stacks, tags(), time.monotonic() - request.start)
+
+    def _sample_loop(self):
+        while True:
+            self._wake.wait()
+            time.sleep(self.interval)
+            now = time.monotonic()
+            with self._lock:
+                if not self._active:
+                    self._wake.clear()
+                    continue
+                slow = [(ident, request) for ident, request in self._active.items()
+                        if now - request.start >= self.threshold and not request.remote]
+            if not slow:
+                continue
+            frames = sys._current_frames()
+            stacks = [(request, collapse(frames[ident])) for ident, request in slow if ident in frames]
+            del frames
+            with self._lock:
+                for request, stack in stacks:
+                    request.stacks[stack] += 1
+
+    def _allow(self):
+        # Fenêtre glissante d'une minute
+        now = time.monotonic()
+        with self._lock:
+            while self._written and now - self._written[0] > 60:
+                self._written.popleft()
+            if len(self._written) >= self.max_per_minute:
+                return False
+            self._written.append(now)
+            return True
+
+    def _write(self, stacks, tags, duration):
+        if not self._allow():
+            self.dropped += 1
+            return None
+
+        capture_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{self.service}-{uuid.uuid4().hex[:8]}"
+        metadata = dict(
+            tags,
+            id=capture_id,
+            service=self.service,
+            duration=round(duration, 3),
+            threshold=self.threshold,
+            samples=sum(stacks.values()),
+            interval=self.interval,
+            captured_at=time.time(),
+        )
+        try:
+            with open(os.path.join(self.directory, capture_id + ".folded"), "w", encoding="utf-8") as output:
+                for stack, count in stacks.most_common():
+                    output.write(f"{stack} {count}\n")
+            with open(os.path.join(self.directory, capture_id + ".json"), "w", encoding="utf-8") as output:
+                json.dump(metadata, output)
+            self._enforce_disk_cap()
+        except OSError as e:
+            logging.warning(f"Capture de profilage non écrite : {e}")
+            return None
+        self.captured += 1
+        logging.warning(f"Requête lente ({duration:.2f} s) sur {tags.get('endpoint')} : capture {capture_id}")
+        return capture_id
+
+    def _captures_on_disk(self):
+        # (date, taille totale, identifiant) de chaque capture, de la plus ancienne à la plus récente
+        captures = {}
+        for name in os.listdir(self.directory):
+            capture_id, extension = os.path.splitext(name)
+            path = os.path.join(self.directory, name)
+            if extension in (".folded", ".json") and os.path.isfile(path):
+                modified, size = captures.get(capture_id, (0, 0))
+                captures[capture_id] = (max(modified, os.path.getmtime(path)), size + os.path.getsize(path))
+        return sorted((modified, size, capture_id) for capture_id, (modified, size) in captures.items())
+
+    def _enforce_disk_cap(self):
+        # Suppression des captures les plus anciennes jusqu'à repasser sous le plafond
+        captures = self._captures_on_disk()
+        total = sum(size for _, size, _ in captures)
+        for _, size, capture_id in captures:
+            if total <= self.max_bytes:
+                break
+            for extension in (".folded", ".json"):
+                try:
+                    os.remove(os.path.join(self.directory, capture_id + extension))
+                except OSError:
+                    pass
+            total -= size
+
+    def captures(self, limit=50):
+        """Métadonnées des captures les plus récentes, de la plus récente à la plus ancienne."""
+        captures = []
+        for _, _, capture_id in reversed(self._captures_on_disk()):
+            if len(captures) >= limit:
+                break
+            try:
+                with open(os.path.join(self.directory, capture_id + ".json"), encoding="utf-8") as source:
+                    captures.append(json.load(source))
+            except (OSError, ValueError):
+                continue
+        return captures
+
+    def read(self, capture_id):
+        """Contenu replié d'une capture, ou None si elle n'existe pas (ou plus)."""
+        if os.path.basename(capture_id) != capture_id:
+            return None
+        try:
+            with open(os.path.join(self.directory, capture_id + ".folded"), encoding="utf-8") as source:
+                return source.read()
+        except OSError:
+            return None
+
+    def stats(self):
+        with self._lock:
+            active = len(self._active)
+        return {
+            "enabled": True,
+            "threshold": self.threshold,
+            "interval": self.interval,
+            "directory": self.directory,
+            "active": active,
+            "captured": self.captured,
+            "dropped": self.dropped,
+        }
+
+
+def request_tags(request):
+    """Endpoint, empreinte de l'équation et paramètres (tronqués) d'une requête Flask."""
+    from polynome_commun.result_cache import equation_hash
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        data = {}
+    params = {
+        key: (value if isinstance(value, str) else json.dumps(value, default=str))[:MAX_PARAM_LENGTH]
+        for key, value in data.items()
+    }
+    tags = {"endpoint": f"{request.method} {request.path}", "params": params, "equation_hash": None}
+
+    equation = data.get("equation", data.get("polynomial"))
+    if isinstance(equation, str):
+        try:
+            tags["equation_hash"] = equation_hash(equation, data.get("variable", "x"))
+        except Exception:
+            pass  # Équation invalide : capture conservée sans empreinte
+    return tags
+
+
+def install(app, service, prefix, profiler=None):
+    """
+    Ajoute GET `<prefix>/profiles` (captures récentes) et GET `<prefix>/profiles/<id>` (pile repliée
+    d'une capture). L'échantillonnage n'est branché sur les requêtes que si POLYNOME_PROFILER=1
+    ou si un profileur est fourni ; sinon les requêtes ne paient aucun coût.
+    """
+    from flask import Response, jsonify, request
+
+    if profiler is None and ENABLED:
+        profiler = SlowRequestProfiler(service)
+
+    if profiler is not None:
+        profiler.start()
+
+        @app.before_request
+        def _begin_profile():
+            profiler.begin()
+
+        @app.teardown_request
+        def _end_profile(exc):
+            profiler.end(lambda: request_tags(request))
+
+    @app.route(f"{prefix}/profiles", methods=["GET"])
+    def list_profiles():
+        if profiler is None:
+            return jsonify({"profiler": {"enabled": False}, "captures": []}), 200
+        limit = request.args.get("limit", 50, type=int)
+        return jsonify({"profiler": profiler.stats(), "captures": profiler.captures(limit)}), 200
+
+    @app.route(f"{prefix}/profiles/<capture_id>", methods=["GET"])
+    def read_profile(capture_id):
+        folded = profiler.read(capture_id) if profiler is not None else None
+        if folded is None:
+            return jsonify({"error": "Capture introuvable.", "success": False}), 404
+        return Response(folded, mimetype="text/plain")
+
+    return profiler
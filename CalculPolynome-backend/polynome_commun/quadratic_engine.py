@@ -0,0 +1,56 @@
+import numpy as np
+
+
+def solve_quadratic_batch(a, b, c):
+    """
+    Résout a*x^2 + b*x + c = 0 pour des tableaux de coefficients, en une seule passe vectorisée.
+
+    Utilise la formule stable q = -(b + signe(b)*sqrt(Δ))/2, x1 = q/a, x2 = c/q, qui évite
+    l'annulation catastrophique de la formule classique lorsque |b| est grand devant 4ac.
+    Retourne (x1, x2, discriminant) ; x1 et x2 sont complexes, et NaN là où a == 0.
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    c = np.asarray(c, dtype=float)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        # Dépassement de capacité : racines infinies, refusées par format_roots
+        discriminant = b * b - 4.0 * a * c
+        sqrt_disc = np.sqrt(np.abs(discriminant))
+        sign_b = np.where(b >= 0, 1.0, -1.0)
+
+        # Racines réelles : forme stable
+        q = -0.5 * (b + sign_b * sqrt_disc)
+        x1_real = q / a
+        x2_real = np.where(q != 0, c / np.where(q != 0, q, 1.0), 0.0)
+
+        # Racines complexes conjuguées : pas d'annulation possible
+        real_part = -b / (2.0 * a)
+        imag_part = sqrt_disc / (2.0 * np.abs(a))
+
+        complex_mask = discriminant < 0
+        x1 = np.where(complex_mask, real_part - 1j * imag_part, x1_real)
+        x2 = np.where(complex_mask, real_part + 1j * imag_part, x2_real)
+
+    invalid = a == 0
+    x1[invalid] = np.nan
+    x2[invalid] = np.nan
+    return x1, x2, discriminant
+
+
+def format_roots(x1, x2, discriminant, decimals=2):
+    """
+    Met en forme les racines d'une équation : liste triée de réels arrondis, une seule racine si Δ = 0,
+    et des objets {"real", "imag"} pour les racines complexes.
+    Lève ValueError si une racine n'est pas finie (coefficients infinis ou NaN, dépassement de capacité).
+    """
+    if not (np.isfinite(x1) and np.isfinite(x2) and np.isfinite(discriminant)):
+        raise ValueError("Racines hors de la plage des nombres flottants.")
+    if discriminant > 0:
+        return sorted([round(float(x1.real), decimals), round(float(x2.real), decimals)])
+    if discriminant == 0:
+        return [round(float(x1.real), decimals)]
+    return [
+        {"real": round(float(root.real), decimals), "imag": round(float(root.imag), decimals)}
+        for root in (x1, x2)
+    ]
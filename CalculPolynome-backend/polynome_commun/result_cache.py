@@ -0,0 +1,169 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import bindparam, inspect, text
+
+from polynome_commun.expression_cache import canonicalize
+
+# Nombre de résultats conservés en mémoire par service
+DEFAULT_MAX_SIZE = int(os.environ.get("POLYNOME_RESULT_CACHE_SIZE", 4096))
+
+
+def equation_hash(equation, variable="x", **params):
+    """
+    Empreinte SHA-256 de l'équation canonique et des paramètres qui influencent le résultat
+    (par exemple `initial_guess` et `tolerance` pour Newton).
+    """
+    canonical, variable = canonicalize(equation, variable)
+    payload = json.dumps([canonical, variable, params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Mémoïsation en lecture des résultats : d'abord un niveau LRU en mémoire, puis une recherche
+    indexée par `equation_hash` dans la table du service. Le calcul n'a lieu qu'en cas d'absence.
+
+    `from_row` reconstruit le résultat à partir d'une ligne (ou retourne None si c'est impossible).
+    Une erreur de base de données est journalisée et traitée comme une absence.
+    """
+
+    def __init__(self, session_factory, model, from_row, name="polynome", max_size=DEFAULT_MAX_SIZE):
+        self.session_factory = session_factory
+        self.model = model
+        self.from_row = from_row
+        self.name = name
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.database_hits = 0
+        self.misses = 0
+
+    def get(self, key, database=True, default=None):
+        return self.get_many([key], database).get(key, default)
+
+    def get_many(self, keys, database=True):
+        """Retourne un dictionnaire clé -> résultat pour les clés trouvées (une seule requête SQL)."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+                    self.memory_hits += 1
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing and database:
+            for key, result in self._load(missing).items():
+                found[key] = result
+                self.database_hits += 1
+                self.put(key, result)
+
+        self.misses += sum(1 for key in missing if key not in found)
+        return found
+
+    def _load(self, keys):
+        loaded = {}
+        session = self.session_factory()
+        try:
+            rows = (
+                session.query(self.model)
+                .filter(self.model.equation_hash.in_(keys))
+                .order_by(self.model.id.desc())
+                .all()
+            )
+            for row in rows:
+                if row.equation_hash not in loaded:
+                    result = self.from_row(row)
+                    if result is not None:
+                        loaded[row.equation_hash] = result
+        except Exception as e:
+            logging.error(f"Cache de résultats {self.name} : lecture en base impossible : {e}")
+        finally:
+            session.close()
+        return loaded
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "memory_hits": self.memory_hits,
+            "database_hits": self.database_hits,
+            "misses": self.misses,
+        }
+
+
+def migrate_equation_hash(engine, model, row_key=None, chunk_size=1000):
+    """
+    Ajoute la colonne `equation_hash` et son index à une table existante si nécessaire,
+    puis calcule l'empreinte des anciennes lignes avec `row_key(row)` (None : ligne laissée telle quelle).
+    """
+    table = model.__table__
+    inspector = inspect(engine)
+    columns = {column["name"] for column in inspector.get_columns(table.name)}
+    indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+    index_name = f"ix_{table.name}_equation_hash"
+
+    with engine.begin() as connection:
+        if "equation_hash" not in columns:
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN equation_hash VARCHAR(64) NULL"))
+        if index_name not in indexes:
+            connection.execute(text(f"CREATE INDEX {index_name} ON {table.name} (equation_hash)"))
+
+    if row_key is None:
+        return 0
+
+    # Remplissage par tranches des lignes antérieures à la colonne
+    backfilled = 0
+    last_id = 0
+    with engine.begin() as connection:
+        while True:
+            rows = connection.execute(
+                table.select()
+                .where(table.c.equation_hash.is_(None), table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+            updates = [{"row_id": row.id, "hash": row_key(row)} for row in rows]
+            updates = [update for update in updates if update["hash"] is not None]
+            if updates:
+                connection.execute(
+                    table.update().where(table.c.id == bindparam("row_id")).values(equation_hash=bindparam("hash")),
+                    updates
+                )
+                backfilled += len(updates)
+            last_id = rows[-1].id
+    if backfilled:
+        logging.info(f"Table {table.name} : empreinte calculée pour {backfilled} lignes existantes.")
+    return backfilled
+
+
+def migrate_columns(engine, model, names):
+    """
+    Ajoute à une table existante les colonnes `names` du modèle qui lui manquent (nullables : les
+    anciennes lignes les laissent vides). Retourne la liste des colonnes ajoutées.
+    """
+    table = model.__table__
+    columns = {column["name"] for column in inspect(engine).get_columns(table.name)}
+    added = [name for name in names if name not in columns]
+    with engine.begin() as connection:
+        for name in added:
+            column_type = table.c[name].type.compile(dialect=engine.dialect)
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type} NULL"))
+    return added
@@ -0,0 +1,243 @@
+import math
+from fractions import Fraction
+
+import numpy as np
+
+from polynome_commun.factorization import square_free_decomposition
+from polynome_commun.newton_engine import horner
+
+# Pas de bisection exacte autorisés au-delà de `max_iterations` quand l'affinage flottant est repris
+EXACT_BISECTION_STEPS = 200
+
+# Les polynômes exacts sont des listes de coefficients entiers par degré croissant (indice = degré).
+
+
+def _variations(f):
+    # Nombre de changements de signe de la suite des coefficients (zéros ignorés)
+    signs = [c > 0 for c in f if c]
+    return sum(1 for a, b in zip(signs, signs[1:]) if a != b)
+
+
+def _shift_one(f):
+    # Coefficients de f(x + 1), par décalage de Taylor en O(n²) additions entières
+    g = list(f)
+    n = len(g)
+    for i in range(n - 1):
+        for j in range(n - 2, i - 1, -1):
+            g[j] += g[j + 1]
+    return g
+
+
+def _sign_at(f, r):
+    # Signe exact de f(p/q) : q^n f(p/q) évalué en entiers par Horner homogène
+    p, q = r.numerator, r.denominator
+    value, q_power = f[-1], 1
+    for c in reversed(f[:-1]):
+        q_power *= q
+        value = value * p + c * q_power
+    return (value > 0) - (value < 0)
+
+
+def _positive_intervals(f):
+    """
+    Isolation des racines strictement positives de f (sans facteur carré, f(0) ≠ 0) par bisection
+    de Vincent–Collins–Akritas : la règle des signes de Descartes, appliquée à l'image de chaque
+    intervalle sur (0, +∞), borne le nombre de racines ; on coupe en deux tant qu'elle dépasse 1.
+    Retourne des couples (borne inférieure, borne supérieure) exacts, égaux pour une racine rationnelle
+    tombée sur un point de coupure.
+    """
+    if _variations(f) == 0:
+        return []
+    # Borne de Cauchy arrondie à une puissance de 2 : toutes les racines sont dans (0, bound)
+    lead = abs(f[-1])
+    bound = 1 << (1 + -(-max(abs(c) for c in f[:-1]) // lead)).bit_length()
+    n = len(f) - 1
+    # q(t) = f(bound · t) : racines ramenées dans (0, 1)
+    stack = [([c * bound ** i for i, c in enumerate(f)], Fraction(0), Fraction(bound))]
+    intervals = []
+    while stack:
+        q, start, width = stack.pop()
+        count = _variations(_shift_one(q[::-1]))
+        if count == 0:
+            continue
+        if count == 1:
+            intervals.append((start, start + width))
+            continue
+        middle = start + width / 2
+        if _sign_at(q, Fraction(1, 2)) == 0:
+            # Racine rationnelle exacte au point de coupure : division par (2t - 1)
+            intervals.append((middle, middle))
+            q = _divide_half(q)
+        # 2^n q(t/2) et 2^n q((t + 1)/2) : moitiés gauche et droite ramenées sur (0, 1)
+        n = len(q) - 1
+        left = [c << (n - i) for i, c in enumerate(q)]
+        stack.append((_shift_one(left), middle, width / 2))
+        stack.append((left, start, width / 2))
+    return intervals
+
+
+def _divide_half(q):
+    # Quotient exact de q(t) par (2t - 1)
+    quotient = [0] * (len(q) - 1)
+    carry = 0
+    for k in range(len(q) - 1, 0, -1):
+        carry = (q[k] + carry) // 2
+        quotient[k - 1] = carry
+    return quotient
+
+
+def _integer_coefficients(terms):
+    # Coefficients entiers (par degré croissant) proportionnels au polynôme {exposant: coefficient} ;
+    # un `float` est un rationnel dyadique exact
+    degree = max(terms)
+    exact = {exponent: Fraction(c) for exponent, c in terms.items()}
+    denominator = math.lcm(*(c.denominator for c in exact.values()))
+    f = [int(exact.get(exponent, 0) * denominator) for exponent in range(degree + 1)]
+    content = math.gcd(*f)
+    return [c // content if f[-1] > 0 else -c // content for c in f]
+
+
+def _derivative(f):
+    return [i * c for i, c in enumerate(f)][1:]
+
+
+def _side_signs(f, lower, upper):
+    # Signes de f juste à droite de `lower` et juste à gauche de `upper` (racine simple en borne :
+    # signe de la dérivée)
+    return (_sign_at(f, lower) or _sign_at(_derivative(f), lower),
+            _sign_at(f, upper) or -_sign_at(_derivative(f), upper))
+
+
+def isolate_real_roots(terms):
+    """
+    Isole les racines réelles du polynôme {exposant: coefficient} dans des intervalles disjoints.
+
+    La décomposition sans facteur carré donne les multiplicités ; la partie sans facteur carré
+    (produit des facteurs de Yun) est isolée par bisection de Descartes, sur ses racines positives
+    et sur celles de p(-x). Retourne les triplets (borne inférieure, borne supérieure, multiplicité)
+    exacts (`Fraction`, bornes égales pour une racine rationnelle atteinte par coupure), triés,
+    et la partie sans facteur carré (coefficients entiers par degré croissant).
+    """
+    terms = {exponent: c for exponent, c in terms.items() if c}
+    if not terms:
+        raise ValueError("Le polynôme nul admet tous les réels pour racines.")
+    f = _integer_coefficients(terms)
+    zero = next(i for i, c in enumerate(f) if c)
+    f = f[zero:]
+    parts = square_free_decomposition(f) if len(f) > 1 else []
+    if zero:
+        parts.append(([0, 1], zero))
+
+    square_free = [1]
+    for part, _ in parts:
+        product = [0] * (len(square_free) + len(part) - 1)
+        for i, a in enumerate(square_free):
+            for j, b in enumerate(part):
+                product[i + j] += a * b
+        square_free = product
+
+    intervals = []
+    if square_free[0] == 0:
+        intervals.append((Fraction(0), Fraction(0)))
+        reduced = square_free[1:]
+    else:
+        reduced = square_free
+    if len(reduced) > 1:
+        intervals.extend(_positive_intervals(reduced))
+        mirrored = [-c if i % 2 else c for i, c in enumerate(reduced)]
+        intervals.extend((-upper, -lower) for lower, upper in _positive_intervals(mirrored))
+    intervals.sort()
+
+    roots = []
+    for lower, upper in intervals:
+        # Le facteur de Yun qui porte la racine est celui qui s'annule (ou change de signe) dans l'intervalle
+        for part, multiplicity in parts:
+            if lower == upper:
+                if _sign_at(part, lower) == 0:
+                    break
+            else:
+                left, right = _side_signs(part, lower, upper)
+                if left != right:
+                    break
+        roots.append((lower, upper, multiplicity))
+    return roots, square_free
+
+
+def refine_roots(square_free, intervals, tolerance=1e-7, max_iterations=100):
+    """
+    Affine simultanément chaque intervalle isolant par Newton sécurisé par bisection.
+
+    Chaque intervalle est une « voie » ; le pas de Newton n'est accepté que s'il reste dans
+    l'intervalle courant, sinon on coupe en deux, et l'intervalle se resserre à chaque itération
+    autour de l'unique racine (simple) qu'il contient. Les voies terminées sont masquées.
+    Retourne un dictionnaire de tableaux : `solutions`, `lower`, `upper`, `iterations` et `converged`.
+    """
+    # Coefficients normalisés (degré décroissant) : pas de dépassement en virgule flottante
+    scale = max(abs(c) for c in square_free)
+    coefficients = np.array([float(Fraction(c, scale)) for c in reversed(square_free)])
+
+    lower = np.array([float(low) for low, _, _ in intervals], dtype=float)
+    upper = np.array([float(high) for _, high, _ in intervals], dtype=float)
+    sign_lower = np.array([
+        0.0 if low == high else _side_signs(square_free, low, high)[0] for low, high, _ in intervals
+    ], dtype=float)
+
+    x = (lower + upper) / 2
+    iterations = np.zeros(x.shape, dtype=int)
+    converged = lower == upper  # Racines rationnelles exactes
+    active = ~converged
+
+    for _ in range(max_iterations):
+        lanes = np.flatnonzero(active)
+        if lanes.size == 0:
+            break
+        current = x[lanes]
+        p, dp = horner(coefficients, current)
+        iterations[lanes] += 1
+
+        # Resserrement : la racine est du côté où le signe change
+        same = np.sign(p) == sign_lower[lanes]
+        exact = p == 0
+        low = np.where(same | exact, current, lower[lanes])
+        high = np.where(same & ~exact, upper[lanes], current)
+        lower[lanes], upper[lanes] = low, high
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = current - p / dp
+        inside = np.isfinite(step) & (step > low) & (step < high)
+        next_guess = np.where(inside, step, (low + high) / 2)
+
+        done = exact | (np.abs(next_guess - current) < tolerance) | (high - low < tolerance)
+        x[lanes] = np.where(exact, current, next_guess)
+        converged[lanes[done]] = True
+        active[lanes[done]] = False
+
+    # Vérification exacte de l'encadrement final : en virgule flottante, le signe de p peut être faux
+    # près d'une racine mal conditionnée ; la voie est alors reprise par bisection en rationnels
+    for lane, (low, high, _) in enumerate(intervals):
+        if low == high or _sign_at(square_free, Fraction(x[lane])) == 0:
+            continue
+        a, b = Fraction(lower[lane]), Fraction(upper[lane])
+        if low <= a < b <= high and _side_signs(square_free, a, b) == (sign_lower[lane], -sign_lower[lane]):
+            continue
+        a, b = low, high
+        while b - a > tolerance and iterations[lane] < max_iterations + EXACT_BISECTION_STEPS:
+            middle = (a + b) / 2
+            sign = _sign_at(square_free, middle)
+            iterations[lane] += 1
+            if sign == 0:
+                a = b = middle
+            elif sign == sign_lower[lane]:
+                a = middle
+            else:
+                b = middle
+        lower[lane], upper[lane], x[lane] = float(a), float(b), float((a + b) / 2)
+        converged[lane] = b - a <= tolerance
+
+    return {
+        "solutions": x,
+        "lower": lower,
+        "upper": upper,
+        "iterations": iterations,
+        "converged": converged,
+    }
@@ -0,0 +1,127 @@
+from fractions import Fraction
+
+import numpy as np
+
+from polynome_commun.factorization import square_free_terms
+from polynome_commun.newton_engine import horner
+
+# Au-delà, une racine multiple n'est plus séparable du bruit numérique des valeurs propres ; les
+# multiplicités exactes viennent de la décomposition sans facteur carré (voir all_roots)
+MAX_MULTIPLICITY = 8
+
+
+def polish_roots(coefficients, roots, iterations=3):
+    """
+    Affine les racines par quelques pas de Newton (en complexe).
+    Un pas n'est accepté que s'il diminue |p(z)|, ce qui protège les racines multiples où p' s'annule.
+    """
+    roots = np.asarray(roots, dtype=complex)
+    # Degré élevé : p(z) peut déborder loin du cercle unité, le pas est alors simplement refusé
+    with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        p, dp = horner(coefficients, roots)
+        for _ in range(iterations):
+            candidate = roots - p / dp
+            candidate_p, candidate_dp = horner(coefficients, candidate)
+            better = np.isfinite(candidate) & (np.abs(candidate_p) < np.abs(p))
+            if not better.any():
+                break
+            roots = np.where(better, candidate, roots)
+            p = np.where(better, candidate_p, p)
+            dp = np.where(better, candidate_dp, dp)
+    return roots
+
+
+def cluster_roots(roots, tolerance=1e-5):
+    """
+    Regroupe les racines numériquement confondues et retourne une liste de (racine, multiplicité).
+
+    Une racine de multiplicité m est séparée en m valeurs propres à une distance de l'ordre de eps^(1/m) :
+    pour chaque racine, on retient le plus grand groupe de ses m plus proches voisines dont l'écart au
+    centre reste sous ce rayon. La moyenne du groupe est bien plus précise que chacune des valeurs.
+    """
+    eps = np.finfo(float).eps
+    roots = np.asarray(roots, dtype=complex)
+    distances = np.abs(roots[:, None] - roots[None, :])
+    alive = np.ones(roots.size, dtype=bool)
+    clusters = []
+    for seed in range(roots.size):
+        if not alive[seed]:
+            continue
+        # Voisines encore disponibles, de la plus proche à la plus éloignée
+        candidates = np.flatnonzero(alive)
+        nearest = candidates[np.argsort(distances[seed, candidates])][:MAX_MULTIPLICITY]
+        best = 1
+        # Un groupe contenant la plus proche voisine a un écart d'au moins la moitié de leur distance
+        widest = max(tolerance, 2 * eps ** (1.0 / MAX_MULTIPLICITY)) * max(1.0, abs(roots[seed]) + distances[seed, nearest[-1]])
+        if nearest.size < 2 or distances[seed, nearest[1]] / 2 > widest:
+            alive[seed] = False
+            clusters.append((complex(roots[seed]), 1))
+            continue
+        for size in range(2, nearest.size + 1):
+            members = roots[nearest[:size]]
+            centre = members.mean()
+            radius = max(tolerance, 2 * eps ** (1.0 / size)) * max(1.0, abs(centre))
+            if np.max(np.abs(members - centre)) <= radius:
+                best = size
+        alive[nearest[:best]] = False
+        clusters.append((complex(roots[nearest[:best]].mean()), best))
+    return clusters
+
+
+def square_free_parts(coefficients):
+    """
+    Facteurs sans carré du polynôme (degré décroissant) avec leur multiplicité exacte : les flottants
+    sont lus comme des rationnels exacts et décomposés par Yun (polynome_commun.factorization). Au-delà
+    du budget de temps de cette décomposition, ou pour des coefficients non finis, le polynôme est
+    rendu tel quel (multiplicité 1, les racines multiples étant alors regroupées numériquement).
+    """
+    if not np.all(np.isfinite(coefficients)):
+        return [(coefficients, 1)]
+    terms = {degree: Fraction(float(c)) for degree, c in enumerate(coefficients[::-1]) if c}
+    parts = square_free_terms(terms)
+    if parts is None:
+        return [(coefficients, 1)]
+    scaled = []
+    for part, multiplicity in parts:
+        # Coefficients entiers ramenés à [-1, 1] (division entière correctement arrondie : pas de débordement)
+        largest = max(abs(c) for c in part)
+        scaled.append((np.array([c / largest for c in part]), multiplicity))
+    return scaled
+
+
+def all_roots(coefficients, cluster_tolerance=1e-5, real_tolerance=1e-9):
+    """
+    Toutes les racines complexes d'un polynôme à coefficients numériques (degré décroissant).
+
+    Chaque facteur sans carré (multiplicité exacte, voir square_free_parts) a pour racines les valeurs
+    propres de sa matrice compagnon (`np.roots`), affinées par Newton puis regroupées si elles restent
+    confondues. Retourne une liste de (racine, multiplicité) triée par partie réelle puis imaginaire ;
+    les racines dont la partie imaginaire est négligeable sont rendues réelles, les valeurs non finies
+    (débordement à très haut degré) sont écartées.
+    """
+    coefficients = np.trim_zeros(np.asarray(coefficients, dtype=float), "f")
+    if coefficients.size < 2:
+        return []
+
+    clusters = []
+    for part, part_multiplicity in square_free_parts(coefficients):
+        roots = polish_roots(part, np.roots(part))
+        for root, multiplicity in cluster_roots(roots[np.isfinite(roots)], cluster_tolerance):
+            if abs(root.imag) <= real_tolerance * max(1.0, abs(root)):
+                root = complex(root.real, 0.0)
+            clusters.append((root, multiplicity * part_multiplicity))
+    return sorted(clusters, key=lambda item: (item[0].real, item[0].imag))
+
+
+def format_root(root, decimals=2):
+    """
+    Écriture textuelle d'une racine arrondie, dans le style de SymPy pour les complexes (`a + b*I`).
+    """
+    real = round(root.real, decimals) + 0.0
+    imag = round(root.imag, decimals) + 0.0
+    if imag == 0:
+        return str(real)
+    sign = "-" if imag < 0 else "+"
+    if real == 0:
+        return f"{'-' if imag < 0 else ''}{abs(imag)}*I"
+    return f"{real} {sign} {abs(imag)}*I"
@@ -0,0 +1,82 @@
+import numpy as np
+
+from polynome_commun.expression_cache import parse_expression
+from polynome_commun.polynomial_parser import coefficient_array
+from polynome_commun.roots_engine import all_roots
+
+# Nombre maximal de passes de raffinement
+MAX_REFINEMENTS = 12
+
+
+def evaluator(equation, variable="x"):
+    """
+    Fonction vectorisée f(x) de l'équation et coefficients du polynôme (None s'il ne s'agit pas
+    d'un polynôme à coefficients numériques).
+    """
+    coefficients = coefficient_array(equation, variable)
+    if coefficients is not None:
+        return (lambda x: np.polyval(coefficients, x)), coefficients
+    f = parse_expression(equation, variable).f
+    return (lambda x: np.broadcast_to(np.asarray(f(x), dtype=float), np.shape(x))), None
+
+
+def adaptive_sample(f, x_min, x_max, budget=400, tolerance=1e-3):
+    """
+    Échantillonnage adaptatif à la courbure : on part d'une grille grossière puis, à chaque passe,
+    on insère le milieu des intervalles où la courbe s'écarte le plus de sa corde, jusqu'à épuiser
+    le budget de points ou passer sous la tolérance (relative à l'étendue des valeurs de y).
+    """
+    x = np.linspace(x_min, x_max, min(budget, max(16, budget // 8)))
+    y = f(x)
+
+    for _ in range(MAX_REFINEMENTS):
+        remaining = budget - x.size
+        if remaining <= 0:
+            break
+        middles = (x[:-1] + x[1:]) / 2
+        middle_values = f(middles)
+        finite = y[np.isfinite(y)]
+        scale = np.ptp(finite) if finite.size else 1.0
+        error = np.abs(middle_values - (y[:-1] + y[1:]) / 2) / (scale or 1.0)
+        error[~np.isfinite(error)] = np.inf  # Les discontinuités sont toujours raffinées
+
+        candidates = np.flatnonzero(error > tolerance)
+        if candidates.size == 0:
+            break
+        chosen = candidates[np.argsort(error[candidates])[::-1][:remaining]]
+
+        # Insertion des nouveaux points en conservant l'ordre croissant
+        x = np.concatenate([x, middles[chosen]])
+        y = np.concatenate([y, middle_values[chosen]])
+        order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+
+    return x, y
+
+
+def markers(coefficients, x_min, x_max):
+    """
+    Racines réelles et extrema locaux du polynôme dans l'intervalle [x_min, x_max].
+    """
+    def real_in_range(coeffs):
+        return [
+            root.real for root, _ in all_roots(coeffs)
+            if root.imag == 0 and x_min <= root.real <= x_max
+        ]
+
+    roots = [{"x": x} for x in real_in_range(coefficients)]
+
+    extrema = []
+    derivative = np.polyder(coefficients)
+    second = np.polyder(derivative)
+    critical_points = real_in_range(derivative) if derivative.size > 1 else []
+    for x in critical_points:
+        # Une dérivée seconde nulle signale un point d'inflexion, pas un extremum
+        curvature = np.polyval(second, x)
+        if abs(curvature) > 1e-12:
+            extrema.append({
+                "x": x,
+                "y": float(np.polyval(coefficients, x)),
+                "kind": "min" if curvature > 0 else "max"
+            })
+    return {"roots": roots, "extrema": extrema}
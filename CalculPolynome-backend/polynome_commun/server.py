@@ -0,0 +1,249 @@
+import json
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from polynome_commun.startup import MIGRATE_ON_START, STARTUP_MODE, startup
+
+# "dev" : serveur de développement Flask ; "prod" : workers pré-forkés à concurrence bornée
+SERVER_MODE = os.environ.get("POLYNOME_SERVER_MODE", "dev")
+# Nombre de processus workers
+WORKERS = int(os.environ.get("POLYNOME_SERVER_WORKERS", os.cpu_count() or 1))
+# Requêtes traitées simultanément par worker ; au-delà, réponse 503 + Retry-After
+MAX_IN_FLIGHT = int(os.environ.get("POLYNOME_MAX_IN_FLIGHT", 32))
+# Temps laissé aux requêtes en cours à l'arrêt, en secondes
+DRAIN_TIMEOUT = float(os.environ.get("POLYNOME_DRAIN_TIMEOUT", 30))
+# Durée de vie d'une connexion keep-alive inactive, en secondes
+KEEP_ALIVE = float(os.environ.get("POLYNOME_KEEP_ALIVE", 5))
+# File d'attente des connexions du socket d'écoute
+BACKLOG = int(os.environ.get("POLYNOME_SERVER_BACKLOG", 128))
+
+
+class InFlightLimiter:
+    """
+    Middleware WSGI qui borne le nombre de requêtes en cours dans le processus.
+    Une requête en excès est refusée immédiatement (503 + Retry-After) plutôt que mise en attente,
+    ce qui reporte la pression sur la passerelle et les clients.
+    """
+
+    def __init__(self, app, limit=MAX_IN_FLIGHT):
+        self.app = app
+        self.limit = limit
+        self.in_flight = 0
+        self.rejected = 0
+        self._condition = threading.Condition()
+
+    def __call__(self, environ, start_response):
+        with self._condition:
+            if self.in_flight >= self.limit:
+                self.rejected += 1
+                body = json.dumps({"success": False, "error": "Service saturé, réessayez plus tard."}).encode()
+                start_response("503 Service Unavailable", [
+                    ("Content-Type", "application/json"),
+                    ("Content-Length", str(len(body))),
+                    ("Retry-After", "1"),
+                ])
+                return [body]
+            self.in_flight += 1
+        try:
+            return _Tracked(self.app(environ, start_response), self._release)
+        except BaseException:
+            self._release()
+            raise
+
+    def _release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def wait_idle(self, timeout):
+        """Attend la fin des requêtes en cours ; retourne False si le délai est dépassé."""
+        expires = time.monotonic() + timeout
+        with self._condition:
+            while self.in_flight:
+                remaining = expires - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+
+class _Tracked:
+    # La requête reste « en cours » jusqu'à la fin de l'envoi de la réponse (réponses en flux comprises)
+    def __init__(self, iterable, release):
+        self.iterable = iterable
+        self.release = release
+
+    def __iter__(self):
+        return iter(self.iterable)
+
+    def close(self):
+        try:
+            if hasattr(self.iterable, "close"):
+                self.iterable.close()
+        finally:
+            self.release()
+
+
+class _RequestHandler(WSGIRequestHandler):
+    # Les connexions keep-alive inactives sont fermées : elles ne bloquent pas l'arrêt
+    timeout = KEEP_ALIVE
+
+
+def _listen(host, port):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(BACKLOG)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _serve_worker(app, sock, warmup, drain, max_in_flight, drain_timeout, on_ready=None):
+    """
+    Boucle d'un worker : préchauffage, service sur le socket partagé (puis `on_ready`), et à l'arrêt
+    (SIGTERM/SIGINT) fermeture de l'écoute, attente des requêtes en cours et vidage (file d'écriture, etc.).
+    """
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stopping.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stopping.set())
+
+    # Mode paresseux : pas de préchauffage, les modules lourds sont chargés par la première requête
+    started = time.perf_counter()
+    if warmup is not None and STARTUP_MODE != "lazy":
+        warmup()
+    startup.ready(time.perf_counter() - started)
+
+    limiter = InFlightLimiter(app, max_in_flight)
+    host, port = sock.getsockname()[:2]
+    server = make_server(host, port, limiter, threaded=True, request_handler=_RequestHandler, fd=sock.fileno())
+    thread = threading.Thread(target=server.serve_forever, name="wsgi-server", daemon=True)
+    thread.start()
+    if on_ready is not None:
+        on_ready()
+
+    while not stopping.wait(1):
+        pass
+
+    server.shutdown()
+    if not limiter.wait_idle(drain_timeout):
+        logging.warning(f"Worker {os.getpid()} : {limiter.in_flight} requête(s) interrompue(s) à l'arrêt.")
+    if drain is not None:
+        drain()
+    logging.info(f"Worker {os.getpid()} arrêté.")
+
+
+def serve(app, port, host="0.0.0.0", workers=WORKERS, warmup=None, drain=None,
+          max_in_flight=MAX_IN_FLIGHT, drain_timeout=DRAIN_TIMEOUT, on_ready=None):
+    """
+    Mode production : le socket est ouvert une fois puis partagé par `workers` processus pré-forkés.
+    Chaque worker exécute `warmup` avant d'accepter du trafic et `drain` après ses dernières requêtes.
+    `on_ready` (inscription Eureka) est appelé une fois, dans le processus principal, quand tous les
+    workers initiaux sont préchauffés et servent.
+    Un worker mort est remplacé ; SIGTERM/SIGINT arrêtent proprement tous les workers.
+    Sans `os.fork` (Windows), le service tourne dans un seul processus avec les mêmes garanties.
+    """
+    sock = _listen(host, port)
+    if workers <= 1 or not hasattr(os, "fork"):
+        _serve_worker(app, sock, warmup, drain, max_in_flight, drain_timeout, on_ready)
+        return
+
+    children = set()
+    stopping = threading.Event()
+    # Chaque worker écrit un octet dans ce tube une fois prêt
+    ready_read, ready_write = os.pipe()
+
+    def announce():
+        ready = 0
+        try:
+            # Les workers de remplacement écrivent aussi : le tube est lu jusqu'à sa fermeture
+            while True:
+                data = os.read(ready_read, workers)
+                if not data:
+                    break
+                previous, ready = ready, ready + len(data)
+                if previous < workers <= ready:
+                    logging.info(f"{workers} workers prêts.")
+                    if on_ready is not None and not stopping.is_set():
+                        on_ready()
+        finally:
+            os.close(ready_read)
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                os.close(ready_read)
+                _serve_worker(app, sock, warmup, drain, max_in_flight, drain_timeout,
+                              lambda: os.write(ready_write, b"."))
+            except BaseException:
+                logging.exception("Arrêt inattendu du worker.")
+                code = 1
+            finally:
+                os._exit(code)
+        children.add(pid)
+
+    def stop(signum, frame):
+        stopping.set()
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        spawn()
+    logging.info(f"Service en écoute sur {host}:{port} avec {workers} workers.")
+    threading.Thread(target=announce, name="workers-ready", daemon=True).start()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping.is_set():
+            logging.warning(f"Worker {pid} arrêté (statut {status}), remplacement.")
+            spawn()
+    sock.close()
+    os.close(ready_write)
+
+
+def warm_database(engine):
+    """
+    Préchauffage du pool de connexions dans un worker : les connexions héritées du processus parent
+    sont abandonnées (sans les fermer côté parent) puis une connexion neuve est ouverte.
+    """
+    engine.dispose(close=False)
+    with engine.connect():
+        pass
+
+
+def run(app, port, host="0.0.0.0", warmup=None, drain=None, migrate=None, on_ready=None):
+    """
+    Lance le service selon POLYNOME_SERVER_MODE : serveur de développement Flask ("dev", par défaut)
+    ou workers pré-forkés ("prod"). `migrate` (création des tables) n'est exécuté qu'avec
+    POLYNOME_MIGRATE_ON_START=1, une fois avant le lancement des workers.
+    `on_ready` (inscription Eureka) n'est appelé qu'une fois les workers préchauffés : aucun trafic
+    n'est dirigé vers l'instance avant.
+    """
+    if migrate is not None and MIGRATE_ON_START:
+        migrate()
+    if SERVER_MODE == "prod":
+        serve(app, port, host, warmup=warmup, drain=drain, on_ready=on_ready)
+    else:
+        startup.ready()
+        if on_ready is not None:
+            on_ready()
+        app.run(host=host, port=port)
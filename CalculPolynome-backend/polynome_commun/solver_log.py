@@ -0,0 +1,207 @@
+import atexit
+import glob
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+
+from polynome_commun.polynomial_parser import coefficient_array
+from polynome_commun.symbolic_pool import SymbolicTimeoutError
+
+# Dossier du journal des exécutions (POLYNOME_SOLVER_LOG=0 le désactive)
+DEFAULT_DIRECTORY = os.environ.get("POLYNOME_SOLVER_LOG_DIR", os.path.join(tempfile.gettempdir(), "polynome-solver-log"))
+ENABLED = os.environ.get("POLYNOME_SOLVER_LOG", "1") != "0"
+# Enregistrements en attente d'écriture ; au-delà, les nouveaux sont abandonnés (jamais d'attente)
+DEFAULT_MAX_SIZE = int(os.environ.get("POLYNOME_SOLVER_LOG_QUEUE_SIZE", 10000))
+# Taille d'un fichier de journal avant rotation (un seul fichier précédent conservé)
+DEFAULT_MAX_BYTES = int(os.environ.get("POLYNOME_SOLVER_LOG_MAX_BYTES", 64 * 1024 * 1024))
+
+# Méthodes journalisées : celles des recommandations, puis les variantes de Newton (multi-départs,
+# isolation des racines réelles), enregistrées à part pour ne pas fausser le coût d'un départ unique
+METHODS = ("Quadratique", "Newton", "Racines", "Factorisation", "NewtonMultiStart", "NewtonIsolation")
+
+_STOP = object()
+
+
+class _Run:
+    """Mesure d'une exécution (voir SolverLog.timed) : l'issue est complétée par le solveur."""
+
+    def __init__(self, log, method, equation, variable, coefficients):
+        self.log = log
+        self.method = method
+        self.equation = equation
+        self.variable = variable
+        self.coefficients = coefficients
+        self.outcome = {}
+        self.skipped = False
+
+    def update(self, **outcome):
+        # converged, iterations...
+        self.outcome.update(outcome)
+
+    def skip(self):
+        """Rien à mesurer (résultat relu depuis un cache) : aucun enregistrement."""
+        self.skipped = True
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        seconds = time.perf_counter() - self._start
+        if not self.skipped:
+            if exc is not None:
+                self.outcome.setdefault("converged", False)
+                self.outcome["timed_out"] = isinstance(exc, SymbolicTimeoutError)
+            self.log.record(self.method, seconds, exc is None, equation=self.equation, variable=self.variable,
+                            coefficients=self.coefficients, **self.outcome)
+        return False
+
+
+class SolverLog:
+    """
+    Journal des exécutions de solveurs : une ligne NDJSON par résolution (méthode, coefficients,
+    durée, réussite, convergence, itérations, délai dépassé), relu pour entraîner le modèle de coût
+    de la recommandation (service-recommendation-py/train_cost_model.py).
+
+    `record` ne fait que déposer l'enregistrement dans une file ; un thread d'arrière-plan analyse
+    l'équation et écrit dans un fichier propre au processus. Les expressions non polynomiales sont ignorées.
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, enabled=ENABLED, max_size=DEFAULT_MAX_SIZE,
+                 max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.enabled = enabled
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+
+        # Métriques
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+
+    def _start(self):
+        # Démarrage paresseux, et à nouveau dans un worker issu d'un fork (le thread n'y survit pas)
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            self._queue = queue.Queue(maxsize=self.max_size)
+            self._thread = threading.Thread(target=self._run, name="solver-log", daemon=True)
+            self._thread.start()
+            if self._pid is None:
+                atexit.register(self.close)
+            self._pid = os.getpid()
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, f"solver-{os.getpid()}.ndjson")
+
+    def timed(self, method, equation=None, variable="x", coefficients=None):
+        """Gestionnaire de contexte : mesure l'exécution du solveur et l'enregistre à la sortie."""
+        return _Run(self, method, equation, variable, coefficients)
+
+    def record(self, method, seconds, success, equation=None, variable="x", coefficients=None,
+               converged=None, iterations=None, timed_out=False):
+        """Dépose un enregistrement ; `coefficients` (degré décroissant) ou `equation` décrit le polynôme."""
+        if not self.enabled:
+            return
+        if self._pid != os.getpid():
+            self._start()
+        try:
+            self._queue.put_nowait({
+                "method": method,
+                "equation": equation,
+                "variable": variable,
+                "coefficients": None if coefficients is None else [float(c) for c in coefficients],
+                "seconds": seconds,
+                "success": bool(success),
+                "converged": converged,
+                "iterations": iterations,
+                "timed_out": bool(timed_out),
+                "time": time.time(),
+            })
+            self.recorded += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._write(batch)
+                    return
+                batch.append(item)
+            self._write(batch)
+
+    def _write(self, batch):
+        lines = []
+        for record in batch:
+            equation = record.pop("equation")
+            variable = record.pop("variable")
+            if record["coefficients"] is None:
+                try:
+                    # Sans repli SymPy : seuls les polynômes de la grammaire sont journalisés
+                    record["coefficients"] = coefficient_array(equation, variable, fallback=False).tolist()
+                except Exception:
+                    continue
+            lines.append(json.dumps(record) + "\n")
+        if not lines:
+            return
+        try:
+            path = self.path
+            if os.path.exists(path) and os.path.getsize(path) >= self.max_bytes:
+                os.replace(path, path + ".1")
+            with open(path, "a", encoding="utf-8") as output:
+                output.writelines(lines)
+            self.written += len(lines)
+        except OSError as e:
+            self.dropped += len(lines)
+            logging.error(f"Journal des solveurs : écriture impossible ({e}).")
+
+    def stats(self):
+        return {
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+    def close(self, timeout=5.0):
+        """Écrit les enregistrements en attente puis arrête le thread."""
+        if self._pid != os.getpid() or self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+
+def read_records(directories):
+    """Enregistrements de tous les fichiers de journal (rotations comprises) des dossiers donnés."""
+    for directory in directories:
+        for path in sorted(glob.glob(os.path.join(directory, "solver-*.ndjson*"))):
+            with open(path, encoding="utf-8") as source:
+                for line in source:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue  # Ligne tronquée (arrêt pendant une écriture)
+
+
+# Journal partagé par les routes d'un même processus
+solver_log = SolverLog()
@@ -0,0 +1,118 @@
+import importlib
+import logging
+import os
+import sys
+import threading
+import time
+
+# "eager" : préchauffage complet (modules lourds, connexions) avant d'accepter du trafic ;
+# "lazy" : worker prêt immédiatement, modules lourds chargés à leur premier usage
+STARTUP_MODE = os.environ.get("POLYNOME_STARTUP_MODE", "eager")
+# Création des tables au lancement du service ; sinon étape séparée (python models.py)
+MIGRATE_ON_START = os.environ.get("POLYNOME_MIGRATE_ON_START", "0") == "1"
+
+# Modules lourds dont le chargement est signalé dans les temps de démarrage
+HEAVY_MODULES = ("sympy", "matplotlib", "xgboost", "sklearn", "joblib")
+
+
+def _process_start():
+    # Instant de lancement du processus (Linux : âge lu dans /proc, au centième de seconde), sinon
+    # premier import de ce module
+    try:
+        with open("/proc/self/stat") as stat:
+            ticks = int(stat.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as uptime:
+            age = float(uptime.read().split()[0]) - ticks / os.sysconf("SC_CLK_TCK")
+        return time.time() - max(age, 0.0)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.time()
+
+
+PROCESS_START = _process_start()
+
+
+class LazyModule:
+    """Module importé au premier accès à l'un de ses attributs : son coût n'est pas payé à l'import du service."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def __getattr__(self, attribute):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+class StartupTimer:
+    """
+    Temps de démarrage du processus : fin de l'import du service (`imported`) puis fin du
+    préchauffage du worker (`ready`), en secondes depuis le lancement du processus.
+    """
+
+    def __init__(self, process_start=PROCESS_START):
+        self.process_start = process_start
+        self.service = None
+        self.import_seconds = None
+        self.ready_seconds = None
+        self.warmup_seconds = None
+
+    def imported(self, service):
+        self.service = service
+        self.import_seconds = time.time() - self.process_start
+        logging.info(f"Service {service} importé en {self.import_seconds:.2f} s.")
+
+    def ready(self, warmup_seconds=None):
+        self.ready_seconds = time.time() - self.process_start
+        self.warmup_seconds = warmup_seconds
+        detail = f" (préchauffage : {warmup_seconds:.2f} s)" if warmup_seconds is not None else ""
+        logging.info(f"Worker {os.getpid()} prêt {self.ready_seconds:.2f} s après le lancement{detail}.")
+
+    def stats(self):
+        return {
+            "service": self.service,
+            "mode": STARTUP_MODE,
+            "pid": os.getpid(),
+            "import_seconds": self.import_seconds,
+            "ready_seconds": self.ready_seconds,
+            "warmup_seconds": self.warmup_seconds,
+            # Modules lourds déjà chargés dans ce processus
+            "heavy_modules": [name for name in HEAVY_MODULES if name in sys.modules],
+        }
+
+    def samples(self):
+        return [
+            ("polynome_startup_seconds", "gauge", "Temps de démarrage depuis le lancement du processus.",
+             {"phase": phase}, value)
+            for phase, value in (("import", self.import_seconds), ("ready", self.ready_seconds))
+        ]
+
+
+# Temps de démarrage du processus courant
+startup = StartupTimer()
+
+
+def install(app, service, prefix, registry=None):
+    """
+    Marque la fin de l'import du service (à appeler en fin de module app.py) et publie ses temps de
+    démarrage sur GET <prefix>/startup et dans /metrics.
+    """
+    from flask import jsonify
+
+    from polynome_commun.metrics import metrics
+
+    (registry or metrics).register_collector(startup.samples)
+
+    @app.route(f"{prefix}/startup", methods=["GET"])
+    def startup_times():
+        return jsonify(startup.stats()), 200
+
+    startup.imported(service)
+    return startup
@@ -0,0 +1,325 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import pickle
+import queue
+import sys
+import threading
+import time
+from collections import Counter
+
+from polynome_commun.profiler import remote_sampling
+
+# Nombre de processus SymPy (0 : calcul dans le thread de la requête, sans délai imposé)
+DEFAULT_WORKERS = int(os.environ.get("POLYNOME_SYMBOLIC_WORKERS", 2))
+# Nombre maximal de requêtes en attente d'un processus libre
+DEFAULT_MAX_QUEUE = int(os.environ.get("POLYNOME_SYMBOLIC_QUEUE", 16))
+# Délai maximal d'un calcul symbolique, attente comprise, en secondes
+DEFAULT_DEADLINE = float(os.environ.get("POLYNOME_SYMBOLIC_DEADLINE", 10))
+
+# Opérations symboliques exécutables dans le pool
+OPERATIONS = ("factor", "solve", "simplify")
+# Intervalle d'envoi des piles échantillonnées dans un processus du pool (conservées même si le délai expire)
+SAMPLE_FLUSH_INTERVAL = 0.2
+
+
+class SymbolicJobError(Exception):
+    """Calcul symbolique refusé ou interrompu ; `to_dict` donne la réponse JSON structurée."""
+
+    status = 503
+
+    def __init__(self, message, operation, deadline):
+        super().__init__(message)
+        self.operation = operation
+        self.deadline = deadline
+
+    def to_dict(self):
+        return {
+            "success": False,
+            "error": str(self),
+            "timeout": isinstance(self, SymbolicTimeoutError),
+            "operation": self.operation,
+            "deadline": self.deadline
+        }
+
+
+class SymbolicTimeoutError(SymbolicJobError):
+    """Le calcul a dépassé son délai : le processus qui l'exécutait a été tué puis remplacé."""
+
+    status = 504
+
+
+class SymbolicPoolFullError(SymbolicJobError):
+    """Trop de requêtes attendent déjà un processus libre."""
+
+
+def execute(operation, equation, variable):
+    """Exécute une opération symbolique sur l'équation analysée (dans un processus du pool ou en direct)."""
+    import sympy as sp
+    from polynome_commun.expression_cache import parse_expression
+
+    parsed = parse_expression(equation, variable)
+    if operation == "factor":
+        return parsed.factored
+    if operation == "simplify":
+        return parsed.simplified
+    if operation == "solve":
+        return sp.solve(parsed.simplified, parsed.symbol)
+    raise ValueError(f"Opération symbolique inconnue : {operation}.")
+
+
+class _StackSampler:
+    """
+    Échantillonnage, dans un processus du pool, de la pile du calcul en cours (requête lente profilée) :
+    après `delay` secondes, une pile repliée toutes les `interval` secondes, envoyée par lots au
+    processus du service ; le reste est retourné par `stop`.
+    """
+
+    def __init__(self, send, delay, interval):
+        self.send = send
+        self.delay = delay
+        self.interval = interval
+        self.stacks = Counter()
+        self._ident = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="symbolic-sampler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        from polynome_commun.profiler import collapse
+
+        if self._stop.wait(self.delay):
+            return
+        flushed = time.monotonic()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._ident)
+            if frame is not None:
+                self.stacks[collapse(frame, execute.__code__)] += 1
+            del frame
+            if time.monotonic() - flushed >= SAMPLE_FLUSH_INTERVAL and self.stacks:
+                self.send(("stacks", dict(self.stacks)))
+                self.stacks.clear()
+                flushed = time.monotonic()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return dict(self.stacks)
+
+
+def _worker_main(connection):
+    # Préchargement de SymPy avant de se déclarer prêt
+    import sympy  # noqa: F401
+    import polynome_commun.expression_cache  # noqa: F401
+    connection.send("ready")
+
+    # Le fil d'échantillonnage envoie aussi des messages : envois sérialisés
+    lock = threading.Lock()
+
+    def send(message):
+        with lock:
+            connection.send(message)
+
+    while True:
+        try:
+            job = connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if job is None:
+            return
+        operation, equation, variable, sampling = job
+        sampler = _StackSampler(send, *sampling) if sampling is not None else None
+        try:
+            ok, result = True, execute(operation, equation, variable)
+        except Exception as e:
+            # L'exception est renvoyée telle quelle si elle est sérialisable (ex. SympifyError)
+            try:
+                pickle.dumps(e)
+            except Exception:
+                e = ValueError(str(e))
+            ok, result = False, e
+        stacks = sampler.stop() if sampler is not None else None
+        send(("result", ok, result, stacks))
+
+
+class _Worker:
+    def __init__(self, context):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def wait_ready(self):
+        return self.connection.recv() == "ready"
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class SymbolicPool:
+    """
+    Pool de processus pour les calculs SymPy coûteux (factor, solve, simplify).
+
+    Chaque calcul a un délai (attente d'un processus libre comprise) ; au-delà, le processus est tué
+    et remplacé en arrière-plan, et l'appelant reçoit une `SymbolicTimeoutError`. Le nombre de
+    requêtes en attente est borné (`SymbolicPoolFullError`). Les processus préchargent SymPy.
+    Pour une requête profilée (polynome_commun.profiler), le processus échantillonne sa propre pile
+    et la renvoie avec le résultat, ou par lots jusqu'à l'expiration du délai.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_queue=DEFAULT_MAX_QUEUE, deadline=DEFAULT_DEADLINE):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.deadline = deadline
+        self._context = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        self.waiting = 0
+        self.completed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.respawns = 0
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        for _ in range(self.workers):
+            self._spawn()
+        atexit.register(self.close)
+
+    def _spawn(self):
+        # Le démarrage (import de SymPy) se fait hors du chemin de la requête
+        def spawn():
+            worker = _Worker(self._context)
+            try:
+                ready = worker.wait_ready()
+            except EOFError:
+                ready = False
+            if ready and not self._closed:
+                self._idle.put(worker)
+            else:
+                worker.kill()
+        threading.Thread(target=spawn, daemon=True).start()
+
+    def _replace(self, worker):
+        worker.kill()
+        with self._lock:
+            self.respawns += 1
+        if not self._closed:
+            self._spawn()
+
+    def run(self, operation, equation, variable="x", deadline=None):
+        """Exécute l'opération et retourne l'objet SymPy résultat, dans le délai imparti."""
+        if operation not in OPERATIONS:
+            raise ValueError(f"Opération symbolique inconnue : {operation}.")
+        if self.workers <= 0:
+            return execute(operation, equation, variable)
+
+        self.start()
+        deadline = self.deadline if deadline is None else deadline
+        expires = time.monotonic() + deadline
+
+        with self._lock:
+            if self.waiting >= self.max_queue + self.workers:
+                self.rejected += 1
+                raise SymbolicPoolFullError(
+                    "Trop de calculs symboliques en attente, réessayez plus tard.", operation, deadline
+                )
+            self.waiting += 1
+        try:
+            try:
+                worker = self._idle.get(timeout=max(expires - time.monotonic(), 0))
+            except queue.Empty:
+                with self._lock:
+                    self.timeouts += 1
+                raise SymbolicTimeoutError(
+                    f"Aucun processus disponible avant l'expiration du délai ({deadline} s).", operation, deadline
+                )
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+        # Requête lente profilée : la pile est échantillonnée dans le processus qui calcule
+        sampling = remote_sampling()
+        try:
+            worker.connection.send((operation, equation, variable, sampling.settings if sampling else None))
+            while True:
+                if not worker.connection.poll(max(expires - time.monotonic(), 0)):
+                    self._replace(worker)
+                    with self._lock:
+                        self.timeouts += 1
+                    logging.warning(f"Calcul symbolique '{operation}' interrompu après {deadline} s : {equation}")
+                    raise SymbolicTimeoutError(
+                        f"Le calcul symbolique a dépassé le délai de {deadline} s.", operation, deadline
+                    )
+                message = worker.connection.recv()
+                if message[0] == "stacks":
+                    if sampling is not None:
+                        sampling.add(message[1])
+                    continue
+                _, ok, result, stacks = message
+                if sampling is not None and stacks:
+                    sampling.add(stacks)
+                break
+        except (EOFError, OSError, BrokenPipeError):
+            # Processus mort pendant le calcul (mémoire, signal) : remplacé, la requête échoue
+            self._replace(worker)
+            with self._lock:
+                self.failed += 1
+            raise ValueError("Le processus de calcul symbolique s'est arrêté de manière inattendue.")
+        finally:
+            if sampling is not None:
+                sampling.close()
+
+        self._idle.put(worker)
+        with self._lock:
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+        if not ok:
+            raise result
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "idle": self._idle.qsize(),
+                "in_flight": max(self.workers - self._idle.qsize(), 0) if self._started else 0,
+                "waiting": self.waiting,
+                "max_queue": self.max_queue,
+                "deadline": self.deadline,
+                "completed": self.completed,
+                "failed": self.failed,
+                "timeouts": self.timeouts,
+                "rejected": self.rejected,
+                "respawns": self.respawns,
+            }
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                worker.connection.send(None)
+            except OSError:
+                pass
+            worker.process.join(timeout=1)
+            if worker.process.is_alive():
+                worker.kill()
+
+
+# Pool partagé par les solveurs d'un même processus
+symbolic_pool = SymbolicPool()
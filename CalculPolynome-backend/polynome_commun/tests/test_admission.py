@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+
+from polynome_commun.admission import AdmissionController, AdmissionRejected, UNPARSED_COST, estimate_cost
+
+
+# Cas de test 1 : Le coût estimé croît avec le degré et dépend de l'opération
+def test_estimate_cost_ordering():
+    assert estimate_cost("x^2 - 4", "x", "factor") < estimate_cost("x^40 - 4", "x", "factor")
+    assert estimate_cost("x^40 - 4", "x", "roots") < estimate_cost("x^40 - 4", "x", "roots_exact")
+    assert estimate_cost("x^2 - 4", "x", "factor") < estimate_cost("123456789123456789*x^2 - 4", "x", "factor")
+    assert estimate_cost("sin(x)", "x", "newton") == UNPARSED_COST
+
+
+# Cas de test 2 : Routage vers les voies et mesure du coût réel
+def test_admission_lanes_and_history():
+    controller = AdmissionController(fast_threshold=50)
+
+    with controller.admit("x^2 - 4", "x", "factor") as ticket:
+        assert ticket.lane.name == "fast"
+    with controller.admit("(x + 1)^40 - 4", "x", "factor") as ticket:
+        assert ticket.lane.name == "slow"
+
+    stats = controller.stats()
+    assert stats["lanes"]["fast"]["admitted"] == 1
+    assert stats["lanes"]["slow"]["admitted"] == 1
+    assert [entry["lane"] for entry in stats["recent"]] == ["fast", "slow"]
+    assert stats["cost_ratio"] is not None
+
+
+# Cas de test 3 : Voie lente saturée : rejet avec délai de nouvelle tentative, la voie rapide reste libre
+def test_admission_slow_lane_rejects():
+    controller = AdmissionController(fast_threshold=50, slow_concurrency=1, slow_queue=0)
+    started, release = threading.Event(), threading.Event()
+
+    def occupy():
+        with controller.admit("(x + 1)^40 - 4", "x", "factor"):
+            started.set()
+            release.wait(5)
+
+    worker = threading.Thread(target=occupy)
+    worker.start()
+    started.wait(5)
+    try:
+        with pytest.raises(AdmissionRejected) as exc_info:
+            with controller.admit("(x + 2)^40", "x", "factor"):
+                pass
+        assert exc_info.value.retry_after >= 1
+        with controller.admit("x^2 - 4", "x", "factor") as ticket:
+            assert ticket.lane.name == "fast"
+    finally:
+        release.set()
+        worker.join()
+    assert controller.stats()["lanes"]["slow"]["rejected"] == 1
+
+
+# Cas de test 4 : Un calcul de fond patiente quand la voie lente est saturée, au lieu d'être rejeté
+def test_run_patiently_waits_for_slow_lane():
+    controller = AdmissionController(fast_threshold=50, slow_concurrency=1, slow_queue=0)
+    started = threading.Event()
+
+    def occupy():
+        with controller.admit("(x + 1)^40 - 4", "x", "factor"):
+            started.set()
+            time.sleep(0.3)
+
+    worker = threading.Thread(target=occupy)
+    worker.start()
+    started.wait(5)
+    try:
+        assert controller.run_patiently("(x + 2)^40", "x", "factor", lambda: "calculé") == "calculé"
+    finally:
+        worker.join()
+    slow = controller.stats()["lanes"]["slow"]
+    assert slow["rejected"] >= 1 and slow["admitted"] == 2 and slow["in_flight"] == 0
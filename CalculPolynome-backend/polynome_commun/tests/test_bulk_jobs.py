@@ -0,0 +1,88 @@
+import io
+import json
+import threading
+import time
+
+from flask import Flask
+
+from polynome_commun.bulk_jobs import JobManager, install
+
+
+def double(item):
+    if item.get("equation") == "invalide":
+        raise ValueError("Équation invalide.")
+    return {"value": 2 * int(item["equation"])}
+
+
+def wait_done(manager, job_id, timeout=10):
+    expires = time.monotonic() + timeout
+    while manager.status(job_id)["status"] == "running" and time.monotonic() < expires:
+        time.sleep(0.01)
+    return manager.status(job_id)
+
+
+# Cas de test 1 : Entrée NDJSON traitée en parallèle, avec erreurs par élément et positions d'origine
+def test_ndjson_job(tmp_path):
+    manager = JobManager("test", double, directory=str(tmp_path), workers=4, max_in_flight=8)
+    lines = [json.dumps({"equation": str(i)}) for i in range(100)] + ["pas du json", '"invalide"']
+    job_id = manager.submit(io.BytesIO("\n".join(lines).encode()))["job_id"]
+
+    status = wait_done(manager, job_id)
+    assert (status["status"], status["submitted"], status["completed"], status["failed"]) == ("completed", 102, 102, 2)
+
+    results = [json.loads(line) for line in manager.results(job_id)]
+    by_offset = {line["offset"]: line for line in results}
+    assert sorted(by_offset) == list(range(102))
+    assert all(by_offset[i]["result"] == {"value": 2 * i} for i in range(100))
+    assert "error" in by_offset[100] and by_offset[101]["error"] == "Équation invalide."
+
+
+# Cas de test 2 : Entrée CSV avec en-tête, tranches préchargées avant leur soumission
+def test_csv_job_with_prefetch(tmp_path):
+    chunks = []
+    manager = JobManager("test", double, prefetch=chunks.append, directory=str(tmp_path))
+    job_id = manager.submit(io.BytesIO(b"equation,variable\n1,x\n2,x\n3,x\n"), "csv")["job_id"]
+
+    assert wait_done(manager, job_id)["status"] == "completed"
+    assert chunks == [[{"equation": "1", "variable": "x"}, {"equation": "2", "variable": "x"},
+                       {"equation": "3", "variable": "x"}]]
+    assert sorted(json.loads(line)["result"]["value"] for line in manager.results(job_id)) == [2, 4, 6]
+
+
+# Cas de test 3 : Le flux de résultats suit le travail en cours et reprend à une position donnée
+def test_results_stream_follows_and_resumes(tmp_path):
+    release = threading.Event()
+
+    def blocking(item):
+        if item["equation"] == "5":
+            release.wait(5)
+        return item["equation"]
+
+    manager = JobManager("test", blocking, directory=str(tmp_path), workers=1, max_in_flight=1)
+    app = Flask(__name__)
+    install(app, "/demo", manager)
+    client = app.test_client()
+
+    body = "\n".join(json.dumps(str(i)) for i in range(10))
+    response = client.post("/demo/jobs", data=body, content_type="application/x-ndjson")
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+
+    threading.Timer(0.3, release.set).start()
+    streamed = client.get(f"/demo/jobs/{job_id}/results").get_data(as_text=True).splitlines()
+    assert [json.loads(line)["result"] for line in streamed] == [str(i) for i in range(10)]
+
+    resumed = client.get(f"/demo/jobs/{job_id}/results?offset=7").get_data(as_text=True).splitlines()
+    assert resumed == streamed[7:]
+    assert client.get(f"/demo/jobs/{job_id}").get_json()["completed"] == 10
+
+
+# Cas de test 4 : Entrée vide ou travail inconnu
+def test_invalid_requests(tmp_path):
+    app = Flask(__name__)
+    install(app, "/demo", JobManager("test", double, directory=str(tmp_path)))
+    client = app.test_client()
+
+    assert client.post("/demo/jobs", data=b"", content_type="application/x-ndjson").status_code == 400
+    assert client.get("/demo/jobs/" + "0" * 32).status_code == 404
+    assert client.get("/demo/jobs/../../etc/results").status_code == 404
@@ -0,0 +1,54 @@
+import requests
+
+from polynome_commun.eureka import EurekaClient, EurekaStub
+
+
+# Cas de test 1 : Inscription, renouvellement et désinscription auprès du registre local
+def test_eureka_client_lifecycle():
+    stub = EurekaStub()
+    url = stub.start()
+    try:
+        client = EurekaClient("roots-service", 5002, server=url)
+        client.register()
+        assert [instance["instanceId"] for instance in stub.applications()["ROOTS-SERVICE"]] == ["roots-service:5002"]
+
+        client.renew()
+        assert client.health()["renewals"] == 1
+        assert client.health()["healthy"] is True
+        assert requests.get(url + "ROOTS-SERVICE").status_code == 200
+
+        client.stop()
+        assert stub.applications() == {}
+        assert client.health()["registered"] is False
+    finally:
+        stub.stop()
+
+
+# Cas de test 2 : Un bail inconnu du registre (redémarrage, expiration) déclenche une nouvelle inscription
+def test_eureka_client_reregisters_on_404():
+    stub = EurekaStub()
+    url = stub.start()
+    try:
+        client = EurekaClient("graph-service", 5004, server=url)
+        client.register()
+        stub.instances.clear()
+
+        client.renew()
+        assert client.health()["registrations"] == 2
+        assert "GRAPH-SERVICE" in stub.applications()
+        client.stop()
+    finally:
+        stub.stop()
+
+
+# Cas de test 3 : Registre injoignable : échecs comptés et reprise exponentielle
+def test_eureka_client_backoff():
+    client = EurekaClient("newton-service", 5001, server="http://127.0.0.1:9/eureka/apps/", renewal_interval=30)
+    client.start()
+    client._stop.wait(0.5)
+    client.stop()
+
+    health = client.health()
+    assert health["failures"] >= 1
+    assert health["healthy"] is False
+    assert client._next_delay() <= 60
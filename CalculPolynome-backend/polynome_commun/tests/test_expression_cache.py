@@ -0,0 +1,59 @@
+import pytest
+from sympy import SympifyError
+from polynome_commun.expression_cache import ExpressionCache, canonicalize
+
+# Cas de test 1 : Les écritures équivalentes partagent la même clé
+def test_canonicalize_equivalent_forms():
+    assert canonicalize("x^2 - 4") == canonicalize("x**2-4")
+    assert canonicalize("x^2 - 4", "x") != canonicalize("x^2 - 4", "y")
+
+# Cas de test 2 : Une équation n'est analysée qu'une seule fois
+def test_cache_hit_returns_same_entry():
+    cache = ExpressionCache(maxsize=4)
+
+    first = cache.get("x^2 - 4")
+    second = cache.get("x**2 - 4")
+
+    assert first is second
+    assert str(first.factored) == "(x - 2)*(x + 2)"
+    assert first.poly.degree() == 2
+    assert first.f_prime(3.0) == 6.0
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+# Cas de test 3 : Éviction de l'entrée la moins récemment utilisée
+def test_cache_eviction_lru():
+    cache = ExpressionCache(maxsize=2)
+
+    a = cache.get("x + 1")
+    cache.get("x + 2")
+    cache.get("x + 1")  # "x + 1" redevient la plus récente
+    cache.get("x + 3")  # évince "x + 2"
+
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
+    assert cache.get("x + 1") is a
+    assert cache.stats()["misses"] == 3
+
+# Cas de test 4 : Une équation invalide n'est pas mise en cache
+def test_cache_invalid_equation_not_stored():
+    cache = ExpressionCache(maxsize=2)
+
+    with pytest.raises(SympifyError):
+        cache.get("x +* 2")
+
+    assert cache.stats()["size"] == 0
+
+# Cas de test 5 : Aucun code Python n'est évalué, seuls la variable et les fonctions usuelles sont admises
+@pytest.mark.parametrize("equation", [
+    '__import__("os").getcwd()',
+    "x.func",
+    "x.n()",
+    "open",
+    "exec",
+])
+def test_unsafe_equation_rejected(equation):
+    with pytest.raises(SympifyError):
+        ExpressionCache().get(equation)
+
+    assert str(ExpressionCache().get("sin(x) + ln(x) * 1e5 + a").expr) == "a + 100000.0*log(x) + sin(x)"
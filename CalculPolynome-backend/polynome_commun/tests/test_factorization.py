@@ -0,0 +1,69 @@
+import random
+import time
+
+from polynome_commun.factorization import factor_terms, fast_factorization
+from polynome_commun.polynomial_parser import parse_terms
+
+
+def expand(content, factors):
+    # Produit des facteurs (coefficients par degré décroissant) multiplié par le contenu
+    product = [content]
+    for coefficients, multiplicity in factors:
+        for _ in range(multiplicity):
+            result = [0] * (len(product) + len(coefficients) - 1)
+            for i, a in enumerate(product):
+                for j, b in enumerate(coefficients):
+                    result[i + j] += a * b
+            product = result
+    return product
+
+
+# Cas de test 1 : Facteurs linéaires entiers et rationnels, au format de SymPy
+def test_rational_roots():
+    assert fast_factorization("x^2 - 4")["factorized_result"] == "(x - 2)*(x + 2)"
+    assert fast_factorization("6x^2 + 5x + 1")["factorized_result"] == "(2*x + 1)*(3*x + 1)"
+    assert fast_factorization("x^2/2 - 1/2")["factorized_result"] == "(x - 1)*(x + 1)/2"
+    assert fast_factorization("-x^3 + x")["factorized_result"] == "-x*(x - 1)*(x + 1)"
+
+
+# Cas de test 2 : Multiplicités issues de la décomposition sans facteur carré
+def test_multiplicities():
+    result = fast_factorization("x^5 - x^4 - 2x^3 + 2x^2 + x - 1")
+    assert result["factorized_result"] == "(x - 1)^3*(x + 1)^2"
+    assert [(f["factor"], f["multiplicity"]) for f in result["factors"]] == [("x - 1", 3), ("x + 1", 2)]
+
+
+# Cas de test 3 : Facteurs irréductibles de degré supérieur (Zassenhaus et relèvement de Hensel)
+def test_modular_factorization():
+    result = fast_factorization("x^12 - 1")
+    assert result["factorized_result"] == \
+        "(x - 1)*(x + 1)*(x^2 + 1)*(x^2 - x + 1)*(x^2 + x + 1)*(x^4 - x^2 + 1)"
+
+    equation = "x^6 + 7x^4 + 2x^3 + 10x^2 + 7x + 1"  # (x^3 + 2x + 1)(x^3 + 5x + 1)
+    content, factors = factor_terms(parse_terms(equation, "x"))
+    assert [coefficients for coefficients, _ in factors] == [[1, 0, 2, 1], [1, 0, 5, 1]]
+    assert expand(content, factors) == [1, 0, 7, 2, 10, 7, 1]
+
+    irreducible = fast_factorization("x^4 - 10x^2 + 1")
+    assert irreducible["irreducible"] is True
+    assert irreducible["factorized_result"] == "x^4 - 10*x^2 + 1"
+
+
+# Cas de test 4 : Les entrées hors chemin rapide sont laissées à SymPy
+def test_fallback_inputs():
+    assert fast_factorization("x^2 + 1.5") is None
+    assert fast_factorization("x^2 - y^2") is None
+    assert fast_factorization("7") is None
+
+
+# Cas de test 5 : Au-delà du temps imparti, le chemin rapide s'interrompt et laisse la main à SymPy
+def test_time_budget():
+    rng = random.Random(1)
+    equation = " + ".join(f"{rng.randrange(10 ** 29, 10 ** 30)}*x^{k}" for k in range(64, -1, -1))
+    terms = parse_terms(equation, "x")
+
+    start = time.perf_counter()
+    assert factor_terms(terms, budget=0.01) is None
+    assert time.perf_counter() - start < 0.1
+    # Sans limite, le même polynôme est factorisé (irréductible)
+    assert len(factor_terms(terms, budget=None)[1]) == 1
@@ -0,0 +1,78 @@
+from flask import Flask
+
+from polynome_commun.expression_cache import ExpressionCache
+from polynome_commun.metrics import Histogram, MetricsRegistry, install
+
+
+class _Queue:
+    def stats(self):
+        return {"depth": 3, "max_size": 10}
+
+
+# Cas de test 1 : Les seaux de l'histogramme sont cumulatifs et se terminent par +Inf
+def test_histogram_cumulative_buckets():
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value)
+
+    cumulative, total, count = histogram.snapshot()
+    assert cumulative == [(0.1, 1), (1.0, 3), (float("inf"), 4)]
+    assert total == 6.05
+    assert count == 4
+
+
+# Cas de test 2 : Une étape est mesurée même si elle lève une exception
+def test_stage_records_duration_on_error():
+    registry = MetricsRegistry()
+    registry.service = "test"
+    try:
+        with registry.stage("solve"):
+            raise ValueError("échec")
+    except ValueError:
+        pass
+
+    text = registry.render()
+    assert 'polynome_stage_seconds_count{service="test",stage="solve"} 1' in text
+    assert 'polynome_stage_seconds_bucket{service="test",stage="solve",le="+Inf"} 1' in text
+
+
+# Cas de test 3 : Un collecteur en échec n'empêche pas la collecte
+def test_failing_collector_is_reported():
+    registry = MetricsRegistry()
+
+    def broken():
+        raise RuntimeError("indisponible")
+
+    registry.register_collector(broken)
+    text = registry.render()
+    assert 'polynome_collector_errors{service="unknown",collector="broken",error="RuntimeError"} 1.0' in text
+    assert "polynome_http_in_flight" in text
+
+
+# Cas de test 4 : L'endpoint /metrics expose les durées par route, les caches et les files
+def test_install_exposes_metrics_endpoint():
+    app = Flask(__name__)
+    registry = MetricsRegistry()
+    cache = ExpressionCache()
+    cache.get("x^2 - 1", "x")
+    cache.get("x^2 - 1", "x")
+    install(app, "demo", caches={"expression": cache}, queues={"write_behind": _Queue()}, registry=registry)
+
+    @app.route("/demo/<int:value>")
+    def demo(value):
+        with registry.stage("solve"):
+            return {"value": value}
+
+    client = app.test_client()
+    assert client.get("/demo/1").status_code == 200
+    assert client.get("/demo/2").status_code == 200
+
+    response = client.get("/metrics")
+    text = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert 'polynome_request_seconds_count{service="demo",method="GET",route="/demo/<int:value>"} 2' in text
+    assert 'polynome_stage_seconds_count{service="demo",stage="solve"} 2' in text
+    assert 'polynome_cache_hit_ratio{service="demo",cache="expression"} 0.5' in text
+    assert 'polynome_queue_depth{service="demo",queue="write_behind"} 3.0' in text
+    assert 'polynome_http_in_flight{service="demo"} 1.0' in text
@@ -0,0 +1,36 @@
+import numpy as np
+from polynome_commun.newton_engine import default_seeds, distinct_roots, horner, newton_multi_start
+
+# Cas de test 1 : Horner évalue p et p' ensemble
+def test_horner_value_and_derivative():
+    coefficients = np.array([2.0, -3.0, 0.0, 5.0])  # 2x^3 - 3x^2 + 5
+    p, dp = horner(coefficients, np.array([0.0, 1.0, 2.0]))
+
+    assert np.allclose(p, [5.0, 4.0, 9.0])
+    assert np.allclose(dp, [0.0, 0.0, 12.0])
+
+# Cas de test 2 : Les voies sont indépendantes (convergée, bloquée)
+def test_newton_multi_start_lanes():
+    coefficients = np.array([1.0, 0.0, -4.0])  # x^2 - 4
+    lanes = newton_multi_start(coefficients, [3.0, 0.0, -1.0])
+
+    assert list(lanes["converged"]) == [True, False, True]
+    assert list(lanes["stalled"]) == [False, True, False]
+    assert np.allclose(lanes["solutions"][[0, 2]], [2.0, -2.0])
+    assert lanes["iterations"][1] == 1
+
+# Cas de test 3 : Regroupement des solutions identiques
+def test_distinct_roots_groups_lanes():
+    solutions = np.array([2.0, -2.0, 2.0 + 1e-9, 7.0])
+    converged = np.array([True, True, True, False])
+
+    roots = distinct_roots(solutions, converged)
+
+    assert [round(root, 6) for root, _ in roots] == [-2.0, 2.0]
+    assert sorted(roots[1][1]) == [0, 2]
+
+# Cas de test 4 : La grille automatique couvre la borne de Cauchy
+def test_default_seeds_cover_roots():
+    seeds = default_seeds(np.array([1.0, -6.0, 11.0, -6.0]), count=5)
+
+    assert seeds[0] == -12.0 and seeds[-1] == 12.0
@@ -0,0 +1,106 @@
+import json
+import threading
+
+from sqlalchemy import Column, Integer, Text, create_engine, func, select
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from polynome_commun.persistence import WriteBehindQueue
+
+Base = declarative_base()
+
+
+class Row(Base):
+    __tablename__ = "rows"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    equation = Column(Text, nullable=False)
+
+
+def make_session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def count_rows(session_factory):
+    session = session_factory()
+    try:
+        return session.execute(select(func.count()).select_from(Row)).scalar()
+    finally:
+        session.close()
+
+
+# Cas de test 1 : Les lignes sont insérées par lots et la fermeture vide la file
+def test_write_queue_bulk_insert_and_drain(tmp_path):
+    session_factory = make_session_factory()
+    write_queue = WriteBehindQueue(session_factory, Base.metadata, name="test", batch_size=10,
+                                   flush_interval=5.0, spill_path=str(tmp_path / "spill.ndjson"))
+
+    write_queue.enqueue_many(Row, [{"equation": f"x^2 - {i}"} for i in range(25)])
+    write_queue.close()
+
+    assert count_rows(session_factory) == 25
+    stats = write_queue.stats()
+    assert stats["flushed"] == 25
+    assert stats["batches"] == 3
+    assert stats["depth"] == 0
+
+
+# Cas de test 2 : File pleine avec la politique "drop" ou "spill"
+def test_write_queue_overflow_policies(tmp_path):
+    session_factory = make_session_factory()
+    entered = threading.Event()
+    release = threading.Event()
+
+    def blocking_factory():
+        # Le premier lot bloque le thread d'écriture pour remplir la file
+        entered.set()
+        release.wait(5)
+        return session_factory()
+
+    spill_path = tmp_path / "spill.ndjson"
+    for policy in ("drop", "spill"):
+        entered.clear()
+        release.clear()
+        write_queue = WriteBehindQueue(blocking_factory, Base.metadata, name="test", max_size=1, batch_size=1,
+                                       flush_interval=0, overflow_policy=policy, spill_path=str(spill_path))
+        write_queue.enqueue(Row, {"equation": "x"})
+        entered.wait(5)
+        write_queue.enqueue(Row, {"equation": "x + 1"})  # occupe l'unique place
+        write_queue.enqueue(Row, {"equation": "x + 2"})  # débordement
+        release.set()
+        write_queue.close()
+
+        if policy == "drop":
+            assert write_queue.stats()["dropped"] == 1
+        else:
+            assert write_queue.stats()["spilled"] == 1
+            assert json.loads(spill_path.read_text()) == {"table": "rows", "values": {"equation": "x + 2"}}
+
+    # Les lignes débordées sont rejouées au démarrage suivant
+    write_queue = WriteBehindQueue(session_factory, Base.metadata, name="test", spill_path=str(spill_path))
+    write_queue.start()
+    write_queue.close()
+
+    assert not spill_path.exists()
+    assert count_rows(session_factory) == 2 + 2 + 1
+
+
+# Cas de test 3 : Plusieurs workers partageant le fichier de débordement : un seul le rejoue, sans erreur
+def test_spill_replay_claimed_by_one_worker(tmp_path):
+    session_factory = make_session_factory()
+    spill_path = tmp_path / "spill.ndjson"
+    spill_path.write_text("".join(json.dumps({"table": "rows", "values": {"equation": f"x + {i}"}}) + "\n"
+                                  for i in range(30)))
+
+    queues = [WriteBehindQueue(session_factory, Base.metadata, name="test", batch_size=8,
+                               spill_path=str(spill_path)) for _ in range(4)]
+    for write_queue in queues:
+        write_queue.enqueue(Row, {"equation": "x"})  # Le rejeu se fait dans le thread d'écriture
+    for write_queue in queues:
+        write_queue.close()
+
+    assert count_rows(session_factory) == 30 + 4
+    assert sum(write_queue.stats()["flushed"] for write_queue in queues) == 34
+    assert list(tmp_path.iterdir()) == []
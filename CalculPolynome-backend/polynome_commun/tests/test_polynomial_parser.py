@@ -0,0 +1,51 @@
+import time
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from polynome_commun.polynomial_parser import (
+    PolynomialDegreeError, PolynomialSyntaxError, coefficient_array, dense_coefficients, parse_terms
+)
+
+
+# Cas de test 1 : `^`, `**`, multiplication implicite et rationnels exacts
+def test_parse_terms_grammar():
+    assert parse_terms("3x^2 + 2x - 1") == {2: 3, 1: 2, 0: -1}
+    assert parse_terms("x**2 - 4") == parse_terms("x^2 - 4")
+    assert parse_terms("-x^3 + 1/3 x") == {3: -1, 1: Fraction(1, 3)}
+    assert parse_terms("2(t + 1)^2", "t") == {2: 2, 1: 4, 0: 2}
+    assert dense_coefficients(parse_terms("x^2 - x^2")) == [0]
+
+
+# Cas de test 2 : Les entrées hors grammaire sont refusées par l'analyseur rapide
+@pytest.mark.parametrize("equation", ["sin(x)", "a*x + 1", "x^-1", "x/x", "2^x", "(x + 1"])
+def test_parse_terms_outside_grammar(equation):
+    with pytest.raises(PolynomialSyntaxError):
+        parse_terms(equation)
+
+
+# Cas de test 3 : Tableau de coefficients et repli sur SymPy
+def test_coefficient_array_fallback():
+    assert np.array_equal(coefficient_array("0.5x^2 - 4"), [0.5, 0.0, -4.0])
+    assert np.array_equal(coefficient_array("x^2 + sqrt(4)"), [1.0, 0.0, 2.0])
+    assert coefficient_array("sin(x)") is None
+    with pytest.raises(PolynomialSyntaxError):
+        coefficient_array("sin(x)", fallback=False)
+
+
+# Cas de test 4 : Degré trop grand refusé définitivement, sans repli sur SymPy
+@pytest.mark.parametrize("equation", ["x^2000", "x^100000", "sin(x) + (x + 1)^100000", "sqrt(2)*(x^40)^40"])
+def test_degree_limit_is_terminal(equation):
+    with pytest.raises(PolynomialDegreeError):
+        coefficient_array(equation)
+    assert not issubclass(PolynomialDegreeError, PolynomialSyntaxError)
+
+# Cas de test 5 : Exposant non littéral refusé sur l'expression SymPy, avant la construction du polynôme dense
+@pytest.mark.parametrize("equation", ["sin(0) + x^(10^7)", "sqrt(4)*(x^(10^3))^(10^4)", "sin(0) + (x^2)^501"])
+def test_degree_limit_before_dense_poly(equation):
+    coefficient_array("sin(0) + x")  # SymPy chargé avant la mesure
+    start = time.perf_counter()
+    with pytest.raises(PolynomialDegreeError):
+        coefficient_array(equation)
+    assert time.perf_counter() - start < 1
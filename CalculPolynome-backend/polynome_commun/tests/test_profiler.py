@@ -0,0 +1,120 @@
+import os
+import time
+from collections import Counter
+
+from flask import Flask
+
+from polynome_commun.profiler import SlowRequestProfiler, install
+from polynome_commun.symbolic_pool import SymbolicPool
+
+
+def slow_function(seconds):
+    expires = time.monotonic() + seconds
+    while time.monotonic() < expires:
+        pass
+
+
+def make_app(profiler):
+    app = Flask(__name__)
+    install(app, "test", "/demo", profiler=profiler)
+
+    @app.route("/demo", methods=["POST"])
+    def demo():
+        slow_function(0.3)
+        return {"success": True}
+
+    @app.route("/demo/fast", methods=["POST"])
+    def fast():
+        return {"success": True}
+
+    return app
+
+
+# Cas de test 1 : Une requête lente produit une capture repliée et ses métadonnées
+def test_slow_request_is_captured(tmp_path):
+    profiler = SlowRequestProfiler("test", directory=str(tmp_path), threshold=0.05, interval=0.005)
+    client = make_app(profiler).test_client()
+
+    assert client.post("/demo", json={"equation": "x^2 - 4", "tolerance": 1e-7}).status_code == 200
+    assert client.post("/demo/fast", json={"equation": "x - 1"}).status_code == 200
+
+    listing = client.get("/demo/profiles").get_json()
+    assert listing["profiler"]["captured"] == 1
+    capture = listing["captures"][0]
+    assert capture["endpoint"] == "POST /demo"
+    assert capture["params"]["equation"] == "x^2 - 4"
+    assert len(capture["equation_hash"]) == 64
+    assert capture["samples"] > 0
+
+    folded = client.get(f"/demo/profiles/{capture['id']}").get_data(as_text=True)
+    assert "slow_function" in folded
+    assert folded.splitlines()[0].rsplit(" ", 1)[1].isdigit()
+
+
+# Cas de test 2 : Au-delà du nombre de captures par minute, les requêtes lentes ne sont plus écrites
+def test_capture_rate_limit(tmp_path):
+    profiler = SlowRequestProfiler("test", directory=str(tmp_path), threshold=0.05, interval=0.005,
+                                   max_per_minute=1)
+    client = make_app(profiler).test_client()
+
+    client.post("/demo", json={"equation": "x^2 - 4"})
+    client.post("/demo", json={"equation": "x^2 - 9"})
+
+    assert profiler.captured == 1
+    assert profiler.dropped == 1
+    assert len(os.listdir(tmp_path)) == 2
+
+
+# Cas de test 3 : Le plafond d'espace disque supprime les captures les plus anciennes
+def test_disk_cap_removes_oldest_captures(tmp_path):
+    profiler = SlowRequestProfiler("test", directory=str(tmp_path))
+    profiler.start()
+    first = profiler._write(Counter({"main;solve": 3}), {"endpoint": "POST /demo"}, 1.0)
+    size = sum(os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path))
+
+    # Place pour une seule capture : l'écriture suivante évince la première
+    profiler.max_bytes = size + size // 2
+    time.sleep(0.01)
+    second = profiler._write(Counter({"main;parse": 2}), {"endpoint": "POST /demo"}, 1.0)
+
+    assert profiler.read(first) is None
+    assert profiler.read(second) == "main;parse 2\n"
+    assert [capture["id"] for capture in profiler.captures()] == [second]
+
+
+# Cas de test 4 : Sans profileur actif, l'endpoint de liste répond sans capture
+def test_listing_when_disabled():
+    app = Flask(__name__)
+    assert install(app, "test", "/demo") is None
+
+    response = app.test_client().get("/demo/profiles")
+    assert response.get_json() == {"profiler": {"enabled": False}, "captures": []}
+
+
+# Cas de test 5 : Un calcul exécuté dans le pool symbolique est échantillonné dans son processus (piles SymPy)
+def test_pool_execution_is_sampled(tmp_path):
+    pool = SymbolicPool(workers=1, deadline=60)
+    profiler = SlowRequestProfiler("test", directory=str(tmp_path), threshold=0.0, interval=0.002)
+    app = Flask(__name__)
+    install(app, "test", "/factor", profiler=profiler)
+
+    @app.route("/factor", methods=["POST"])
+    def factor():
+        return {"factored": str(pool.run("factor", "(x + 1)^40 * (x - 2)^30 + 3"))}
+
+    try:
+        pool.start()
+        pool.run("factor", "x^2 - 1")  # Processus démarré et SymPy chargé avant la mesure
+        assert app.test_client().post("/factor", json={"equation": "x"}).status_code == 200
+    finally:
+        pool.close()
+
+    capture = profiler.captures()[0]
+    folded = profiler.read(capture["id"])
+    stacks = [line.rsplit(" ", 1)[0] for line in folded.splitlines()]
+    # Pile du service jusqu'à l'appel au pool, puis pile du processus de calcul
+    remote = [stack for stack in stacks if "run (symbolic_pool.py" in stack and "execute (symbolic_pool.py" in stack]
+    assert remote
+    assert any("polytools.py" in stack or "factortools.py" in stack for stack in remote)
+    # Le thread du service, qui ne fait qu'attendre le résultat, n'est pas échantillonné en parallèle
+    assert not any("poll (connection.py" in stack for stack in stacks)
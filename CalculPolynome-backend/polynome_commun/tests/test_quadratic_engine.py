@@ -0,0 +1,17 @@
+import numpy as np
+from polynome_commun.quadratic_engine import solve_quadratic_batch
+
+# Cas de test 1 : Pas d'annulation catastrophique quand |b| >> 4ac
+def test_solve_quadratic_batch_stable():
+    x1, x2, _ = solve_quadratic_batch([1.0], [1e8], [1.0])
+
+    small_root = x2[0].real
+    assert abs(small_root - (-1e-8)) / 1e-8 < 1e-12
+    assert abs(x1[0].real - (-1e8)) / 1e8 < 1e-12
+
+# Cas de test 2 : a = 0 donne NaN sans interrompre le lot
+def test_solve_quadratic_batch_invalid_lane():
+    x1, x2, discriminant = solve_quadratic_batch([0.0, 1.0], [1.0, -3.0], [1.0, 2.0])
+
+    assert np.isnan(x1[0]) and np.isnan(x2[0])
+    assert sorted([x1[1].real, x2[1].real]) == [1.0, 2.0]
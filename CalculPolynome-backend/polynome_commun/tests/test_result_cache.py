@@ -0,0 +1,91 @@
+from sqlalchemy import Column, Integer, String, Text, create_engine, text
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from polynome_commun.result_cache import ResultCache, equation_hash, migrate_columns, migrate_equation_hash
+
+Base = declarative_base()
+
+
+class Factorisation(Base):
+    __tablename__ = "factorisation"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    equation = Column(Text, nullable=False)
+    result = Column(Text, nullable=False)
+    equation_hash = Column(String(64), index=True)
+
+
+class Racines(Base):
+    __tablename__ = "racines"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    equation = Column(Text, nullable=False)
+    method = Column(String(16))
+    details = Column(Text)
+
+
+def make_engine():
+    return create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+
+# Cas de test 1 : L'empreinte dépend de l'équation canonique et des paramètres
+def test_equation_hash_parameters():
+    assert equation_hash("x^2 - 4") == equation_hash("x**2-4")
+    assert equation_hash("x^2 - 4", initial_guess=1.0) != equation_hash("x^2 - 4", initial_guess=2.0)
+    assert equation_hash("x^2 - 4", "x") != equation_hash("x^2 - 4", "y")
+
+
+# Cas de test 2 : Mémoire, puis base, puis absence
+def test_result_cache_tiers():
+    engine = make_engine()
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    key = equation_hash("x^2 - 4")
+
+    session = session_factory()
+    session.add(Factorisation(equation="x^2 - 4", result="(x - 2)*(x + 2)", equation_hash=key))
+    session.commit()
+    session.close()
+
+    cache = ResultCache(session_factory, Factorisation, lambda row: row.result, name="test")
+
+    assert cache.get(key) == "(x - 2)*(x + 2)"
+    assert cache.get(key) == "(x - 2)*(x + 2)"
+    assert cache.get(equation_hash("x^2 - 9")) is None
+    assert cache.stats()["database_hits"] == 1
+    assert cache.stats()["memory_hits"] == 1
+    assert cache.stats()["misses"] == 1
+    # Valeur par défaut distincte de None pour les résultats en cache qui peuvent être vides
+    missing = object()
+    assert cache.get(equation_hash("x^2 - 9"), database=False, default=missing) is missing
+
+
+# Cas de test 3 : Ajout de la colonne à une ancienne table et remplissage des lignes existantes
+def test_migrate_equation_hash_backfill():
+    engine = make_engine()
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE factorisation (id INTEGER PRIMARY KEY, equation TEXT, result TEXT)"))
+        connection.execute(text("INSERT INTO factorisation (equation, result) VALUES ('x^2 - 4', '(x - 2)*(x + 2)')"))
+
+    backfilled = migrate_equation_hash(engine, Factorisation, lambda row: equation_hash(row.equation))
+
+    assert backfilled == 1
+    with engine.connect() as connection:
+        stored = connection.execute(text("SELECT equation_hash FROM factorisation")).scalar()
+    assert stored == equation_hash("x**2-4")
+    # Une seconde migration ne refait rien
+    assert migrate_equation_hash(engine, Factorisation, lambda row: equation_hash(row.equation)) == 0
+
+
+# Cas de test 4 : Colonnes manquantes ajoutées une seule fois, anciennes lignes laissées vides
+def test_migrate_columns():
+    engine = make_engine()
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE racines (id INTEGER PRIMARY KEY, equation TEXT)"))
+        connection.execute(text("INSERT INTO racines (equation) VALUES ('x^2 - 4')"))
+
+    assert migrate_columns(engine, Racines, ["method", "details"]) == ["method", "details"]
+    assert migrate_columns(engine, Racines, ["method", "details"]) == []
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT method, details FROM racines")).one() == (None, None)
@@ -0,0 +1,51 @@
+from fractions import Fraction
+
+import numpy as np
+
+from polynome_commun.polynomial_parser import parse_terms
+from polynome_commun.root_isolation import isolate_real_roots, refine_roots
+
+
+def product(*factors):
+    # Coefficients entiers (degré croissant) d'un produit de polynômes, en arithmétique exacte
+    result = [1]
+    for factor in factors:
+        expanded = [0] * (len(result) + len(factor) - 1)
+        for i, a in enumerate(result):
+            for j, b in enumerate(factor):
+                expanded[i + j] += a * b
+        result = expanded
+    return {exponent: Fraction(c) for exponent, c in enumerate(result) if c}
+
+
+# Cas de test 1 : Intervalles disjoints, racines rationnelles exactes et multiplicités
+def test_isolation_with_multiplicities():
+    # (x - 1)^2 (x + 2) (x^2 - 3) x^3
+    terms = product([-1, 1], [-1, 1], [2, 1], [-3, 0, 1], [0, 1], [0, 1], [0, 1])
+    intervals, _ = isolate_real_roots(terms)
+
+    assert [multiplicity for _, _, multiplicity in intervals] == [1, 1, 3, 2, 1]
+    assert all(upper <= lower for (_, upper, _), (lower, _, _) in zip(intervals, intervals[1:]))
+    lower, upper, _ = intervals[1]
+    assert lower < -Fraction(17, 10) < upper  # -√3
+
+
+# Cas de test 2 : Racines de Newton sécurisé à la tolérance demandée
+def test_refine_to_tolerance():
+    intervals, square_free = isolate_real_roots(parse_terms("x^4 - 10x^2 + 1", "x"))
+    lanes = refine_roots(square_free, intervals, tolerance=1e-12)
+
+    expected = np.sort(np.roots([1, 0, -10, 0, 1]).real)
+    assert np.allclose(lanes["solutions"], expected, atol=1e-12)
+    assert lanes["converged"].all()
+    assert (lanes["lower"] <= lanes["solutions"]).all() and (lanes["solutions"] <= lanes["upper"]).all()
+
+
+# Cas de test 3 : Polynôme mal conditionné, encadrement vérifié en arithmétique exacte
+def test_ill_conditioned_roots():
+    terms = product(*([-root, 1] for root in range(1, 21)))
+    intervals, square_free = isolate_real_roots(terms)
+    lanes = refine_roots(square_free, intervals, tolerance=1e-9)
+
+    assert [multiplicity for _, _, multiplicity in intervals] == [1] * 20
+    assert np.allclose(lanes["solutions"], np.arange(1, 21), atol=1e-9)
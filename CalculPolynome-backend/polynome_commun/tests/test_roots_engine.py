@@ -0,0 +1,45 @@
+import warnings
+
+import numpy as np
+from polynome_commun.roots_engine import all_roots, format_root
+
+# Cas de test 1 : Racines multiples regroupées avec leur multiplicité
+def test_all_roots_multiplicity():
+    roots = all_roots(np.poly([1, 1, 1, 1, 2, 3]))
+
+    assert [(round(root.real, 6), multiplicity) for root, multiplicity in roots] == [(1.0, 4), (2.0, 1), (3.0, 1)]
+    assert all(root.imag == 0 for root, _ in roots)
+
+# Cas de test 2 : Degré élevé, toutes les racines sont retrouvées
+def test_all_roots_high_degree():
+    coefficients = np.random.default_rng(0).integers(1, 9, 61).astype(float)
+
+    roots = all_roots(coefficients)
+
+    assert sum(multiplicity for _, multiplicity in roots) == 60
+    values = np.polyval(coefficients, np.array([root for root, _ in roots]))
+    assert np.all(np.abs(values) < 1e-6 * np.sum(np.abs(coefficients)) * 10)
+
+# Cas de test 3 : Écriture des racines complexes
+def test_format_root():
+    assert format_root(complex(1.234, 0.0)) == "1.23"
+    assert format_root(complex(0.0, -1.0)) == "-1.0*I"
+    assert format_root(complex(-1.0, 2.0)) == "-1.0 + 2.0*I"
+
+# Cas de test 4 : Multiplicité élevée attribuée exactement par la décomposition sans facteur carré
+def test_all_roots_high_multiplicity():
+    assert all_roots(np.poly([1] * 10)) == [(complex(1.0, 0.0), 10)]
+    roots = all_roots(np.polymul(np.poly([-2] * 12), [1, 0, 1]))
+    assert [(round(root.real, 9), round(root.imag, 9), multiplicity) for root, multiplicity in roots] == [
+        (-2.0, 0.0, 12), (0.0, -1.0, 1), (0.0, 1.0, 1)
+    ]
+
+# Cas de test 5 : Degré 1000 sans débordement signalé, toutes les racines finies
+def test_all_roots_degree_1000_no_overflow():
+    coefficients = np.random.default_rng(1).integers(1, 9, 1001).astype(float)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        roots = all_roots(coefficients)
+    assert sum(multiplicity for _, multiplicity in roots) == 1000
+    assert all(np.isfinite(root) for root, _ in roots)
+
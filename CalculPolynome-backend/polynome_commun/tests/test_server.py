@@ -0,0 +1,95 @@
+import os
+import subprocess
+import sys
+import threading
+
+from flask import Flask
+
+from polynome_commun.server import InFlightLimiter
+
+# Dossier contenant le paquet polynome_commun, pour les processus lancés par les tests
+BACKEND = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_app(release):
+    app = Flask(__name__)
+
+    @app.route("/slow")
+    def slow():
+        release.wait(5)
+        return {"success": True}
+
+    return app
+
+
+# Cas de test 1 : Au-delà de la limite, la requête est refusée (503 + Retry-After)
+def test_in_flight_limiter_rejects_excess():
+    release = threading.Event()
+    limiter = InFlightLimiter(make_app(release).wsgi_app, limit=1)
+    app = Flask(__name__)
+    app.wsgi_app = limiter
+    client = app.test_client()
+
+    responses = []
+    worker = threading.Thread(target=lambda: responses.append(client.get("/slow")))
+    worker.start()
+    while limiter.in_flight == 0:
+        pass
+
+    rejected = client.get("/slow")
+    assert rejected.status_code == 503
+    assert rejected.headers["Retry-After"] == "1"
+
+    release.set()
+    worker.join()
+    assert responses[0].status_code == 200
+    assert limiter.rejected == 1
+
+
+# Cas de test 2 : L'attente de fin des requêtes en cours respecte son délai
+def test_in_flight_limiter_wait_idle():
+    release = threading.Event()
+    limiter = InFlightLimiter(make_app(release).wsgi_app, limit=4)
+    app = Flask(__name__)
+    app.wsgi_app = limiter
+    client = app.test_client()
+
+    # Comme un serveur WSGI, le client ferme la réponse une fois envoyée
+    worker = threading.Thread(target=lambda: client.get("/slow").close())
+    worker.start()
+    while limiter.in_flight == 0:
+        pass
+
+    assert limiter.wait_idle(0.05) is False
+    release.set()
+    assert limiter.wait_idle(5) is True
+    worker.join()
+    assert limiter.in_flight == 0
+
+
+# Cas de test 3 : `on_ready` (inscription Eureka) n'est appelé qu'une fois tous les workers préchauffés
+def test_serve_on_ready_after_warmup(tmp_path):
+    journal = tmp_path / "journal"
+    script = f"""
+import os, signal, sys, time
+sys.path.insert(0, {BACKEND!r})
+from flask import Flask
+from polynome_commun.server import serve
+
+def write(line):
+    with open({str(journal)!r}, "a") as output:
+        output.write(line + "\\n")
+
+def warmup():
+    time.sleep(0.3)
+    write("warm")
+
+def on_ready():
+    write("ready")
+    os.kill(os.getpid(), signal.SIGTERM)  # Arrêt propre du processus principal et des workers
+
+serve(Flask(__name__), 0, "127.0.0.1", workers=2, warmup=warmup, on_ready=on_ready, drain_timeout=1)
+"""
+    subprocess.run([sys.executable, "-c", script], timeout=60, check=True)
+
+    assert journal.read_text().split() == ["warm", "warm", "ready"]
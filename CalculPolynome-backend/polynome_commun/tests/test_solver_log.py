@@ -0,0 +1,37 @@
+import pytest
+
+from polynome_commun.solver_log import SolverLog, read_records
+
+
+# Cas de test 1 : Exécutions réussies ou en échec journalisées avec coefficients, durée et issue
+def test_timed_records(tmp_path):
+    log = SolverLog(directory=str(tmp_path), enabled=True)
+
+    with log.timed("Newton", "x^2 - 4", "x") as execution:
+        execution.update(converged=True, iterations=5)
+    with pytest.raises(ValueError):
+        with log.timed("Racines", coefficients=[1.0, 0.0, 1.0]):
+            raise ValueError("échec")
+    with log.timed("Factorisation", "x^2 - 1", "x") as execution:
+        execution.skip()  # Résultat relu depuis un cache : rien à mesurer
+    log.record("Newton", 0.001, True, equation="exp(x) - 2")  # Hors grammaire polynomiale : ignoré
+    log.close()
+
+    records = list(read_records([str(tmp_path)]))
+    assert [record["method"] for record in records] == ["Newton", "Racines"]
+    newton, racines = records
+    assert newton["coefficients"] == [1.0, 0.0, -4.0] and newton["success"] is True
+    assert (newton["converged"], newton["iterations"], newton["seconds"] >= 0) == (True, 5, True)
+    assert racines["success"] is False and racines["converged"] is False and racines["timed_out"] is False
+    assert log.stats()["written"] == 2
+
+
+# Cas de test 2 : Journal désactivé, aucun fichier écrit
+def test_disabled_log(tmp_path):
+    log = SolverLog(directory=str(tmp_path / "journal"), enabled=False)
+    with log.timed("Quadratique", coefficients=[1.0, 0.0, -1.0]):
+        pass
+    log.close()
+
+    assert not (tmp_path / "journal").exists()
+    assert log.stats()["recorded"] == 0
@@ -0,0 +1,48 @@
+import sys
+
+from flask import Flask
+
+from polynome_commun import server
+from polynome_commun.metrics import MetricsRegistry
+from polynome_commun.startup import StartupTimer, install, lazy_import
+
+
+# Cas de test 1 : Le module n'est importé qu'au premier accès à l'un de ses attributs
+def test_lazy_import(monkeypatch):
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    colorsys = lazy_import("colorsys")
+    assert "colorsys" not in sys.modules
+
+    assert colorsys.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert "colorsys" in sys.modules
+
+
+# Cas de test 2 : Temps de démarrage publiés sur <prefix>/startup et dans /metrics
+def test_install_publishes_startup_times(monkeypatch):
+    timer = StartupTimer(process_start=0.0)
+    monkeypatch.setattr("polynome_commun.startup.startup", timer)
+    registry = MetricsRegistry()
+    app = Flask(__name__)
+    install(app, "newton", "/newton", registry=registry)
+
+    stats = app.test_client().get("/newton/startup").get_json()
+    assert stats["service"] == "newton" and stats["import_seconds"] > 0 and stats["ready_seconds"] is None
+    assert [labels["phase"] for _, _, _, labels, value in timer.samples() if value is not None] == ["import"]
+
+    timer.ready(0.5)
+    assert timer.stats()["warmup_seconds"] == 0.5 and timer.ready_seconds >= timer.import_seconds
+
+
+# Cas de test 3 : Migration lancée au démarrage uniquement si POLYNOME_MIGRATE_ON_START est activé
+def test_run_migrates_on_request(monkeypatch):
+    calls = []
+    app = Flask(__name__)
+    monkeypatch.setattr(server, "SERVER_MODE", "dev")
+    monkeypatch.setattr(app, "run", lambda **_: calls.append("run"))
+
+    monkeypatch.setattr(server, "MIGRATE_ON_START", False)
+    server.run(app, 0, migrate=lambda: calls.append("migrate"), on_ready=lambda: calls.append("ready"))
+    monkeypatch.setattr(server, "MIGRATE_ON_START", True)
+    server.run(app, 0, migrate=lambda: calls.append("migrate"))
+
+    assert calls == ["ready", "run", "migrate", "run"]
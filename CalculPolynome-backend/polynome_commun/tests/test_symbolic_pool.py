@@ -0,0 +1,45 @@
+import pytest
+import sympy as sp
+
+from polynome_commun.symbolic_pool import SymbolicPool, SymbolicPoolFullError, SymbolicTimeoutError
+
+
+# Cas de test 1 : Exécution directe quand le pool est désactivé
+def test_symbolic_pool_inline():
+    pool = SymbolicPool(workers=0)
+
+    assert str(pool.run("factor", "x^2 - 4")) == "(x - 2)*(x + 2)"
+    assert pool.run("solve", "x^2 - 4") == [-2, 2]
+
+
+# Cas de test 2 : Un calcul trop long est interrompu, le processus est remplacé et le pool reste utilisable
+def test_symbolic_pool_deadline_respawn():
+    pool = SymbolicPool(workers=1, max_queue=0, deadline=60)
+    try:
+        assert pool.run("factor", "x^2 - 1") == sp.sympify("(x - 1)*(x + 1)")
+
+        with pytest.raises(SymbolicTimeoutError) as exc_info:
+            pool.run("factor", "x^200 + 3*x^101 - 7*x^57 + 11", deadline=0.05)
+        assert exc_info.value.to_dict()["timeout"] is True
+        assert exc_info.value.status == 504
+
+        assert str(pool.run("factor", "x^2 - 9")) == "(x - 3)*(x + 3)"
+        assert pool.stats()["respawns"] == 1
+        assert pool.stats()["timeouts"] == 1
+    finally:
+        pool.close()
+
+
+# Cas de test 3 : Les erreurs SymPy sont propagées telles quelles, la file d'attente est bornée
+def test_symbolic_pool_errors_and_queue_limit():
+    pool = SymbolicPool(workers=1, max_queue=0, deadline=60)
+    try:
+        with pytest.raises(sp.SympifyError):
+            pool.run("factor", "x^^2")
+
+        pool.waiting = 1  # Le seul processus est déjà occupé
+        with pytest.raises(SymbolicPoolFullError):
+            pool.run("factor", "x^2 - 1")
+        assert pool.stats()["rejected"] == 1
+    finally:
+        pool.close()
@@ -1,8 +1,16 @@
 from flask import Flask, request, jsonify
-from factorisation_solver import advanced_factorization
-import requests
-import threading
-import time
+from factorisation_solver import factorize, result_cache, SymbolicJobError, AdmissionRejected, admission
+from models import engine, migrate, write_queue
+from polynome_commun.bulk_jobs import JobManager, install as install_jobs
+from polynome_commun.eureka import EurekaClient
+from polynome_commun.expression_cache import expression_cache, parse_expression
+from polynome_commun.metrics import install, metrics
+from polynome_commun.profiler import install as install_profiler
+from polynome_commun.startup import install as install_startup
+from polynome_commun.result_cache import equation_hash
+from polynome_commun.server import run, warm_database
+from polynome_commun.solver_log import solver_log
+from polynome_commun.symbolic_pool import symbolic_pool
 import logging
 
 # Configuration des logs
@@ -12,47 +20,50 @@ logging.basicConfig(level=logging.INFO)
 app = Flask(__name__)
 
 # Configuration Eureka
-EUREKA_SERVER = "http://localhost:8761/eureka/apps/"
 SERVICE_NAME = "factorization-service"
 SERVICE_PORT = 5000
-INSTANCE_ID = f"{SERVICE_NAME}:{SERVICE_PORT}"
-HOSTNAME = "127.0.0.1"  # Utilisation de localhost pour Eureka
 
+# Inscription Eureka : session persistante, renouvellements du bail et désinscription à l'arrêt
+eureka = EurekaClient(SERVICE_NAME, SERVICE_PORT)
 
-def register_with_eureka():
+
+def _bulk_factorization(item):
     """
-    Fonction pour s'enregistrer auprès d'Eureka et envoyer des heartbeats périodiques.
+    Factorisation d'un élément d'un travail de masse ; l'enregistrement passe par la file d'écriture
+    différée (insertions groupées), comme pour une requête isolée. Le calcul passe par l'admission,
+    en patientant si la voie est saturée.
     """
-    while True:
+    if not item.get("equation"):
+        raise ValueError("L'équation est obligatoire.")
+    equation, variable = item["equation"], item.get("variable", "x")
+    result = admission.run_patiently(equation, variable, "factor", lambda: factorize(equation, variable))
+    return dict(result, original_equation=item["equation"], success=True)
+
+
+def _prefetch_factorizations(items):
+    # Une seule requête SQL par tranche pour les résultats déjà calculés
+    keys = []
+    for item in items:
         try:
-            # URL pour enregistrer le service dans Eureka
-            url = EUREKA_SERVER + SERVICE_NAME
-            payload = {
-                "instance": {
-                    "instanceId": INSTANCE_ID,
-                    "hostName": HOSTNAME,
-                    "app": SERVICE_NAME.upper(),
-                    "ipAddr": HOSTNAME,
-                    "vipAddress": SERVICE_NAME,
-                    "status": "UP",
-                    "port": {"$": SERVICE_PORT, "@enabled": True},
-                    "dataCenterInfo": {
-                        "@class": "com.netflix.appinfo.InstanceInfo$DefaultDataCenterInfo",
-                        "name": "MyOwn"
-                    }
-                }
-            }
-            headers = {"Content-Type": "application/json"}
-            response = requests.post(url, json=payload, headers=headers)
-            if response.status_code == 204:
-                logging.info("Service registered successfully with Eureka!")
-            else:
-                logging.error(f"Failed to register with Eureka: {response.status_code}, {response.text}")
-        except Exception as e:
-            logging.error(f"Error registering with Eureka: {e}")
-
-        # Envoyer un heartbeat toutes les 30 secondes
-        time.sleep(30)
+            keys.append(equation_hash(item["equation"], item.get("variable", "x")))
+        except Exception:
+            continue
+    result_cache.get_many(keys)
+
+
+# Travaux de masse (POST /factoriser/jobs) : entrée NDJSON ou CSV, résultats NDJSON en flux
+jobs = install_jobs(app, "/factoriser", JobManager("factorisation", _bulk_factorization,
+                                                   prefetch=_prefetch_factorizations))
+
+# Métriques Prometheus (GET /metrics) : durées par étape, caches, files et pools
+install(app, "factorisation",
+        caches={"expression": expression_cache, "result": result_cache},
+        queues={"write_behind": write_queue, "symbolic": symbolic_pool,
+                "admission_fast": admission.fast, "admission_slow": admission.slow, "jobs": jobs,
+                "solver_log": solver_log})
+
+# Profilage des requêtes lentes sur demande (POLYNOME_PROFILER=1), captures listées sur GET /factoriser/profiles
+install_profiler(app, "factorisation", "/factoriser")
 
 
 @app.route('/factoriser', methods=['POST'])
@@ -69,22 +80,72 @@ def factorize_advanced():
         if not equation:
             return jsonify({"success": False, "error": "L'équation est obligatoire."}), 400
 
-        # Appel à la fonction de factorisation
-        factorized_result = advanced_factorization(equation, variable)
+        # Appel à la fonction de factorisation, après admission selon le coût estimé
+        with admission.admit(equation, variable, "factor"):
+            result = factorize(equation, variable)
 
-        # Réponse au client
-        return jsonify({
-            "success": True,
-            "original_equation": equation,
-            "factorized_result": factorized_result
-        })
+        # Réponse au client : chaîne factorisée et facteurs structurés avec leurs multiplicités
+        with metrics.stage("serialize"):
+            return jsonify({
+                "success": True,
+                "original_equation": equation,
+                "factorized_result": result["factorized_result"],
+                "content": result["content"],
+                "factors": result["factors"],
+                "irreducible": result["irreducible"],
+                "method": result["method"]
+            })
+    except AdmissionRejected as e:
+        # Voie lente saturée : le client réessaie après le délai indiqué
+        return jsonify(e.to_dict()), 429, {"Retry-After": str(e.retry_after)}
+    except SymbolicJobError as e:
+        # Délai dépassé (504) ou pool saturé (503)
+        return jsonify(e.to_dict()), e.status
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 400
 
 
-if __name__ == '__main__':
-    # Lancer le thread pour s'enregistrer auprès d'Eureka
-    threading.Thread(target=register_with_eureka, daemon=True).start()
+@app.route('/factoriser/admission', methods=['GET'])
+def admission_stats():
+    """
+    Statistiques d'admission : état des voies, temps d'attente et coût estimé / réel des requêtes récentes.
+    """
+    return jsonify(admission.stats()), 200
+
+
+@app.route('/factoriser/health', methods=['GET'])
+def health():
+    """
+    État du service et de son inscription dans le registre Eureka.
+    """
+    registry = eureka.health()
+    return jsonify({"status": "UP", "registry": registry}), 200
+
 
-    # Démarrer l'application Flask
-    app.run(host='0.0.0.0', port=SERVICE_PORT)
+def warm_up():
+    """
+    Préchauffage d'un worker avant d'accepter du trafic : connexions à la base, SymPy et pool de calcul symbolique.
+    """
+    warm_database(engine)
+    parse_expression("x^2 - 4").factored
+    symbolic_pool.start()
+
+
+def drain():
+    """
+    Arrêt d'un worker : travaux de masse, écritures en attente puis processus de calcul symbolique.
+    """
+    jobs.close()
+    write_queue.close()
+    solver_log.close()
+    symbolic_pool.close()
+
+
+# Fin de l'import du service : temps d'import et de démarrage sur GET /factoriser/startup et dans /metrics
+install_startup(app, "factorisation", "/factoriser")
+
+
+if __name__ == '__main__':
+    # Démarrer le service (POLYNOME_SERVER_MODE=prod : workers pré-forkés), puis s'enregistrer auprès
+    # d'Eureka une fois les workers préchauffés (renouvellements en arrière-plan)
+    run(app, SERVICE_PORT, warmup=warm_up, drain=drain, migrate=migrate, on_ready=eureka.start)
@@ -1,40 +1,90 @@
-from sympy import symbols, factor, simplify
-from sympy.core.sympify import SympifyError
-from flask import jsonify
-from models import SessionLocal, Polynomial
+import os
+import sys
 
-def advanced_factorization(equation, variable):
+from models import SessionLocal, write_queue, Polynomial
+
+# Accès au paquet partagé polynome_commun
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from polynome_commun.admission import AdmissionRejected, admission
+from polynome_commun.expression_cache import sympify_equation
+from polynome_commun.factorization import fast_factorization, symbolic_result
+from polynome_commun.metrics import metrics
+from polynome_commun.result_cache import ResultCache, equation_hash
+from polynome_commun.solver_log import solver_log
+from polynome_commun.startup import lazy_import
+from polynome_commun.symbolic_pool import SymbolicJobError, symbolic_pool
+
+# SymPy n'est chargé qu'au premier résultat relu depuis le cache (ou au préchauffage)
+sp = lazy_import("sympy")
+
+# Résultats déjà calculés : mémoire puis table `polynome` (recherche par empreinte)
+result_cache = ResultCache(SessionLocal, Polynomial, lambda row: row.factorized_result, name="factorisation")
+# Absence d'entrée dans le cache (un résultat en cache peut être vide)
+_MISSING = object()
+
+def _persist(equation, factored_with_caret, key):
+    # Enregistrement différé dans la base de données (insertion groupée en arrière-plan)
+    with metrics.stage("persist"):
+        write_queue.enqueue(Polynomial, {
+            "equation": equation.replace('**', '^'),  # Stocke également l'équation avec `^`
+            "factorized_result": factored_with_caret,
+            "equation_hash": key
+        })
+
+
+def factorize(equation, variable):
+    """
+    Factorisation structurée : chaîne `factorized_result`, contenu et facteurs avec multiplicités.
+
+    Les polynômes univariés à coefficients entiers ou rationnels passent par le chemin rapide
+    (sans SymPy, moins coûteux qu'une lecture en base) ; les entrées multivariées, symboliques
+    ou à coefficients décimaux passent par SymPy dans le pool borné par un délai.
+    """
     try:
-        # Définition de la variable symbolique
-        x = symbols(variable)
+        key = equation_hash(equation, variable)
+
+        # Durée et issue journalisées pour le modèle de coût de la recommandation (sauf résultat relu)
+        with solver_log.timed("Factorisation", equation, variable) as execution:
+            with metrics.stage("solve"):
+                result = fast_factorization(equation, variable)
+            if result is None:
+                factored_with_caret = result_cache.get(key, default=_MISSING)
+                if factored_with_caret is _MISSING:
+                    # Factorisation de l'équation avec SymPy, dans le pool de processus borné par un délai
+                    with metrics.stage("solve"):
+                        factored = symbolic_pool.run("factor", equation, variable)
+                else:
+                    execution.skip()
+
+        if result is not None:
+            # Le cache mémoire évite seulement de réenregistrer une équation déjà vue
+            if result_cache.get(key, database=False, default=_MISSING) is _MISSING:
+                result_cache.put(key, result["factorized_result"])
+                _persist(equation, result["factorized_result"], key)
+            return result
+
+        if factored_with_caret is _MISSING:
+            # Conversion de `**` en `^` pour l'affichage ou le stockage
+            factored_with_caret = str(factored).replace('**', '^')
 
-        # Factorisation de l'équation avec SymPy
-        factored = factor(equation)
+            if str(factored) != equation:
+                result_cache.put(key, factored_with_caret)
+                _persist(equation, factored_with_caret, key)
+        else:
+            factored = sympify_equation(factored_with_caret, variable)
 
         # Si l'équation factorisée est identique à l'entrée, elle est invalide ou non factorisable
-        if str(factored) == equation:
+        if factored_with_caret.replace('^', '**') == equation:
             raise ValueError("L'équation fournie n'est pas factorisable ou est invalide.")
 
-        # Conversion de `**` en `^` pour l'affichage ou le stockage
-        factored_with_caret = str(factored).replace('**', '^')
-
-        # Enregistrement dans la base de données
-        session = SessionLocal()
-        try:
-            polynomial = Polynomial(
-                equation=equation.replace('**', '^'),  # Stocke également l'équation avec `^`
-                factorized_result=factored_with_caret
-            )
-            session.add(polynomial)
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            raise ValueError(f"Erreur lors de l'enregistrement dans la base de données : {e}")
-        finally:
-            session.close()
-
-        return factored_with_caret
-    except SympifyError:
-        raise ValueError("L'équation fournie est invalide.")
+        return symbolic_result(factored)
+    except SymbolicJobError:
+        raise
+    except sp.SympifyError:
+        raise ValueError("L'équation fournie n'est pas factorisable ou est invalide.")
     except Exception as e:
         raise ValueError(f"Erreur lors de la factorisation : {e}")
+
+
+def advanced_factorization(equation, variable):
+    return factorize(equation, variable)["factorized_result"]
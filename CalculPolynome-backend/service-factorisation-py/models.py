@@ -1,7 +1,15 @@
-from sqlalchemy import Column, Integer, Text, create_engine
+import os
+import sys
+
+from sqlalchemy import Column, Integer, String, Text, create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+# Accès au paquet partagé polynome_commun
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from polynome_commun.persistence import WriteBehindQueue
+from polynome_commun.result_cache import equation_hash, migrate_equation_hash
+
 # déclaration de la base pour les modèles SQLAlchemy
 Base = declarative_base()
 
@@ -12,13 +20,33 @@ class Polynomial(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)  # Clé primaire auto-incrémentée
     equation = Column(Text, nullable=False)  # Colonne pour l'équation d'entrée
     factorized_result = Column(Text, nullable=False)  # Colonne pour le résultat factorisé
+    equation_hash = Column(String(64), index=True)  # Empreinte de l'équation canonique et des paramètres
 
 # Configuration de la base de données
-DATABASE_URL = "mysql+mysqlconnector://root@localhost:3306/factorisation_db"
-engine = create_engine(DATABASE_URL, echo=True)  # echo=True pour afficher les requêtes SQL dans la console
-
-# Création de la table automatiquement si elle n'existe pas
-Base.metadata.create_all(bind=engine)
+# URL remplaçable par POLYNOME_DATABASE_URL (ex. SQLite pour les bancs d'essai et tests de charge)
+DATABASE_URL = os.environ.get("POLYNOME_DATABASE_URL", "mysql+mysqlconnector://root@localhost:3306/factorisation_db")
+# Aucune connexion ni requête à l'import : le schéma est créé par l'étape de migration (migrate)
+# Requêtes SQL affichées dans la console avec POLYNOME_SQL_ECHO=1
+engine = create_engine(DATABASE_URL, echo=os.environ.get("POLYNOME_SQL_ECHO", "0") == "1")
 
 # Configuration de la session pour interagir avec la base de données
 SessionLocal = sessionmaker(bind=engine)
+
+# File d'écriture différée : les résultats sont insérés par lots en arrière-plan
+write_queue = WriteBehindQueue(SessionLocal, Base.metadata, name="factorisation")
+
+
+def migrate():
+    """
+    Migration du schéma, étape séparée du démarrage (python models.py, ou POLYNOME_MIGRATE_ON_START=1) :
+    le service s'importe sans base de données joignable.
+    """
+    # Création de la table si elle n'existe pas
+    Base.metadata.create_all(bind=engine)
+
+    # Ajout de la colonne equation_hash aux tables existantes et calcul de l'empreinte des anciennes lignes
+    migrate_equation_hash(engine, Polynomial, lambda row: equation_hash(row.equation, "x"))
+
+
+if __name__ == "__main__":
+    migrate()
@@ -1,15 +1,15 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from factorisation_solver import advanced_factorization
+from factorisation_solver import advanced_factorization, factorize
 
 # Cas de test 1 : Test d'une factorisation valide
 def test_advanced_factorization_valid():
     equation = "x^2 - 4"
     variable = "x"
 
-    # Simuler le stockage en base de données
-    mock_session = MagicMock()
-    with patch("factorisation_solver.SessionLocal", return_value=mock_session):
+    # Simuler la file d'écriture vers la base de données
+    mock_queue = MagicMock()
+    with patch("factorisation_solver.write_queue", mock_queue):
         result = advanced_factorization(equation, variable)
 
     assert result == "(x - 2)*(x + 2)"
@@ -30,9 +30,34 @@ def test_advanced_factorization_conversion():
     equation = "x**2 - 4"
     variable = "x"
 
-    # Simuler le stockage en base de données
-    mock_session = MagicMock()
-    with patch("factorisation_solver.SessionLocal", return_value=mock_session):
+    # Simuler la file d'écriture vers la base de données
+    mock_queue = MagicMock()
+    with patch("factorisation_solver.write_queue", mock_queue):
         result = advanced_factorization(equation, variable)
 
     assert result == "(x - 2)*(x + 2)"
+
+
+# Cas de test 4 : Facteurs structurés avec multiplicités (chemin rapide, sans SymPy)
+def test_factorize_structured():
+    mock_queue = MagicMock()
+    with patch("factorisation_solver.write_queue", mock_queue), \
+            patch("factorisation_solver.symbolic_pool") as mock_pool:
+        result = factorize("x^3 - 3x^2 + 4", "x")
+
+    assert result["factorized_result"] == "(x - 2)^2*(x + 1)"
+    assert [(f["factor"], f["multiplicity"]) for f in result["factors"]] == [("x - 2", 2), ("x + 1", 1)]
+    assert result["method"] == "fast"
+    mock_pool.run.assert_not_called()
+
+# Cas de test 5 : Une entrée en cache, même vide, n'est pas réenregistrée
+def test_factorize_cached_entry_not_persisted_again():
+    from factorisation_solver import result_cache
+    from polynome_commun.result_cache import equation_hash
+
+    result_cache.put(equation_hash("x^2 - 1", "x"), None)
+    mock_queue = MagicMock()
+    with patch("factorisation_solver.write_queue", mock_queue):
+        assert factorize("x^2 - 1", "x")["factorized_result"] == "(x - 1)*(x + 1)"
+
+    mock_queue.enqueue.assert_not_called()
@@ -1,64 +1,46 @@
 import logging
-import threading
-import time
 
-import requests
-from flask import Flask, request, jsonify, send_file
-import matplotlib.pyplot as plt
-import numpy as np
+from flask import Flask, request, jsonify, send_file, Response
 import io
+import json
+
+import numpy as np
+
+import renderer
+from image_cache import ImageCache
+from renderer import FORMATS, render, shutdown
+from polynome_commun.eureka import EurekaClient
+from polynome_commun.metrics import install, metrics
+from polynome_commun.profiler import install as install_profiler
+from polynome_commun.startup import install as install_startup
+from polynome_commun.sampler import adaptive_sample, evaluator, markers
+from polynome_commun.server import run
 
 logging.basicConfig(level=logging.INFO)
 app = Flask(__name__)
 
 # Configuration Eureka
-EUREKA_SERVER = "http://localhost:8761/eureka/apps/"
 SERVICE_NAME = "graph-service"
 SERVICE_PORT = 5004
-INSTANCE_ID = f"{SERVICE_NAME}:{SERVICE_PORT}"
-HOSTNAME = "127.0.0.1"  # Utilisation de localhost pour Eureka
 
+# Inscription Eureka : session persistante, renouvellements du bail et désinscription à l'arrêt
+eureka = EurekaClient(SERVICE_NAME, SERVICE_PORT)
 
-def register_with_eureka():
-    """
-    Fonction pour s'enregistrer auprès d'Eureka et envoyer des heartbeats périodiques.
-    """
-    while True:
-        try:
-            # URL pour enregistrer le service dans Eureka
-            url = EUREKA_SERVER + SERVICE_NAME
-            payload = {
-                "instance": {
-                    "instanceId": INSTANCE_ID,
-                    "hostName": HOSTNAME,
-                    "app": SERVICE_NAME.upper(),
-                    "ipAddr": HOSTNAME,
-                    "vipAddress": SERVICE_NAME,
-                    "status": "UP",
-                    "port": {"$": SERVICE_PORT, "@enabled": True},
-                    "dataCenterInfo": {
-                        "@class": "com.netflix.appinfo.InstanceInfo$DefaultDataCenterInfo",
-                        "name": "MyOwn"
-                    }
-                }
-            }
-            headers = {"Content-Type": "application/json"}
-            response = requests.post(url, json=payload, headers=headers)
-            if response.status_code == 204:
-                logging.info("Service registered successfully with Eureka!")
-            else:
-                logging.error(f"Failed to register with Eureka: {response.status_code}, {response.text}")
-        except Exception as e:
-            logging.error(f"Error registering with Eureka: {e}")
-
-        # Envoyer un heartbeat toutes les 30 secondes
-        time.sleep(30)
+# Cache des images déjà rendues, borné en octets
+image_cache = ImageCache()
+
+# Prometheus metrics (GET /metrics): stage durations, image cache and render pool
+install(app, "graph", caches={"image": image_cache}, queues={"render": renderer})
+
+# Opt-in slow-request profiler (POLYNOME_PROFILER=1), captures listed on GET /plot/profiles
+install_profiler(app, "graph", "/plot")
 
 
 @app.route('/plot', methods=['POST'])
 def plot_graph():
     """
     Endpoint to plot the graph of a polynomial equation.
+    Optional parameters: x_min, x_max, samples, width and height (pixels), dpi and format (png, svg, webp).
     """
     try:
         # Parse the request JSON
@@ -69,39 +51,116 @@ def plot_graph():
         if not equation:
             return jsonify({"error": "An equation must be provided."}), 400
 
-        # Convert equation to a callable function
+        x_min = float(data.get("x_min", -10))
+        x_max = float(data.get("x_max", 10))
+        samples = int(data.get("samples", 500))
+        width = int(data.get("width", 800))
+        height = int(data.get("height", 600))
+        dpi = int(data.get("dpi", 100))
+        image_format = data.get("format", "png")
+
+        if image_format not in FORMATS:
+            return jsonify({"error": f"Unsupported format, expected one of: {', '.join(FORMATS)}."}), 400
+        if not x_min < x_max or not 2 <= samples <= 20000:
+            return jsonify({"error": "Invalid range or number of samples."}), 400
+        if not (50 <= width <= 4000 and 50 <= height <= 4000 and 10 <= dpi <= 600):
+            return jsonify({"error": "Invalid image size or dpi."}), 400
+
+        # Normalize the equation so that `^` and `**` share cache entries
         equation = equation.replace("^", "**")
-        x = np.linspace(-10, 10, 500)
-        y = eval(equation)
-
-        # Plot the graph
-        plt.figure(figsize=(8, 6))
-        plt.plot(x, y, label=equation)
-        plt.axhline(0, color='black', linewidth=0.8)
-        plt.axvline(0, color='black', linewidth=0.8)
-        plt.grid(color='gray', linestyle='--', linewidth=0.5)
-        plt.legend()
-        plt.title("Polynomial Graph")
-        plt.xlabel("x")
-        plt.ylabel("f(x)")
-
-        # Save the plot to a BytesIO object
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png')
-        buf.seek(0)
-        plt.close()
+
+        # Serve repeated plots from memory, render the others in the process pool
+        key = (equation, variable, x_min, x_max, samples, width, height, dpi, image_format)
+        image = image_cache.get(key)
+        if image is None:
+            with metrics.stage("render"):
+                image = render(equation, x_min, x_max, samples, width, height, dpi, image_format, variable)
+            image_cache.put(key, image)
 
         # Return the image as a response
-        return send_file(buf, mimetype='image/png')
+        return send_file(io.BytesIO(image), mimetype=FORMATS[image_format])
 
+    except TimeoutError as e:
+        return jsonify({"error": str(e)}), 504
     except Exception as e:
         return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
 
 
-if __name__ == '__main__':
-    # Lancer le thread pour s'enregistrer auprès d'Eureka
-    threading.Thread(target=register_with_eureka, daemon=True).start()
+@app.route('/plot/points', methods=['POST'])
+def plot_points():
+    """
+    Endpoint returning the sampled curve as data for client-side rendering, with markers for the
+    real roots and local extrema. Parameters: x_min, x_max, budget (max points), tolerance and
+    format ("json", or "binary" for little-endian float32 x/y pairs with markers in a header).
+    """
+    try:
+        data = request.get_json()
+        equation = data.get("equation")
+        variable = data.get("variable", "x")
+
+        if not equation:
+            return jsonify({"error": "An equation must be provided."}), 400
+
+        x_min = float(data.get("x_min", -10))
+        x_max = float(data.get("x_max", 10))
+        budget = int(data.get("budget", 400))
+        tolerance = float(data.get("tolerance", 1e-3))
+        output_format = data.get("format", "json")
+
+        if not x_min < x_max or not 16 <= budget <= 100000:
+            return jsonify({"error": "Invalid range or point budget."}), 400
+        if output_format not in ("json", "binary"):
+            return jsonify({"error": "Unsupported format, expected json or binary."}), 400
+
+        # Curvature-adaptive sampling, then root and extremum markers for polynomials
+        with metrics.stage("parse"):
+            f, coefficients = evaluator(equation, variable)
+        with metrics.stage("sample"):
+            x, y = adaptive_sample(f, x_min, x_max, budget, tolerance)
+            plot_markers = markers(coefficients, x_min, x_max) if coefficients is not None else {"roots": [], "extrema": []}
+
+        with metrics.stage("serialize"):
+            if output_format == "binary":
+                payload = np.column_stack((x, y)).astype("<f4").tobytes()
+                response = Response(payload, mimetype="application/octet-stream")
+                response.headers["X-Plot-Count"] = str(x.size)
+                response.headers["X-Plot-Markers"] = json.dumps(plot_markers)
+                return response
+
+            return jsonify({
+                "x": x.tolist(),
+                "y": [value if np.isfinite(value) else None for value in y.tolist()],
+                "count": int(x.size),
+                **plot_markers
+            })
+
+    except Exception as e:
+        return jsonify({"error": f"Unexpected error: {str(e)}"}), 500
+
+
+@app.route('/plot/health', methods=['GET'])
+def health():
+    """
+    État du service et de son inscription dans le registre Eureka.
+    """
+    registry = eureka.health()
+    return jsonify({"status": "UP", "registry": registry}), 200
 
-    # Démarrer l'application Flask
+
+def warm_up():
+    """
+    Warm a worker up before it accepts traffic: start the render pool and draw a first image.
+    """
+    render("x", -1.0, 1.0, 2, 100, 100, 100, "png")
+    evaluator("exp(x)")
+
+
+# End of the service import: import and ready times on GET /plot/startup and in /metrics
+install_startup(app, "graph", "/plot")
+
+
+if __name__ == '__main__':
+    # Démarrer le service (POLYNOME_SERVER_MODE=prod : workers pré-forkés), puis s'enregistrer auprès
+    # d'Eureka une fois les workers préchauffés (renouvellements en arrière-plan)
     logging.info(f"Démarrage du service graph sur le port {SERVICE_PORT}.")
-    app.run(host='0.0.0.0', port=SERVICE_PORT)
+    run(app, SERVICE_PORT, warmup=warm_up, drain=shutdown, on_ready=eureka.start)
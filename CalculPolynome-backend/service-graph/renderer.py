@@ -0,0 +1,125 @@
+import io
+import multiprocessing
+import os
+import sys
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+
+import numpy as np
+
+# Accès au paquet partagé polynome_commun
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from polynome_commun.sampler import evaluator
+
+# Nombre de processus de rendu (0 : rendu dans le thread de la requête)
+RENDER_WORKERS = int(os.environ.get("GRAPH_RENDER_WORKERS", os.cpu_count() or 1))
+# Délai maximal d'attente d'un rendu, en secondes
+RENDER_TIMEOUT = float(os.environ.get("GRAPH_RENDER_TIMEOUT", 30))
+
+# Formats d'image acceptés et leur type MIME
+FORMATS = {"png": "image/png", "svg": "image/svg+xml", "webp": "image/webp"}
+
+_pool = None
+_pool_lock = threading.Lock()
+# Rendus soumis au pool et pas encore terminés
+_pending = 0
+# Rendus interrompus au-delà du délai (chacun remplace le pool)
+_timeouts = 0
+
+
+def render_plot(equation, x_min, x_max, samples, width, height, dpi, image_format, variable="x"):
+    """
+    Trace le graphe d'une équation sur une figure Agg explicite (sans l'état global de pyplot)
+    et retourne les octets de l'image. Exécutée dans un processus du pool de rendu.
+    """
+    # Import différé : matplotlib ne sert que dans les processus de rendu, jamais à l'import du service
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    x = np.linspace(x_min, x_max, samples)
+    f, _ = evaluator(equation, variable)  # Analyse polynomiale rapide, SymPy pour les autres expressions
+    y = f(x)
+
+    figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    axes.plot(x, y, label=equation)
+    axes.axhline(0, color='black', linewidth=0.8)
+    axes.axvline(0, color='black', linewidth=0.8)
+    axes.grid(color='gray', linestyle='--', linewidth=0.5)
+    axes.legend()
+    axes.set_title("Polynomial Graph")
+    axes.set_xlabel("x")
+    axes.set_ylabel("f(x)")
+
+    buf = io.BytesIO()
+    figure.savefig(buf, format=image_format)
+    return buf.getvalue()
+
+
+def _warm_worker():
+    # Préchargement du moteur de rendu dans chaque processus : le premier rendu n'en paie pas le coût
+    render_plot("x", -1.0, 1.0, 2, 100, 100, 100, "png")
+
+
+def get_pool():
+    """Pool de processus de rendu, créé au premier usage."""
+    global _pool
+    with _pool_lock:
+        if _pool is None and RENDER_WORKERS > 0:
+            _pool = ProcessPoolExecutor(
+                max_workers=RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker
+            )
+        return _pool
+
+
+def render(equation, x_min, x_max, samples, width, height, dpi, image_format, variable="x"):
+    """Rend l'image dans le pool de processus (ou directement si le pool est désactivé)."""
+    pool = get_pool()
+    args = (equation, x_min, x_max, samples, width, height, dpi, image_format, variable)
+    if pool is None:
+        return render_plot(*args)
+    global _pending
+    with _pool_lock:
+        _pending += 1
+    try:
+        return pool.submit(render_plot, *args).result(timeout=RENDER_TIMEOUT)
+    except TimeoutError:
+        _replace(pool)
+        logging.warning(f"Rendu interrompu après {RENDER_TIMEOUT} s : {equation}")
+        raise TimeoutError(f"Rendering exceeded the {RENDER_TIMEOUT} s time limit.")
+    finally:
+        with _pool_lock:
+            _pending -= 1
+
+
+def _replace(pool):
+    # Un rendu en cours ne peut pas être annulé : les processus du pool sont tués, et le prochain
+    # rendu crée un nouveau pool (les autres rendus en cours sur l'ancien échouent)
+    global _pool, _timeouts
+    with _pool_lock:
+        _timeouts += 1
+        if _pool is pool:
+            _pool = None
+    for process in list((pool._processes or {}).values()):
+        process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def stats():
+    """Occupation du pool de rendu : rendus en attente d'un processus libre, rendus en cours et interrompus."""
+    with _pool_lock:
+        in_flight = min(_pending, RENDER_WORKERS)
+        return {"workers": RENDER_WORKERS, "in_flight": in_flight, "waiting": _pending - in_flight,
+                "timeouts": _timeouts}
+
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
@@ -0,0 +1,74 @@
+import signal
+
+import numpy as np
+import pytest
+
+import renderer
+from image_cache import ImageCache
+from renderer import render_plot
+from polynome_commun.sampler import adaptive_sample, evaluator, markers
+
+# Cas de test 1 : Rendu PNG et SVG sur une figure explicite
+def test_render_plot_formats():
+    png = render_plot("x**2 - 4", -10.0, 10.0, 200, 400, 300, 100, "png")
+    svg = render_plot("x**2 - 4", -10.0, 10.0, 200, 400, 300, 100, "svg")
+
+    assert png.startswith(b"\x89PNG")
+    assert b"<svg" in svg
+
+# Cas de test 2 : Une équation constante est tracée comme une droite
+def test_render_plot_constant():
+    assert render_plot("5", -1.0, 1.0, 10, 200, 200, 100, "png").startswith(b"\x89PNG")
+
+# Cas de test 3 : Le cache est borné en octets
+def test_image_cache_byte_budget():
+    cache = ImageCache(max_bytes=10)
+
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.get("a")
+    cache.put("c", b"123")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"12345"
+    assert cache.stats()["bytes"] == 8
+    assert cache.stats()["evictions"] == 1
+
+# Cas de test 4 : L'échantillonnage adaptatif concentre les points dans les zones courbées
+def test_adaptive_sample_concentrates_points():
+    f, _ = evaluator("abs(x - 0.3)")
+    x, y = adaptive_sample(f, -10.0, 10.0, budget=64, tolerance=1e-6)
+
+    assert x.size <= 64
+    assert np.all(np.diff(x) > 0)
+    spacing_near_kink = np.diff(x)[np.argmin(np.abs(x[:-1] - 0.3))]
+    assert spacing_near_kink < np.diff(x).max() / 4
+
+# Cas de test 5 : Marqueurs des racines réelles et des extrema
+def test_markers_roots_and_extrema():
+    _, coefficients = evaluator("x^3 - 3*x")
+    result = markers(coefficients, -10.0, 10.0)
+
+    assert [round(root["x"], 6) for root in result["roots"]] == [-1.732051, 0.0, 1.732051]
+    assert [(round(point["x"], 6), point["kind"]) for point in result["extrema"]] == [(-1.0, "max"), (1.0, "min")]
+
+# Cas de test 6 : Un rendu hors délai tue les processus du pool, qui est recréé pour le rendu suivant
+def test_render_timeout_replaces_pool(monkeypatch):
+    monkeypatch.setattr(renderer, "RENDER_WORKERS", 1)
+    monkeypatch.setattr(renderer, "RENDER_TIMEOUT", 0.01)  # Le démarrage du processus dépasse déjà ce délai
+    pool = renderer.get_pool()
+    replace, processes = renderer._replace, []
+    monkeypatch.setattr(renderer, "_replace", lambda pool: processes.extend(pool._processes.values()) or replace(pool))
+    try:
+        with pytest.raises(TimeoutError):
+            renderer.render("x", -1.0, 1.0, 50, 100, 100, 100, "png")
+        for process in processes:
+            process.join(timeout=10)
+        assert processes and all(process.exitcode == -signal.SIGKILL for process in processes)
+        assert renderer._pool is None and renderer.stats()["timeouts"] == 1
+
+        monkeypatch.setattr(renderer, "RENDER_TIMEOUT", 60)
+        assert renderer.render("x", -1.0, 1.0, 50, 100, 100, 100, "png").startswith(b"\x89PNG")
+        assert renderer.get_pool() is not pool
+    finally:
+        renderer.shutdown()
@@ -1,9 +1,15 @@
 from flask import Flask, request, jsonify
-from newton_solver import newton_method
-from models import SessionLocal, NewtonResult
-import requests
-import threading
-import time
+from newton_solver import newton_method, newton_multi_method, newton_isolate_method
+from models import SessionLocal, engine, migrate, write_queue, NewtonResult
+from polynome_commun.admission import AdmissionRejected, admission
+from polynome_commun.eureka import EurekaClient
+from polynome_commun.expression_cache import expression_cache, parse_expression
+from polynome_commun.metrics import install, metrics
+from polynome_commun.profiler import install as install_profiler
+from polynome_commun.startup import install as install_startup
+from polynome_commun.server import run, warm_database
+from polynome_commun.solver_log import solver_log
+from polynome_commun.result_cache import ResultCache, equation_hash
 import logging
 
 # Initialisation des logs
@@ -13,47 +19,32 @@ logging.basicConfig(level=logging.INFO)
 app = Flask(__name__)
 
 # Configuration Eureka
-EUREKA_SERVER = "http://localhost:8761/eureka/apps/"
 SERVICE_NAME = "newton-service"
 SERVICE_PORT = 5001
-INSTANCE_ID = f"{SERVICE_NAME}:{SERVICE_PORT}"
-HOSTNAME = "127.0.0.1"  # Utilisation de localhost pour Eureka
 
+# Inscription Eureka : session persistante, renouvellements du bail et désinscription à l'arrêt
+eureka = EurekaClient(SERVICE_NAME, SERVICE_PORT)
 
-def register_with_eureka():
-    """
-    Fonction pour s'enregistrer auprès d'Eureka et envoyer des heartbeats périodiques.
-    """
-    while True:
-        try:
-            # URL pour enregistrer le service dans Eureka
-            url = EUREKA_SERVER + SERVICE_NAME
-            payload = {
-                "instance": {
-                    "instanceId": INSTANCE_ID,
-                    "hostName": HOSTNAME,
-                    "app": SERVICE_NAME.upper(),
-                    "ipAddr": HOSTNAME,
-                    "vipAddress": SERVICE_NAME,
-                    "status": "UP",
-                    "port": {"$": SERVICE_PORT, "@enabled": True},
-                    "dataCenterInfo": {
-                        "@class": "com.netflix.appinfo.InstanceInfo$DefaultDataCenterInfo",
-                        "name": "MyOwn"
-                    }
-                }
-            }
-            headers = {"Content-Type": "application/json"}
-            response = requests.post(url, json=payload, headers=headers)
-            if response.status_code == 204:
-                logging.info("Service registered successfully with Eureka!")
-            else:
-                logging.error(f"Failed to register with Eureka: {response.status_code}, {response.text}")
-        except Exception as e:
-            logging.error(f"Error registering with Eureka: {e}")
+# Résultats déjà calculés : mémoire puis table `newton_results` (recherche par empreinte).
+# Seul le mode à estimation unique est relu en base : une ligne suffit à reconstruire sa réponse.
+result_cache = ResultCache(
+    SessionLocal,
+    NewtonResult,
+    lambda row: {"solution": row.solution, "iterations": row.iterations, "success": row.success == "True"},
+    name="newton"
+)
 
-        # Envoyer un heartbeat toutes les 30 secondes
-        time.sleep(30)
+# Nombre maximal de départs d'une requête multi-départs (liste d'estimations ou `num_seeds`)
+MAX_STARTS = 1024
+
+# Métriques Prometheus (GET /metrics) : durées par étape, caches, files et voies d'admission
+install(app, "newton",
+        caches={"expression": expression_cache, "result": result_cache},
+        queues={"write_behind": write_queue, "admission_fast": admission.fast, "admission_slow": admission.slow,
+                "solver_log": solver_log})
+
+# Profilage des requêtes lentes sur demande (POLYNOME_PROFILER=1), captures listées sur GET /newton/profiles
+install_profiler(app, "newton", "/newton")
 
 
 @app.route('/newton', methods=['POST'])
@@ -67,7 +58,8 @@ def solve_with_newton():
 
         equation = data.get("equation")  # Récupération de l'équation
         variable = data.get("variable", "x")  # Nom de la variable (par défaut : 'x')
-        initial_guess = data.get("initial_guess", 0)  # Estimation initiale
+        initial_guess = data.get("initial_guess", 0)  # Estimation initiale (nombre, liste ou "auto")
+        mode = data.get("mode", "newton")  # "isolate" : toutes les racines réelles, sans estimation initiale
         tolerance = data.get("tolerance", 1e-7)  # Tolérance pour la convergence
         max_iterations = data.get("max_iterations", 100)  # Nombre maximum d'itérations
 
@@ -78,26 +70,79 @@ def solve_with_newton():
                 "success": False
             }), 400
 
-        # Appel de la méthode de Newton
-        result = newton_method(equation, variable, float(initial_guess), float(tolerance), int(max_iterations))
-
-        # Enregistrement du résultat dans la base de données
-        session = SessionLocal()
-        try:
-            newton_result = NewtonResult(
-                equation=equation,
-                solution=result["solution"],
-                iterations=result["iterations"],
-                success="True" if result["success"] else "False"
-            )
-            session.add(newton_result)  # Ajout du résultat à la session
-            session.commit()  # Validation de la transaction
-        finally:
-            session.close()
+        # Une liste d'estimations (ou "auto" pour une grille automatique) active le mode multi-départs
+        # et le mode "isolate" remplace les estimations par l'isolation des racines réelles
+        isolate = mode == "isolate"
+        multi_start = not isolate and (isinstance(initial_guess, list) or initial_guess == "auto")
+        if isolate:
+            key = equation_hash(equation, variable, mode=mode, tolerance=float(tolerance),
+                                max_iterations=int(max_iterations))
+        elif multi_start:
+            num_seeds = int(data.get("num_seeds", 16))
+            # Nombre de départs borné avant toute allocation (matrice des voies de Newton)
+            if not 1 <= (num_seeds if initial_guess == "auto" else len(initial_guess)) <= MAX_STARTS:
+                return jsonify({
+                    "error": f"Le nombre d'estimations initiales doit être compris entre 1 et {MAX_STARTS}.",
+                    "success": False
+                }), 400
+            guesses = None if initial_guess == "auto" else [float(guess) for guess in initial_guess]
+            key = equation_hash(equation, variable, initial_guess=guesses, tolerance=float(tolerance),
+                                max_iterations=int(max_iterations), num_seeds=num_seeds)
+        else:
+            key = equation_hash(equation, variable, initial_guess=float(initial_guess), tolerance=float(tolerance),
+                                max_iterations=int(max_iterations))
+
+        # Le calcul n'a lieu que si le résultat n'est pas déjà connu
+        cached = result_cache.get(key, database=not (multi_start or isolate))
+        if cached is not None:
+            return jsonify(cached), 200
+
+        # Admission selon le coût estimé (voie rapide ou lente)
+        with admission.admit(equation, variable, "newton"):
+            # Variantes journalisées sous leur propre nom : leur coût n'est pas celui d'un départ unique
+            if isolate:
+                with solver_log.timed("NewtonIsolation", equation, variable) as execution:
+                    result = newton_isolate_method(equation, variable, float(tolerance), int(max_iterations))
+                    execution.update(converged=all(root["converged"] for root in result["roots"]),
+                                     iterations=max((root["iterations"] for root in result["roots"]), default=0))
+                found = result["roots"]
+            elif multi_start:
+                with solver_log.timed("NewtonMultiStart", equation, variable) as execution:
+                    result = newton_multi_method(equation, variable, guesses, float(tolerance), int(max_iterations),
+                                                 num_seeds)
+                    execution.update(converged=any(lane["converged"] for lane in result["lanes"]),
+                                     iterations=max(lane["iterations"] for lane in result["lanes"]))
+                found = result["roots"]
+            else:
+                # Appel de la méthode de Newton, durée et issue journalisées pour le modèle de coût
+                with solver_log.timed("Newton", equation, variable) as execution:
+                    result = newton_method(equation, variable, float(initial_guess), float(tolerance),
+                                           int(max_iterations))
+                    execution.update(converged=True, iterations=result["iterations"])
+                found = [result]
+        with metrics.stage("persist"):
+            result_cache.put(key, result)
+
+            # Enregistrement différé du résultat dans la base de données (une ligne par racine trouvée)
+            write_queue.enqueue_many(NewtonResult, [
+                {
+                    "equation": equation,
+                    "solution": root["solution"],
+                    "iterations": root["iterations"],
+                    "success": "True" if result["success"] else "False",
+                    "equation_hash": key
+                }
+                for root in found
+            ])
 
         # Retourner le résultat au client
-        return jsonify(result), 200
+        with metrics.stage("serialize"):
+            response = jsonify(result)
+        return response, 200
 
+    except AdmissionRejected as e:
+        # Voie lente saturée : le client réessaie après le délai indiqué
+        return jsonify(e.to_dict()), 429, {"Retry-After": str(e.retry_after)}
     except Exception as e:
         logging.error(f"Erreur dans solve_with_newton : {str(e)}")
         # En cas d'erreur
@@ -107,10 +152,46 @@ def solve_with_newton():
         }), 500
 
 
-if __name__ == '__main__':
-    # Lancer le thread pour s'enregistrer auprès d'Eureka
-    threading.Thread(target=register_with_eureka, daemon=True).start()
+@app.route('/newton/admission', methods=['GET'])
+def admission_stats():
+    """
+    Statistiques d'admission : état des voies, temps d'attente et coût estimé / réel des requêtes récentes.
+    """
+    return jsonify(admission.stats()), 200
 
-    # Démarrer l'application Flask
+
+@app.route('/newton/health', methods=['GET'])
+def health():
+    """
+    État du service et de son inscription dans le registre Eureka.
+    """
+    registry = eureka.health()
+    return jsonify({"status": "UP", "registry": registry}), 200
+
+
+def warm_up():
+    """
+    Préchauffage d'un worker avant d'accepter du trafic : connexions à la base, SymPy et moteur de Newton.
+    """
+    warm_database(engine)
+    parse_expression("exp(x) - 2").f_prime
+    newton_method("x^2 - 4", "x", 1.0)
+
+
+def drain():
+    """
+    Arrêt d'un worker : écritures en attente puis journal des exécutions.
+    """
+    write_queue.close()
+    solver_log.close()
+
+
+# Fin de l'import du service : temps d'import et de démarrage sur GET /newton/startup et dans /metrics
+install_startup(app, "newton", "/newton")
+
+
+if __name__ == '__main__':
+    # Démarrer le service (POLYNOME_SERVER_MODE=prod : workers pré-forkés), puis s'enregistrer auprès
+    # d'Eureka une fois les workers préchauffés (renouvellements en arrière-plan)
     logging.info("Démarrage du service Newton sur le port 5001.")
-    app.run(host='0.0.0.0', port=SERVICE_PORT)
+    run(app, SERVICE_PORT, warmup=warm_up, drain=drain, migrate=migrate, on_ready=eureka.start)
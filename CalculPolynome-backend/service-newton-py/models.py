@@ -1,7 +1,15 @@
+import os
+import sys
+
 from sqlalchemy import Column, Integer, String, Float, create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+# Accès au paquet partagé polynome_commun
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from polynome_commun.persistence import WriteBehindQueue
+from polynome_commun.result_cache import migrate_equation_hash
+
 # Définition de la base pour la déclaration des modèles
 Base = declarative_base()
 
@@ -14,13 +22,34 @@ class NewtonResult(Base):
     solution = Column(Float, nullable=False)  # La solution trouvée par la méthode de Newton
     iterations = Column(Integer, nullable=False)  # Nombre d'itérations effectuées
     success = Column(String(255), nullable=False)  # Indicateur de succès ou d'échec
+    equation_hash = Column(String(64), index=True)  # Empreinte de l'équation canonique et des paramètres
 
 # Configuration de la base de données
-DATABASE_URL = "mysql+mysqlconnector://root@localhost:3306/newton_resolution_db"  # URL de connexion à la base de données
-engine = create_engine(DATABASE_URL, echo=True)  # `echo=True` pour afficher les requêtes SQL exécutées
-
-# Création automatique des tables
-Base.metadata.create_all(bind=engine)
+# URL remplaçable par POLYNOME_DATABASE_URL (ex. SQLite pour les bancs d'essai et tests de charge)
+DATABASE_URL = os.environ.get("POLYNOME_DATABASE_URL", "mysql+mysqlconnector://root@localhost:3306/newton_resolution_db")  # URL de connexion à la base de données
+# Aucune connexion ni requête à l'import : le schéma est créé par l'étape de migration (migrate)
+# Requêtes SQL affichées dans la console avec POLYNOME_SQL_ECHO=1
+engine = create_engine(DATABASE_URL, echo=os.environ.get("POLYNOME_SQL_ECHO", "0") == "1")
 
 # Configuration de la session pour interagir avec la base
 SessionLocal = sessionmaker(bind=engine)
+
+# File d'écriture différée : les résultats sont insérés par lots en arrière-plan
+write_queue = WriteBehindQueue(SessionLocal, Base.metadata, name="newton")
+
+
+def migrate():
+    """
+    Migration du schéma, étape séparée du démarrage (python models.py, ou POLYNOME_MIGRATE_ON_START=1) :
+    le service s'importe sans base de données joignable.
+    """
+    # Création des tables
+    Base.metadata.create_all(bind=engine)
+
+    # Ajout de la colonne equation_hash aux tables existantes (les anciennes lignes ne conservent pas
+    # l'estimation initiale ni la tolérance : elles ne peuvent pas être indexées et restent sans empreinte)
+    migrate_equation_hash(engine, NewtonResult)
+
+
+if __name__ == "__main__":
+    migrate()
@@ -1,45 +1,143 @@
-from sympy import symbols, diff, lambdify, sympify
+import os
+import sys
+
+# Accès au paquet partagé polynome_commun
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from polynome_commun.expression_cache import parse_expression
+from polynome_commun.metrics import metrics
+from polynome_commun.newton_engine import default_seeds, distinct_roots, newton_multi_start
+from polynome_commun.polynomial_parser import PolynomialSyntaxError, coefficient_array, parse_terms
+from polynome_commun.root_isolation import isolate_real_roots, refine_roots
 
 # Fonction pour résoudre une équation avec la méthode de Newton
 def newton_method(equation, variable, initial_guess, tolerance=1e-7, max_iterations=100):
     try:
-        # Remplacer ^ par ** pour compatibilité avec SymPy
-        equation = equation.replace("^", "**")
-        x = symbols(variable)  # Définir la variable symbolique
-        equation = sympify(equation)  # Convertir l'équation en objet SymPy
-
-        # Calcul de la dérivée de l'équation
-        derivative = diff(equation, x)
-
-        # Conversion de l'équation et de la dérivée en fonctions Python évaluables
-        f = lambdify(x, equation)  # Fonction f(x)
-        f_prime = lambdify(x, derivative)  # Fonction f'(x)
-
-        # Initialisation de la méthode de Newton
-        current_guess = initial_guess
-        for iteration in range(max_iterations):
-            # Calcul de la valeur de la fonction et de sa dérivée au point actuel
-            f_value = f(current_guess)
-            f_prime_value = f_prime(current_guess)
-
-            # Éviter la division par zéro
-            if abs(f_prime_value) < 1e-12:
+        # Polynôme à coefficients numériques : moteur de Horner sur le tableau de coefficients
+        with metrics.stage("parse"):
+            coefficients = coefficient_array(equation, variable)
+        if coefficients is not None:
+            with metrics.stage("solve"):
+                lanes = newton_multi_start(coefficients, [initial_guess], tolerance, max_iterations)
+            if lanes["stalled"][0]:
                 raise ValueError("La dérivée est proche de zéro, la méthode de Newton ne peut pas continuer.")
+            if not lanes["converged"][0]:
+                raise ValueError("La méthode de Newton n'a pas convergé après le nombre maximum d'itérations.")
+            return {
+                "solution": round(float(lanes["solutions"][0]), 2),  # La solution arrondie à 2 décimales
+                "iterations": int(lanes["iterations"][0]),  # Nombre d'itérations effectuées
+                "success": True  # Indicateur de succès
+            }
+
+        # Autres expressions : analyse SymPy (via le cache partagé : sympify, dérivée et lambdify une seule fois)
+        with metrics.stage("parse"):
+            parsed = parse_expression(equation, variable)
+            f = parsed.f
+            f_prime = parsed.f_prime
+
+        with metrics.stage("solve"):
+            # Initialisation de la méthode de Newton
+            current_guess = initial_guess
+            for iteration in range(max_iterations):
+                # Calcul de la valeur de la fonction et de sa dérivée au point actuel
+                f_value = f(current_guess)
+                f_prime_value = f_prime(current_guess)
+
+                # Éviter la division par zéro
+                if abs(f_prime_value) < 1e-12:
+                    raise ValueError("La dérivée est proche de zéro, la méthode de Newton ne peut pas continuer.")
+
+                # Calcul de la prochaine estimation
+                next_guess = current_guess - f_value / f_prime_value
+
+                # Vérification de la convergence
+                if abs(next_guess - current_guess) < tolerance:
+                    return {
+                        "solution": round(next_guess, 2),  # La solution arrondie à 2 décimales
+                        "iterations": iteration + 1,  # Nombre d'itérations effectuées
+                        "success": True  # Indicateur de succès
+                    }
 
-            # Calcul de la prochaine estimation
-            next_guess = current_guess - f_value / f_prime_value
+                current_guess = next_guess  # Mise à jour de l'estimation
 
-            # Vérification de la convergence
-            if abs(next_guess - current_guess) < tolerance:
-                return {
-                    "solution": round(next_guess, 2),  # La solution arrondie à 2 décimales
-                    "iterations": iteration + 1,  # Nombre d'itérations effectuées
-                    "success": True  # Indicateur de succès
+            # Si la méthode n'a pas convergé
+            raise ValueError("La méthode de Newton n'a pas convergé après le nombre maximum d'itérations.")
+    except Exception as e:
+        raise ValueError(f"Erreur lors de la résolution par Newton : {e}")
+
+
+# Méthode de Newton à départs multiples : toutes les estimations sont itérées ensemble
+def newton_multi_method(equation, variable, initial_guesses=None, tolerance=1e-7, max_iterations=100, num_seeds=16):
+    try:
+        with metrics.stage("parse"):
+            coefficients = coefficient_array(equation, variable)
+        if coefficients is None:
+            raise ValueError("Le mode multi-départs n'accepte que des polynômes à coefficients numériques.")
+
+        # Sans estimations fournies, grille automatique sur la borne de Cauchy des racines
+        if initial_guesses is None:
+            initial_guesses = default_seeds(coefficients, num_seeds)
+
+        with metrics.stage("solve"):
+            lanes = newton_multi_start(coefficients, initial_guesses, tolerance, max_iterations)
+            roots = distinct_roots(lanes["solutions"], lanes["converged"], tolerance)
+        if not roots:
+            raise ValueError("La méthode de Newton n'a convergé depuis aucune des estimations initiales.")
+
+        return {
+            "roots": [
+                {
+                    "solution": round(solution, 2),
+                    "iterations": int(lanes["iterations"][group].min())  # Voie la plus rapide vers cette racine
                 }
+                for solution, group in roots
+            ],
+            "lanes": [
+                {
+                    "initial_guess": float(guess),
+                    "solution": round(float(solution), 2) if converged else None,
+                    "iterations": int(iterations),
+                    "converged": bool(converged)
+                }
+                for guess, solution, iterations, converged in zip(
+                    initial_guesses, lanes["solutions"], lanes["iterations"], lanes["converged"]
+                )
+            ],
+            "success": True
+        }
+    except Exception as e:
+        raise ValueError(f"Erreur lors de la résolution par Newton : {e}")
+
 
-            current_guess = next_guess  # Mise à jour de l'estimation
+# Isolation de toutes les racines réelles puis affinage : aucune estimation initiale n'est nécessaire
+def newton_isolate_method(equation, variable, tolerance=1e-7, max_iterations=100):
+    try:
+        with metrics.stage("parse"):
+            try:
+                terms = parse_terms(equation, variable)
+            except PolynomialSyntaxError:
+                raise ValueError("Le mode isolation n'accepte que des polynômes à coefficients numériques.")
 
-        # Si la méthode n'a pas convergé
-        raise ValueError("La méthode de Newton n'a pas convergé après le nombre maximum d'itérations.")
+        with metrics.stage("solve"):
+            # Intervalles disjoints exacts (suites de Descartes), puis Newton sécurisé par bisection
+            intervals, square_free = isolate_real_roots(terms)
+            lanes = refine_roots(square_free, intervals, tolerance, max_iterations)
+
+        return {
+            "roots": [
+                {
+                    "solution": float(solution),  # Précision fixée par la tolérance, sans arrondi
+                    "interval": [float(lower), float(upper)],  # Encadrement final de la racine
+                    "multiplicity": multiplicity,
+                    "iterations": int(iterations),
+                    "converged": bool(converged)
+                }
+                for (_, _, multiplicity), solution, lower, upper, iterations, converged in zip(
+                    intervals, lanes["solutions"], lanes["lower"], lanes["upper"], lanes["iterations"],
+                    lanes["converged"]
+                )
+            ],
+            "tolerance": tolerance,
+            "success": True
+        }
     except Exception as e:
         raise ValueError(f"Erreur lors de la résolution par Newton : {e}")
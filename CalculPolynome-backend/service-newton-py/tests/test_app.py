@@ -0,0 +1,18 @@
+from unittest.mock import MagicMock, patch
+
+from app import MAX_STARTS, app
+
+
+# Cas de test 1 : Le nombre de départs du mode multi-départs est borné (400 au-delà)
+def test_multi_start_limit():
+    client = app.test_client()
+
+    too_many_seeds = client.post("/newton", json={"equation": "x^2 - 4", "initial_guess": "auto", "num_seeds": 10 ** 8})
+    too_many_guesses = client.post("/newton", json={"equation": "x^2 - 4", "initial_guess": [1.0] * (MAX_STARTS + 1)})
+    assert too_many_seeds.status_code == 400 and too_many_guesses.status_code == 400
+    assert str(MAX_STARTS) in too_many_seeds.get_json()["error"]
+
+    with patch("app.write_queue", MagicMock()):
+        accepted = client.post("/newton", json={"equation": "x^2 - 4", "initial_guess": [-3.0, 3.0]})
+    assert accepted.status_code == 200
+    assert sorted(root["solution"] for root in accepted.get_json()["roots"]) == [-2.0, 2.0]
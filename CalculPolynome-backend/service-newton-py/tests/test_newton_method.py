@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import MagicMock, patch
-from newton_solver import newton_method
+from newton_solver import newton_method, newton_multi_method, newton_isolate_method
 from models import SessionLocal, NewtonResult
 
 # Cas de test 1 : Test avec une équation valide
@@ -40,3 +40,41 @@ def test_newton_method_derivative_zero():
     # Vérifier que le bon message d'erreur est retourné
     assert "La dérivée est proche de zéro" in str(exc_info.value)
 
+# Cas de test 4 : Multi-départs avec une liste d'estimations initiales
+def test_newton_multi_method_guesses():
+    equation = "x^3 - 6*x^2 + 11*x - 6"
+    variable = "x"
+
+    result = newton_multi_method(equation, variable, [0.0, 1.6, 5.0, 0.5])
+
+    assert result["success"] is True
+    assert [root["solution"] for root in result["roots"]] == [1.0, 2.0, 3.0]
+    assert len(result["lanes"]) == 4
+    assert all(lane["converged"] for lane in result["lanes"])
+
+# Cas de test 5 : Multi-départs avec grille automatique, les voies bloquées sont ignorées
+def test_newton_multi_method_auto_seeds():
+    equation = "x^2 - 4"
+    variable = "x"
+
+    result = newton_multi_method(equation, variable, None, num_seeds=9)
+
+    assert [root["solution"] for root in result["roots"]] == [-2.0, 2.0]
+    # La voie partant de 0 a une dérivée nulle et ne converge pas
+    assert not all(lane["converged"] for lane in result["lanes"])
+
+
+# Cas de test 6 : Isolation de toutes les racines réelles, sans estimation initiale
+def test_newton_isolate_method():
+    result = newton_isolate_method("x^3 - 2x^2 - x + 2", "x", 1e-10)
+
+    assert result["success"] is True
+    assert [root["solution"] for root in result["roots"]] == pytest.approx([-1.0, 1.0, 2.0], abs=1e-10)
+    assert all(root["converged"] for root in result["roots"])
+
+    # x^3 : la dérivée s'annule en la racine, l'isolation la donne avec sa multiplicité
+    assert [(root["solution"], root["multiplicity"]) for root in newton_isolate_method("x^3", "x")["roots"]] == [(0.0, 3)]
+
+    irrational = newton_isolate_method("x^2 - 2", "x", 1e-12)["roots"]
+    assert [root["solution"] for root in irrational] == pytest.approx([-2 ** 0.5, 2 ** 0.5], abs=1e-12)
+    assert all(root["interval"][0] <= root["solution"] <= root["interval"][1] for root in irrational)
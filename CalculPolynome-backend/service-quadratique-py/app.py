@@ -1,8 +1,12 @@
 from flask import Flask, request, jsonify
-from quadratique_solver import resolution_quadratique
-import requests
-import threading
-import time
+from quadratique_solver import resolution_quadratique, resolution_quadratique_batch
+from models import engine, migrate, write_queue
+from polynome_commun.eureka import EurekaClient
+from polynome_commun.metrics import install, metrics
+from polynome_commun.profiler import install as install_profiler
+from polynome_commun.startup import install as install_startup
+from polynome_commun.server import run, warm_database
+from polynome_commun.solver_log import solver_log
 import logging
 
 # Configuration des logs
@@ -12,47 +16,20 @@ logging.basicConfig(level=logging.INFO)
 app = Flask(__name__)
 
 # Configuration Eureka
-EUREKA_SERVER = "http://localhost:8761/eureka/apps/"
 SERVICE_NAME = "quadratic-service"
 SERVICE_PORT = 5003
-INSTANCE_ID = f"{SERVICE_NAME}:{SERVICE_PORT}"
-HOSTNAME = "127.0.0.1"  # Utilisation de localhost pour Eureka
 
+# Inscription Eureka : session persistante, renouvellements du bail et désinscription à l'arrêt
+eureka = EurekaClient(SERVICE_NAME, SERVICE_PORT)
 
-def register_with_eureka():
-    """
-    Fonction pour s'enregistrer auprès d'Eureka et envoyer des heartbeats périodiques.
-    """
-    while True:
-        try:
-            # URL pour enregistrer le service dans Eureka
-            url = EUREKA_SERVER + SERVICE_NAME
-            payload = {
-                "instance": {
-                    "instanceId": INSTANCE_ID,
-                    "hostName": HOSTNAME,
-                    "app": SERVICE_NAME.upper(),
-                    "ipAddr": HOSTNAME,
-                    "vipAddress": SERVICE_NAME,
-                    "status": "UP",
-                    "port": {"$": SERVICE_PORT, "@enabled": True},
-                    "dataCenterInfo": {
-                        "@class": "com.netflix.appinfo.InstanceInfo$DefaultDataCenterInfo",
-                        "name": "MyOwn"
-                    }
-                }
-            }
-            headers = {"Content-Type": "application/json"}
-            response = requests.post(url, json=payload, headers=headers)
-            if response.status_code == 204:
-                logging.info("Service registered successfully with Eureka!")
-            else:
-                logging.error(f"Failed to register with Eureka: {response.status_code}, {response.text}")
-        except Exception as e:
-            logging.error(f"Error registering with Eureka: {e}")
-
-        # Envoyer un heartbeat toutes les 30 secondes
-        time.sleep(30)
+# Métriques Prometheus (GET /metrics) : durées par étape, file d'écriture et journal des exécutions
+install(app, "quadratique", queues={"write_behind": write_queue, "solver_log": solver_log})
+
+# Profilage des requêtes lentes sur demande (POLYNOME_PROFILER=1), captures listées sur GET /quadratique/profiles
+install_profiler(app, "quadratique", "/quadratique")
+
+# Nombre maximal d'équations par lot
+MAX_BATCH = 10000
 
 
 @app.route('/quadratique', methods=['POST'])
@@ -70,15 +47,54 @@ def resolve_quadratic():
                 "success": False
             }), 400
 
-        # Appel à la fonction de résolution
-        result = resolution_quadratique(float(a), float(b), float(c))
+        # Appel à la fonction de résolution (les solutions sont déjà arrondies à deux décimales),
+        # durée et issue journalisées pour le modèle de coût de la recommandation
+        with solver_log.timed("Quadratique", coefficients=[float(a), float(b), float(c)]):
+            result = resolution_quadratique(float(a), float(b), float(c))
+
+        with metrics.stage("serialize"):
+            response = jsonify(result)
+        return response, 200
+
+    except Exception as e:
+        return jsonify({
+            "error": f"Erreur lors de la résolution : {e}",
+            "success": False
+        }), 500
 
-        # Arrondir les solutions à deux décimales
-        if "roots" in result:
-            result["roots"] = [round(root, 2) for root in result["roots"]]
 
-        return jsonify(result), 200
+@app.route('/quadratique/batch', methods=['POST'])
+def resolve_quadratic_batch():
+    try:
+        # Tableaux de coefficients de même longueur
+        data = request.json
+        a = data.get('a')
+        b = data.get('b')
+        c = data.get('c')
 
+        if not isinstance(a, list) or not isinstance(b, list) or not isinstance(c, list):
+            return jsonify({
+                "error": "Les paramètres 'a', 'b' et 'c' doivent être des tableaux.",
+                "success": False
+            }), 400
+        if max(len(a), len(b), len(c)) > MAX_BATCH:
+            return jsonify({
+                "error": f"Un lot ne peut pas dépasser {MAX_BATCH} équations.",
+                "success": False
+            }), 400
+
+        # Résolution vectorisée de tout le lot
+        results = resolution_quadratique_batch(a, b, c)
+
+        with metrics.stage("serialize"):
+            response = jsonify({"results": results, "success": True})
+        return response, 200
+
+    except ValueError as e:
+        return jsonify({
+            "error": f"Erreur lors de la résolution : {e}",
+            "success": False
+        }), 400
     except Exception as e:
         return jsonify({
             "error": f"Erreur lors de la résolution : {e}",
@@ -86,10 +102,36 @@ def resolve_quadratic():
         }), 500
 
 
-if __name__ == '__main__':
-    # Lancer le thread pour s'enregistrer auprès d'Eureka
-    threading.Thread(target=register_with_eureka, daemon=True).start()
+@app.route('/quadratique/health', methods=['GET'])
+def health():
+    """
+    État du service et de son inscription dans le registre Eureka.
+    """
+    registry = eureka.health()
+    return jsonify({"status": "UP", "registry": registry}), 200
 
-    # Démarrer l'application Flask
+
+def warm_up():
+    """
+    Préchauffage d'un worker avant d'accepter du trafic : connexions à la base.
+    """
+    warm_database(engine)
+
+
+def drain():
+    """
+    Arrêt d'un worker : écritures en attente puis journal des exécutions.
+    """
+    write_queue.close()
+    solver_log.close()
+
+
+# Fin de l'import du service : temps d'import et de démarrage sur GET /quadratique/startup et dans /metrics
+install_startup(app, "quadratique", "/quadratique")
+
+
+if __name__ == '__main__':
+    # Démarrer le service (POLYNOME_SERVER_MODE=prod : workers pré-forkés), puis s'enregistrer auprès
+    # d'Eureka une fois les workers préchauffés (renouvellements en arrière-plan)
     logging.info(f"Démarrage du service Quadratique sur le port {SERVICE_PORT}.")
-    app.run(host='0.0.0.0', port=SERVICE_PORT)
+    run(app, SERVICE_PORT, warmup=warm_up, drain=drain, migrate=migrate, on_ready=eureka.start)
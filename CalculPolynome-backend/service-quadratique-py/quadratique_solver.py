@@ -1,38 +1,68 @@
-from sympy import symbols, Eq, solve
-from models import SessionLocal, QuadraticEquation
+import math
+import os
+import sys
+
+import numpy as np
+from models import write_queue, QuadraticEquation
+
+# Accès au paquet partagé polynome_commun
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from polynome_commun.metrics import metrics
+from polynome_commun.quadratic_engine import format_roots, solve_quadratic_batch
+from polynome_commun.result_cache import equation_hash
+
+
+def _format_equation(a, b, c):
+    return f"{a}x^2 + {b}x + {c} = 0"
+
+
+def _row(a, b, c, roots):
+    # L'empreinte est stockée pour les autres consommateurs de la table ; le service lui-même ne relit
+    # pas la table, la formule fermée coûtant moins cher qu'une recherche (même en mémoire)
+    equation = _format_equation(a, b, c)
+    return {
+        "a": a,
+        "b": b,
+        "c": c,
+        "equation": equation,
+        "roots": _roots_to_text(roots),
+        "equation_hash": equation_hash(equation)
+    }
+
+
+def _roots_to_text(roots):
+    # Conversion des racines en chaînes (les racines complexes sont écrites a+bj)
+    return ", ".join(
+        str(complex(root["real"], root["imag"])) if isinstance(root, dict) else str(root)
+        for root in roots
+    )
+
+
+def _check_coefficients(a, b, c):
+    # float() accepte "Infinity" et "NaN" : coefficients refusés avant la résolution
+    if not all(math.isfinite(value) for value in (a, b, c)):
+        raise ValueError("Les coefficients 'a', 'b' et 'c' doivent être des nombres finis.")
+    if a == 0:
+        raise ValueError("Ce n'est pas une équation quadratique, car a = 0.")
+
 
 def resolution_quadratique(a, b, c):
     try:
-        if a == 0:
-            raise ValueError("Ce n'est pas une équation quadratique, car a = 0.")
-
-        # Définition de la variable symbolique x
-        x = symbols('x')
-
-        # Construction de l'équation
-        equation = Eq(a * x**2 + b * x + c, 0)
-
-        # Résolution de l'équation
-        solutions = solve(equation, x)
-
-        # Formatage des solutions avec un arrondi à 2 chiffres après la virgule
-        roots = [round(float(solution), 2) for solution in solutions]
-
-        # Stockage des résultats dans la base de données
-        session = SessionLocal()
-        quadratic_equation = QuadraticEquation(
-            a=a,
-            b=b,
-            c=c,
-            equation=f"{a}x^2 + {b}x + {c} = 0",
-            roots=", ".join(map(str, roots))  # Conversion des racines en chaînes
-        )
-        session.add(quadratic_equation)
-        session.commit()
-        session.close()
+        _check_coefficients(a, b, c)
+
+        # Résolution par la formule fermée stable (racines complexes comprises)
+        with metrics.stage("solve"):
+            x1, x2, discriminant = solve_quadratic_batch([a], [b], [c])
+
+            # Formatage des solutions avec un arrondi à 2 chiffres après la virgule
+            roots = format_roots(x1[0], x2[0], discriminant[0])
+
+        # Stockage différé des résultats dans la base de données
+        with metrics.stage("persist"):
+            write_queue.enqueue(QuadraticEquation, _row(a, b, c, roots))
 
         return {
-            "equation": f"{a}x^2 + {b}x + {c} = 0",
+            "equation": _format_equation(a, b, c),
             "roots": roots,  # Liste des racines arrondies
             "success": True
         }
@@ -41,3 +71,45 @@ def resolution_quadratique(a, b, c):
             "error": f"Erreur lors de la résolution : {e}",
             "success": False
         }
+
+
+def resolution_quadratique_batch(a_values, b_values, c_values):
+    """
+    Résout un lot d'équations quadratiques en une seule passe NumPy.
+    Une équation invalide (coefficient absent ou non numérique, a = 0, coefficient infini ou NaN,
+    racine hors de la plage des flottants) produit une erreur pour cet élément sans faire échouer le lot.
+    """
+    if not len(a_values) == len(b_values) == len(c_values):
+        raise ValueError("Les tableaux 'a', 'b' et 'c' doivent avoir la même longueur.")
+
+    # Conversion élément par élément : un coefficient invalide est remplacé par NaN et signalé ensuite
+    coefficients = np.full((3, len(a_values)), np.nan)
+    invalid = set()
+    for i, values in enumerate(zip(a_values, b_values, c_values)):
+        try:
+            coefficients[:, i] = [float(value) for value in values]
+        except (TypeError, ValueError):
+            invalid.add(i)
+
+    with metrics.stage("solve"):
+        x1, x2, discriminant = solve_quadratic_batch(*coefficients)
+
+    results = []
+    rows = []
+    for i, (a, b, c) in enumerate(zip(*coefficients.tolist())):
+        try:
+            if i in invalid:
+                raise ValueError("Les coefficients 'a', 'b' et 'c' doivent être des nombres.")
+            _check_coefficients(a, b, c)
+            roots = format_roots(x1[i], x2[i], discriminant[i])
+        except ValueError as e:
+            results.append({"error": f"Erreur lors de la résolution : {e}", "success": False})
+            continue
+        results.append({"equation": _format_equation(a, b, c), "roots": roots, "success": True})
+        rows.append(_row(a, b, c, roots))
+
+    # Stockage différé du lot (insertion groupée en arrière-plan)
+    with metrics.stage("persist"):
+        write_queue.enqueue_many(QuadraticEquation, rows)
+
+    return results
@@ -0,0 +1,74 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from quadratique_solver import resolution_quadratique, resolution_quadratique_batch
+
+# Cas de test 1 : Deux racines réelles
+def test_resolution_quadratique_real_roots():
+    mock_queue = MagicMock()
+    with patch("quadratique_solver.write_queue", mock_queue):
+        result = resolution_quadratique(1.0, 0.0, -4.0)
+
+    assert result["success"] is True
+    assert result["roots"] == [-2.0, 2.0]
+    mock_queue.enqueue.assert_called_once()
+
+# Cas de test 2 : Racines complexes conjuguées
+def test_resolution_quadratique_complex_roots():
+    mock_queue = MagicMock()
+    with patch("quadratique_solver.write_queue", mock_queue):
+        result = resolution_quadratique(1.0, 2.0, 5.0)
+
+    assert result["success"] is True
+    assert result["roots"] == [{"real": -1.0, "imag": -2.0}, {"real": -1.0, "imag": 2.0}]
+
+# Cas de test 3 : a = 0 n'est pas une équation quadratique
+def test_resolution_quadratique_not_quadratic():
+    result = resolution_quadratique(0.0, 2.0, 1.0)
+
+    assert result["success"] is False
+    assert "a = 0" in result["error"]
+
+# Cas de test 4 : Lot avec un élément invalide
+def test_resolution_quadratique_batch():
+    mock_queue = MagicMock()
+    with patch("quadratique_solver.write_queue", mock_queue):
+        results = resolution_quadratique_batch([1, 0, 1], [-2, 1, 0], [1, 1, 1])
+
+    assert results[0]["roots"] == [1.0]
+    assert results[1]["success"] is False
+    assert results[2]["roots"] == [{"real": 0.0, "imag": -1.0}, {"real": 0.0, "imag": 1.0}]
+    mock_queue.enqueue_many.assert_called_once()
+
+# Cas de test 5 : Coefficients non finis ou racines hors de la plage des flottants, erreur par élément
+def test_resolution_quadratique_batch_non_finite():
+    mock_queue = MagicMock()
+    with patch("quadratique_solver.write_queue", mock_queue):
+        results = resolution_quadratique_batch([float("inf"), 1, 1, 1e-300], [1, float("nan"), -3, 1e300], [1, 1, 2, 1])
+
+    assert [result["success"] for result in results] == [False, False, True, False]
+    assert "nombres finis" in results[0]["error"] and "nombres finis" in results[1]["error"]
+    assert results[2]["roots"] == [1.0, 2.0]
+    assert len(mock_queue.enqueue_many.call_args[0][1]) == 1  # Seule l'équation résolue est stockée
+
+# Cas de test 6 : Coefficient absent ou non numérique, erreur pour cet élément uniquement
+def test_resolution_quadratique_batch_invalid_items():
+    mock_queue = MagicMock()
+    with patch("quadratique_solver.write_queue", mock_queue):
+        results = resolution_quadratique_batch([1, None, "x", [1]], [-3, 1, 1, 1], [2, 1, 1, 1])
+
+    assert [result["success"] for result in results] == [True, False, False, False]
+    assert all("doivent être des nombres" in result["error"] for result in results[1:])
+    assert results[0]["roots"] == [1.0, 2.0]
+    with pytest.raises(ValueError):
+        resolution_quadratique_batch([1, 1], [1], [1])
+
+# Cas de test 7 : Lot trop grand refusé avant toute résolution
+def test_batch_size_limit():
+    from app import MAX_BATCH, app
+
+    client = app.test_client()
+    values = [1] * (MAX_BATCH + 1)
+    response = client.post("/quadratique/batch", json={"a": values, "b": values, "c": values})
+
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
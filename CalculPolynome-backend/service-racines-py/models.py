@@ -1,7 +1,15 @@
+import os
+import sys
+
 from sqlalchemy import Column, Integer, String, Text, create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+# Accès au paquet partagé polynome_commun
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from polynome_commun.persistence import WriteBehindQueue
+from polynome_commun.result_cache import equation_hash, migrate_columns, migrate_equation_hash
+
 Base = declarative_base()
 
 # Définition de la table pour stocker les racines
@@ -11,13 +19,38 @@ class PolynomialRoots(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     equation = Column(Text, nullable=False)  # L'équation originale
     roots = Column(Text, nullable=False)  # Les racines calculées
+    equation_hash = Column(String(64), index=True)  # Empreinte de l'équation canonique et des paramètres
+    method = Column(String(16))  # Moteur utilisé : "numeric" ou "exact" (vide pour les anciennes lignes)
+    details = Column(Text)  # Racines et multiplicités du moteur numérique (JSON)
 
 # Configuration de la base de données
-DATABASE_URL = "mysql+mysqlconnector://root@localhost:3306/polynome_racine"
-engine = create_engine(DATABASE_URL, echo=True)
-
-# Création des tables
-Base.metadata.create_all(bind=engine)
+# URL remplaçable par POLYNOME_DATABASE_URL (ex. SQLite pour les bancs d'essai et tests de charge)
+DATABASE_URL = os.environ.get("POLYNOME_DATABASE_URL", "mysql+mysqlconnector://root@localhost:3306/polynome_racine")
+# Aucune connexion ni requête à l'import : le schéma est créé par l'étape de migration (migrate)
+# Requêtes SQL affichées dans la console avec POLYNOME_SQL_ECHO=1
+engine = create_engine(DATABASE_URL, echo=os.environ.get("POLYNOME_SQL_ECHO", "0") == "1")
 
 # Configuration de la session
 SessionLocal = sessionmaker(bind=engine)
+
+# File d'écriture différée : les résultats sont insérés par lots en arrière-plan
+write_queue = WriteBehindQueue(SessionLocal, Base.metadata, name="racines")
+
+
+def migrate():
+    """
+    Migration du schéma, étape séparée du démarrage (python models.py, ou POLYNOME_MIGRATE_ON_START=1) :
+    le service s'importe sans base de données joignable.
+    """
+    # Création des tables
+    Base.metadata.create_all(bind=engine)
+
+    # Ajout de la colonne equation_hash aux tables existantes et calcul de l'empreinte des anciennes lignes
+    migrate_equation_hash(engine, PolynomialRoots, lambda row: equation_hash(row.equation, "x", exact=True))
+
+    # Moteur et détail des racines, pour qu'un résultat relu en base ait la forme d'un résultat calculé
+    migrate_columns(engine, PolynomialRoots, ["method", "details"])
+
+
+if __name__ == "__main__":
+    migrate()
@@ -1,33 +1,95 @@
-from sympy import symbols, solve, simplify
-from models import SessionLocal, PolynomialRoots
+import json
+import os
+import sys
 
-def find_roots(equation, variable):
+from models import SessionLocal, write_queue, PolynomialRoots
+
+# Accès au paquet partagé polynome_commun
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from polynome_commun.admission import AdmissionRejected, admission
+from polynome_commun.metrics import metrics
+from polynome_commun.polynomial_parser import coefficient_array
+from polynome_commun.result_cache import ResultCache, equation_hash
+from polynome_commun.roots_engine import all_roots, format_root
+from polynome_commun.solver_log import solver_log
+from polynome_commun.symbolic_pool import SymbolicJobError, symbolic_pool
+
+
+def _result_from_row(row):
+    # Même forme qu'un résultat calculé ; les anciennes lignes, sans moteur enregistré, viennent de SymPy
+    method = row.method or "exact"
+    if method == "numeric" and not row.details:
+        return None  # Multiplicités absentes : recalcul
+    result = {
+        "roots": row.roots.split(", ") if row.roots else [],
+        "original_equation": row.equation,
+        "method": method,
+        "success": True
+    }
+    if method == "numeric":
+        result["details"] = json.loads(row.details)
+    return result
+
+
+# Résultats déjà calculés : mémoire puis table `polynomial_roots` (recherche par empreinte)
+result_cache = ResultCache(SessionLocal, PolynomialRoots, _result_from_row, name="racines")
+
+def find_roots(equation, variable, exact=False):
     try:
-        # Définition de la variable symbolique
-        x = symbols(variable)
+        key = equation_hash(equation, variable, exact=exact)
+        cached = result_cache.get(key)
+        if cached is not None:
+            return dict(cached, original_equation=equation)
 
-        # Simplification de l'équation
-        simplified_eq = simplify(equation)
+        # Coefficients du polynôme (analyseur rapide, SymPy hors grammaire polynomiale)
+        with metrics.stage("parse"):
+            coefficients = None if exact else coefficient_array(equation, variable)
 
-        # Calcul des racines
-        roots = solve(simplified_eq, x)
+        with metrics.stage("solve"):
+            if coefficients is not None:
+                # Moteur numérique : valeurs propres de la matrice compagnon, affinage et multiplicités
+                # (durée et issue journalisées pour le modèle de coût de la recommandation)
+                with solver_log.timed("Racines", coefficients=coefficients):
+                    roots = all_roots(coefficients)
+                rounded_roots = [format_root(root) for root, _ in roots]
+                details = [
+                    {"real": round(root.real, 2) + 0.0, "imag": round(root.imag, 2) + 0.0, "multiplicity": multiplicity}
+                    for root, multiplicity in roots
+                ]
+                method = "numeric"
+            else:
+                # Forme exacte (radicaux) demandée, ou expression non polynomiale : résolution symbolique
+                # dans le pool de processus borné par un délai
+                roots = symbolic_pool.run("solve", equation, variable)
 
-        # Arrondir les racines à 2 décimales
-        rounded_roots = [str(round(float(root), 2)) if root.is_real else str(root) for root in roots]
+                # Arrondir les racines à 2 décimales
+                rounded_roots = [str(round(float(root), 2)) if root.is_real else str(root) for root in roots]
+                details = None
+                method = "exact"
 
-        # Stockage des données dans la bd
-        session = SessionLocal()
-        polynomial = PolynomialRoots(equation=equation, roots=", ".join(rounded_roots))
-        session.add(polynomial)
-        session.commit()
-        session.close()
+        # Stockage différé des données dans la bd
+        with metrics.stage("persist"):
+            write_queue.enqueue(PolynomialRoots, {
+                "equation": equation,
+                "roots": ", ".join(rounded_roots),
+                "equation_hash": key,
+                "method": method,
+                "details": json.dumps(details) if details is not None else None
+            })
 
         # Retourner les racines
-        return {
+        result = {
             "roots": rounded_roots,
             "original_equation": equation,
+            "method": method,
             "success": True
         }
+        if details is not None:
+            result["details"] = details
+        result_cache.put(key, result)
+        return result
+    except SymbolicJobError:
+        raise
     except Exception as e:
         return {
             "error": f"Erreur lors du calcul des racines : {str(e)}",
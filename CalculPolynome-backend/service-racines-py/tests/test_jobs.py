@@ -0,0 +1,25 @@
+import io
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+from app import JobManager, _bulk_roots
+
+
+# Cas de test 1 : Une ligne invalide d'un travail NDJSON est une erreur comptée dans l'état du travail
+def test_bulk_job_counts_invalid_lines(tmp_path):
+    manager = JobManager("racines", _bulk_roots, directory=str(tmp_path), workers=2)
+    lines = [json.dumps({"equation": "x^2 - 4"}), json.dumps({"equation": "x +* 2"}), json.dumps({"variable": "x"})]
+    cache = MagicMock(get=lambda key: None)
+    with patch("polynomial_solver.write_queue", MagicMock()), patch("polynomial_solver.result_cache", cache):
+        job_id = manager.submit(io.BytesIO("\n".join(lines).encode()))["job_id"]
+        expires = time.monotonic() + 30
+        while manager.status(job_id)["status"] == "running" and time.monotonic() < expires:
+            time.sleep(0.01)
+
+    status = manager.status(job_id)
+    assert (status["status"], status["completed"], status["failed"]) == ("completed", 3, 2)
+    by_offset = {line["offset"]: line for line in map(json.loads, manager.results(job_id))}
+    assert by_offset[0]["result"]["roots"] == ["-2.0", "2.0"]
+    assert "error" in by_offset[1] and "result" not in by_offset[1]
+    assert by_offset[2]["error"] == "Aucune équation n'a été fournie."
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from polynomial_solver import _result_from_row, find_roots
+
+# Cas de test 1 : Racines réelles par le moteur numérique
+def test_find_roots_numeric_real():
+    mock_queue = MagicMock()
+    with patch("polynomial_solver.write_queue", mock_queue):
+        result = find_roots("x^2 - 4", "x")
+
+    assert result["success"] is True
+    assert result["method"] == "numeric"
+    assert result["roots"] == ["-2.0", "2.0"]
+
+# Cas de test 2 : Degré élevé avec racines complexes et multiplicité
+def test_find_roots_numeric_high_degree():
+    mock_queue = MagicMock()
+    with patch("polynomial_solver.write_queue", mock_queue):
+        result = find_roots("(x - 1)^3 * (x^2 + 1) * (x + 2)", "x")
+
+    assert result["roots"] == ["-2.0", "-1.0*I", "1.0*I", "1.0"]
+    multiplicities = {root: detail["multiplicity"] for root, detail in zip(result["roots"], result["details"])}
+    assert multiplicities["1.0"] == 3
+
+# Cas de test 3 : Forme exacte sur demande
+def test_find_roots_exact():
+    mock_queue = MagicMock()
+    with patch("polynomial_solver.write_queue", mock_queue):
+        result = find_roots("x^2 + 1", "x", exact=True)
+
+    assert result["method"] == "exact"
+    assert result["roots"] == ["-I", "I"]
+
+# Cas de test 4 : Résultat relu en base de même forme qu'un résultat calculé
+def test_result_from_row_shape():
+    mock_queue = MagicMock()
+    with patch("polynomial_solver.write_queue", mock_queue):
+        computed = find_roots("(x - 1)^2 * (x + 3)", "x")
+    stored = mock_queue.enqueue.call_args[0][1]
+    row = SimpleNamespace(id=1, **stored)
+
+    assert _result_from_row(row) == computed
+    # Ancienne ligne (SymPy, sans moteur enregistré) ; ligne numérique sans multiplicités : recalcul
+    legacy = SimpleNamespace(equation="x^2 + 1", roots="-I, I", method=None, details=None)
+    assert _result_from_row(legacy)["method"] == "exact"
+    assert _result_from_row(SimpleNamespace(equation="x", roots="0.0", method="numeric", details=None)) is None
@@ -1,67 +1,100 @@
 from flask import Flask, request, jsonify
-import joblib
 import numpy as np
-import sympy as sp
-import requests
-import threading
-import time
 import logging
+import os
+import sys
+import threading
+
+# Accès au paquet partagé polynome_commun
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from polynome_commun.polynomial_parser import coefficient_array
+from polynome_commun.eureka import EurekaClient
+from polynome_commun.metrics import install, metrics
+from polynome_commun.profiler import install as install_profiler
+from polynome_commun.startup import install as install_startup
+from polynome_commun.server import run
+from polynome_commun.solver_log import solver_log
+from cost_model import CostModel
+from features import CLASSES, build_feature_matrix, coefficient_features
+from forest import ModelUnavailableError, load_model
+from pipeline import DEFAULT_PARTS, PARTS, run_parts
+
+# Dossier du service, où sont rangés les modèles
+SERVICE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Classifieur d'origine (train_model.py) ; sa version compilée (method_classifier.forest, projetée en
+# mémoire, étiquettes incluses) est produite à côté au premier chargement si elle manque
+MODEL_PATH = os.path.join(SERVICE_DIR, "method_classifier.pkl")
+# Modèle de coût des solveurs (train_cost_model.py, entraîné sur le journal des exécutions) : s'il est
+# présent, la méthode la moins coûteuse parmi celles qui devraient réussir prime sur les règles de degré
+COST_MODEL_PATH = os.path.join(SERVICE_DIR, "solver_cost_model.json")
+
+# Modèles chargés au premier usage (préchauffage du worker ou première requête), jamais à l'import
+_models = {}
+_models_lock = threading.Lock()
+
+
+def _loaded(name, loader):
+    # Un échec de chargement est conservé lui aussi : pas de nouvelle tentative à chaque requête
+    with _models_lock:
+        if name not in _models:
+            try:
+                _models[name] = loader()
+            except ModelUnavailableError as e:
+                _models[name] = e
+        loaded = _models[name]
+    if isinstance(loaded, ModelUnavailableError):
+        raise ModelUnavailableError(str(loaded))
+    return loaded
+
+
+def get_model():
+    """Classifieur de méthode (artefact compilé, ou modèle XGBoost d'origine à défaut)."""
+    def load():
+        # Compilation vérifiée sur des polynômes de degré au plus 9 tirés une fois pour toutes
+        sample = np.random.default_rng(0).integers(-10, 11, size=(512, 10)).astype(float)
+        return load_model(MODEL_PATH, CLASSES, check=coefficient_features(sample))
+    return _loaded("classifier", load)
+
+
+def get_cost_model():
+    """Modèle de coût des solveurs, ou None s'il n'a pas été entraîné."""
+    return _loaded("cost", lambda: CostModel.load(COST_MODEL_PATH) if os.path.exists(COST_MODEL_PATH) else None)
 
-# Charger le modèle et l'encodeur
-model = joblib.load("method_classifier.pkl")
-label_encoder = joblib.load("label_encoder.pkl")
 
 # Initialiser l'application Flask
 app = Flask(__name__)
 # Configuration Eureka
-EUREKA_SERVER = "http://localhost:8761/eureka/apps/"
 SERVICE_NAME = "recommendation-service"
 SERVICE_PORT = 5006  # Port de votre service
-INSTANCE_ID = f"{SERVICE_NAME}:{SERVICE_PORT}"
-HOSTNAME = "127.0.0.1"  # Adresse IP ou hostname
 
-def register_with_eureka():
+# Inscription Eureka : session persistante, renouvellements du bail et désinscription à l'arrêt
+eureka = EurekaClient(SERVICE_NAME, SERVICE_PORT)
+
+# Métriques Prometheus (GET /metrics) : durées par étape (analyse, prédiction, sérialisation) et
+# journal des exécutions de /solve
+install(app, "recommendation", queues={"solver_log": solver_log})
+
+# Profilage des requêtes lentes sur demande (POLYNOME_PROFILER=1), captures listées sur GET /recommend/profiles
+install_profiler(app, "recommendation", "/recommend")
+
+
+def _coefficients(polynomial, variable="x"):
     """
-    Fonction pour s'enregistrer auprès d'Eureka et envoyer des heartbeats périodiques.
+    Coefficients numériques et finis du polynôme (analyseur rapide, SymPy seulement hors grammaire polynomiale).
     """
-    while True:
-        try:
-            # URL pour enregistrer le service dans Eureka
-            url = EUREKA_SERVER + SERVICE_NAME
-            payload = {
-                "instance": {
-                    "instanceId": INSTANCE_ID,
-                    "hostName": HOSTNAME,
-                    "app": SERVICE_NAME.upper(),
-                    "ipAddr": HOSTNAME,
-                    "vipAddress": SERVICE_NAME,
-                    "status": "UP",
-                    "port": {"$": SERVICE_PORT, "@enabled": True},
-                    "dataCenterInfo": {
-                        "@class": "com.netflix.appinfo.InstanceInfo$DefaultDataCenterInfo",
-                        "name": "MyOwn"
-                    }
-                }
-            }
-            headers = {"Content-Type": "application/json"}
-            response = requests.post(url, json=payload, headers=headers)
-            if response.status_code == 204:
-                logging.info("Service registered successfully with Eureka!")
-            else:
-                logging.error(f"Failed to register with Eureka: {response.status_code}, {response.text}")
-        except Exception as e:
-            logging.error(f"Error registering with Eureka: {e}")
-
-        # Envoyer un heartbeat toutes les 30 secondes
-        time.sleep(30)
+    with metrics.stage("parse"):
+        coefficients = coefficient_array(polynomial, variable)
+    if coefficients is None:
+        raise ValueError("Le polynôme doit avoir des coefficients numériques.")
+    if not np.isfinite(coefficients).all():
+        raise ValueError("Les coefficients du polynôme doivent être finis.")
+    return coefficients
 
 def parse_polynomial(polynomial):
     """
     Convertit un polynôme sous forme textuelle en une liste de coefficients et ajoute des caractéristiques supplémentaires.
     """
-    x = sp.symbols('x')
-    expr = sp.sympify(polynomial.replace("^", "**"))
-    coefficients = sp.Poly(expr, x).all_coeffs()
+    coefficients = _coefficients(polynomial).tolist()
 
     # Normaliser la liste des coefficients à une longueur de 10
     while len(coefficients) < 10:
@@ -76,6 +109,93 @@ def parse_polynomial(polynomial):
     coefficients.append(max_coefficient)
     return coefficients
 
+# Nombre maximal de polynômes par lot
+MAX_BATCH_SIZE = 10000
+
+
+def recommend_methods(polynomials):
+    """
+    Recommande une méthode pour chaque polynôme du lot, dans l'ordre.
+    Le modèle n'est appelé qu'une fois pour tout le lot ; un polynôme invalide donne une erreur
+    pour cet élément uniquement.
+    """
+    results = [None] * len(polynomials)
+    vectors, indexes = [], []
+    for i, polynomial in enumerate(polynomials):
+        try:
+            coefficients = _coefficients(polynomial)
+        except Exception as e:
+            results[i] = {"polynomial": polynomial, "error": str(e)}
+            continue
+        vectors.append(coefficients)
+        indexes.append(i)
+
+    for i, (method, explanation, cost) in zip(indexes, _recommendations(vectors)):
+        results[i] = {"polynomial": polynomials[i], "recommended_method": method, "explanation": explanation}
+        if cost is not None:
+            results[i]["predicted_cost"] = cost
+    return results
+
+
+def recommend(coefficients):
+    """
+    Recommande une méthode pour un polynôme déjà analysé.
+    Retourne (méthode, explication, coût prévu ou None).
+    """
+    return _recommendations([coefficients])[0]
+
+
+def _recommendations(vectors):
+    # Le modèle de coût prime ; à défaut, les règles sur le degré, puis le classifieur (un seul appel)
+    # pour les polynômes de degré inférieur à 2
+    choices = [None] * len(vectors)
+    cost_model = get_cost_model()
+    if cost_model is not None and vectors:
+        with metrics.stage("cost"):
+            choices = cost_model.choose(vectors)
+    to_predict = [k for k, coefficients in enumerate(vectors) if coefficients.size < 3 and choices[k] is None]
+    predictions = {}
+    if to_predict:
+        with metrics.stage("predict"):
+            predicted = get_model().predict(build_feature_matrix([vectors[k] for k in to_predict]))
+        predictions = dict(zip(to_predict, predicted))
+    return [_decision(coefficients, choices[k], predictions.get(k)) for k, coefficients in enumerate(vectors)]
+
+
+def _decision(coefficients, choice=None, predicted=None):
+    """
+    Méthode retenue pour un polynôme, avec son explication et son coût prévu (ou None) : choix du
+    modèle de coût s'il y en a un, sinon règles sur le degré, sinon étiquette prédite par le classifieur.
+    """
+    if choice is not None:
+        return choice["method"], _cost_explanation(choice), _predicted_cost(choice)
+    degree = coefficients.size - 1
+    if degree == 2:
+        return "Quadratique", "Le polynôme est de degré 2, donc la méthode Quadratique est directement recommandée.", None
+    if degree > 2:
+        return "Newton", f"Le polynôme est de degré {degree}, donc la méthode Newton est directement recommandée.", None
+    method = str(predicted)
+    return method, f"La méthode {method} a été recommandée en fonction des caractéristiques du polynôme.", None
+
+
+def _cost_explanation(choice):
+    return (f"La méthode {choice['method']} est la plus rapide parmi celles qui devraient réussir : "
+            f"{choice['latency_ms']:.2f} ms prévues, réussite estimée à {choice['success_probability']:.0%}.")
+
+
+def _predicted_cost(choice):
+    # Coût prévu de la méthode retenue et des autres méthodes applicables (par durée croissante)
+    return {
+        "latency_ms": round(choice["latency_ms"], 3),
+        "success_probability": round(choice["success_probability"], 3),
+        "candidates": [
+            {"method": candidate["method"], "latency_ms": round(candidate["latency_ms"], 3),
+             "success_probability": round(candidate["success_probability"], 3)}
+            for candidate in choice["candidates"]
+        ]
+    }
+
+
 @app.route("/recommend", methods=["POST"])
 def recommend_method_api():
     """
@@ -85,43 +205,115 @@ def recommend_method_api():
     polynomial = data.get("polynomial")
 
     try:
-        # Analyse du polynôme
-        coefficients = parse_polynomial(polynomial)
-        coefficients = np.array(coefficients).reshape(1, -1)
-
-        # Vérifiez le degré du polynôme
-        x = sp.symbols('x')
-        expr = sp.sympify(polynomial.replace("^", "**"))
-        degree = sp.Poly(expr, x).degree()
-
-        if degree == 2:
-            return jsonify({
-                "recommended_method": "Quadratique",
-                "explanation": f"Le polynôme est de degré 2, donc la méthode Quadratique est directement recommandée."
-            })
-        elif degree > 2:
-            return jsonify({
-                "recommended_method": "Newton",
-                "explanation": f"Le polynôme est de degré {degree}, donc la méthode Newton est directement recommandée."
-            })
-
-        # Sinon, utilisez le modèle pour prédire
-        method = model.predict(coefficients)[0]
+        # Analyse du polynôme (une seule fois) puis recommandation
+        method, explanation, cost = recommend(_coefficients(polynomial))
 
-        return jsonify({
-            "recommended_method": method,
-            "explanation": f"La méthode {method} a été recommandée en fonction des caractéristiques du polynôme."
-        })
+        response = {"recommended_method": method, "explanation": explanation}
+        if cost is not None:
+            response["predicted_cost"] = cost
+        with metrics.stage("serialize"):
+            return jsonify(response)
+    except ModelUnavailableError as e:
+        return jsonify({"error": str(e)}), e.status
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
+
+@app.route("/solve", methods=["POST"])
+def solve_api():
+    """
+    Résolution en un seul appel : le polynôme est analysé une fois, la méthode recommandée est exécutée
+    dans le processus, et les parties demandées dans `include` (solution, factorization, roots, plot ;
+    par défaut solution) sont calculées à partir des mêmes coefficients.
+    """
+    data = request.get_json()
+    equation = data.get("equation", data.get("polynomial"))
+    variable = data.get("variable", "x")
+    parts = data.get("include", list(DEFAULT_PARTS))
+
+    if not isinstance(equation, str) or not equation:
+        return jsonify({"error": "L'équation est obligatoire.", "success": False}), 400
+    if not isinstance(parts, list) or any(part not in PARTS for part in parts):
+        return jsonify({
+            "error": f"Le paramètre 'include' doit être une liste parmi : {', '.join(PARTS)}.",
+            "success": False
+        }), 400
+
+    try:
+        coefficients = _coefficients(equation, variable)
+        method, explanation, cost = recommend(coefficients)
+    except ModelUnavailableError as e:
+        return jsonify({"error": str(e), "success": False}), e.status
+    except Exception as e:
+        return jsonify({"error": str(e), "success": False}), 400
+
+    result = {
+        "equation": equation,
+        "degree": coefficients.size - 1,
+        "recommended_method": method,
+        "explanation": explanation,
+        **({"predicted_cost": cost} if cost is not None else {}),
+        **run_parts(dict.fromkeys(parts), equation, variable, coefficients, method, data),
+        "success": True
+    }
+    with metrics.stage("serialize"):
+        return jsonify(result)
+
+@app.route("/recommend/batch", methods=["POST"])
+def recommend_batch_api():
+    """
+    Endpoint pour recommander une méthode pour un lot de polynômes (résultats dans l'ordre du lot).
+    """
+    data = request.get_json()
+    polynomials = data.get("polynomials")
+
+    if not isinstance(polynomials, list) or not all(isinstance(p, str) for p in polynomials):
+        return jsonify({"error": "Le paramètre 'polynomials' doit être une liste de chaînes."}), 400
+    if len(polynomials) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"Un lot ne peut pas dépasser {MAX_BATCH_SIZE} polynômes."}), 400
+
+    try:
+        results = recommend_methods(polynomials)
+        with metrics.stage("serialize"):
+            return jsonify({"results": results, "success": True})
+    except ModelUnavailableError as e:
+        return jsonify({"error": str(e)}), e.status
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/recommend/health', methods=['GET'])
+def health():
+    """
+    État du service et de son inscription dans le registre Eureka.
+    """
+    registry = eureka.health()
+    return jsonify({"status": "UP", "registry": registry}), 200
+
+
+def warm_up():
+    """
+    Préchauffage d'un worker avant d'accepter du trafic : chargement du modèle (compilé depuis le
+    `.pkl` s'il manque) et une première prédiction, de même pour le modèle de coût s'il est présent.
+    """
+    try:
+        get_model().predict(build_feature_matrix([[1.0, 0.0]]))
+    except ModelUnavailableError as e:
+        # Le worker sert tout de même les recommandations par le degré ou le modèle de coût (503 sinon)
+        logging.error(str(e))
+    cost_model = get_cost_model()
+    if cost_model is not None:
+        cost_model.choose([[1.0, 0.0]])
+
+
+# Fin de l'import du service : temps d'import et de démarrage sur GET /recommend/startup et dans /metrics
+install_startup(app, "recommendation", "/recommend")
+
+
 if __name__ == "__main__":
     # Initialisation des logs
     logging.basicConfig(level=logging.INFO)
 
-    # Lancer le thread pour s'enregistrer auprès d'Eureka
-    threading.Thread(target=register_with_eureka, daemon=True).start()
-
-    # Démarrer l'application Flask
+    # Démarrer le service (POLYNOME_SERVER_MODE=prod : workers pré-forkés), puis s'enregistrer auprès
+    # d'Eureka une fois les workers préchauffés (renouvellements en arrière-plan)
     logging.info(f"Démarrage du service {SERVICE_NAME} sur le port {SERVICE_PORT}.")
-    app.run(host="0.0.0.0", port=SERVICE_PORT)
+    run(app, SERVICE_PORT, warmup=warm_up, drain=solver_log.close, on_ready=eureka.start)
@@ -0,0 +1,170 @@
+import json
+import math
+import os
+
+import numpy as np
+
+# Méthodes comparées, dans l'ordre de préférence à coût égal
+METHODS = ("Quadratique", "Newton", "Racines", "Factorisation")
+# Caractéristiques d'un polynôme utilisées par le modèle de coût
+FEATURES = ("degree", "degree_squared", "log_terms", "log_magnitude", "log_spread", "integer", "sign_changes")
+# Probabilité de réussite minimale pour qu'une méthode soit retenue
+MIN_SUCCESS = float(os.environ.get("POLYNOME_COST_MIN_SUCCESS", 0.9))
+# Enregistrements minimaux d'une méthode pour l'entraîner
+MIN_SAMPLES = 20
+# Régularisation L2 des deux régressions (caractéristiques centrées réduites)
+RIDGE = 1.0
+LOGISTIC_ITERATIONS = 50
+
+
+def polynomial_features(coefficient_vectors):
+    """
+    Matrice (n x 7) des caractéristiques de coût : degré et son carré, nombre de termes, ordre de
+    grandeur et étalement des coefficients, coefficients entiers, changements de signe.
+    `coefficient_vectors` : coefficients par degré décroissant (format de coefficient_array).
+    """
+    rows = np.zeros((len(coefficient_vectors), len(FEATURES)))
+    for i, vector in enumerate(coefficient_vectors):
+        coefficients = np.trim_zeros(np.asarray(vector, dtype=float), "f")
+        nonzero = np.abs(coefficients[coefficients != 0])
+        degree = max(coefficients.size - 1, 0)
+        signs = np.sign(coefficients[coefficients != 0])
+        rows[i] = (
+            degree,
+            degree ** 2,
+            math.log1p(nonzero.size),
+            math.log1p(nonzero.max()) if nonzero.size else 0.0,
+            math.log(nonzero.max() / nonzero.min()) if nonzero.size else 0.0,
+            float(np.all(coefficients == np.round(coefficients))),
+            np.count_nonzero(signs[1:] != signs[:-1]),
+        )
+    return rows
+
+
+def _design(X, mean, scale):
+    return np.column_stack([np.ones(len(X)), (X - mean) / scale])
+
+
+def fit_latency(A, seconds):
+    """Régression ridge du logarithme de la durée (les durées sont log-normales)."""
+    penalty = RIDGE * np.eye(A.shape[1])
+    penalty[0, 0] = 0.0  # Ordonnée à l'origine non régularisée
+    return np.linalg.solve(A.T @ A + penalty, A.T @ np.log(np.maximum(seconds, 1e-7)))
+
+
+def fit_success(A, success):
+    """Régression logistique régularisée par IRLS (méthode de Newton sur la log-vraisemblance)."""
+    weights = np.zeros(A.shape[1])
+    penalty = RIDGE * np.eye(A.shape[1])
+    penalty[0, 0] = 0.0
+    for _ in range(LOGISTIC_ITERATIONS):
+        probability = 1 / (1 + np.exp(-A @ weights))
+        gradient = A.T @ (probability - success) + penalty @ weights
+        hessian = (A * (probability * (1 - probability))[:, None]).T @ A + penalty + 1e-9 * np.eye(A.shape[1])
+        step = np.linalg.solve(hessian, gradient)
+        weights -= step
+        if np.abs(step).max() < 1e-8:
+            break
+    return weights
+
+
+class CostModel:
+    """
+    Modèle de coût des solveurs, entraîné sur le journal des exécutions (polynome_commun.solver_log) :
+    pour chaque méthode, durée prédite (ms) et probabilité de réussite d'un polynôme.
+    Une méthode n'est proposée que pour les degrés observés dans son journal (pas d'extrapolation),
+    et la méthode Quadratique uniquement pour le degré 2.
+    """
+
+    def __init__(self, mean, scale, methods, min_success=MIN_SUCCESS):
+        self.mean = np.asarray(mean, dtype=float)
+        self.scale = np.asarray(scale, dtype=float)
+        self.methods = methods  # nom -> {latency, success, samples, max_degree}
+        self.min_success = min_success
+
+    @classmethod
+    def fit(cls, records, min_samples=MIN_SAMPLES, min_success=MIN_SUCCESS):
+        """Entraîne le modèle sur des enregistrements du journal (dictionnaires)."""
+        records = [record for record in records if record.get("method") in METHODS and record.get("coefficients")]
+        if not records:
+            raise ValueError("Le journal des exécutions ne contient aucun enregistrement exploitable.")
+        X = polynomial_features([record["coefficients"] for record in records])
+        mean, scale = X.mean(axis=0), X.std(axis=0)
+        scale[scale == 0] = 1.0
+        A = _design(X, mean, scale)
+
+        names = np.array([record["method"] for record in records])
+        seconds = np.array([record["seconds"] for record in records], dtype=float)
+        success = np.array([bool(record["success"]) and not record.get("timed_out") for record in records], dtype=float)
+        methods = {}
+        for method in METHODS:
+            rows = names == method
+            if rows.sum() < min_samples:
+                continue
+            methods[method] = {
+                "latency": fit_latency(A[rows], seconds[rows]).tolist(),
+                "success": fit_success(A[rows], success[rows]).tolist(),
+                "samples": int(rows.sum()),
+                "max_degree": int(X[rows, 0].max()),
+            }
+        if not methods:
+            raise ValueError(f"Aucune méthode n'a au moins {min_samples} exécutions journalisées.")
+        return cls(mean, scale, methods, min_success)
+
+    def predict(self, coefficient_vectors):
+        """
+        Prédictions pour un lot : {méthode: (durées en ms, probabilités de réussite, applicable)},
+        chaque tableau ayant une valeur par polynôme.
+        """
+        X = polynomial_features(coefficient_vectors)
+        A = _design(X, self.mean, self.scale)
+        degrees = X[:, 0]
+        predictions = {}
+        for method, parameters in self.methods.items():
+            latency = np.exp(A @ np.asarray(parameters["latency"])) * 1000
+            probability = 1 / (1 + np.exp(-A @ np.asarray(parameters["success"])))
+            applicable = degrees <= parameters["max_degree"]
+            if method == "Quadratique":
+                applicable &= degrees == 2
+            predictions[method] = (latency, probability, applicable)
+        return predictions
+
+    def choose(self, coefficient_vectors):
+        """
+        Méthode la moins coûteuse parmi celles dont la réussite prédite atteint `min_success`, pour
+        chaque polynôme : liste de dictionnaires {method, latency_ms, success_probability, candidates},
+        ou None quand aucune méthode ne convient (les règles sur le degré s'appliquent alors).
+        """
+        predictions = self.predict(coefficient_vectors)
+        choices = []
+        for i in range(len(coefficient_vectors)):
+            candidates = [
+                {"method": method, "latency_ms": float(latency[i]), "success_probability": float(probability[i])}
+                for method, (latency, probability, applicable) in predictions.items() if applicable[i]
+            ]
+            eligible = [candidate for candidate in candidates if candidate["success_probability"] >= self.min_success]
+            if not eligible:
+                choices.append(None)
+                continue
+            best = min(eligible, key=lambda candidate: (candidate["latency_ms"], METHODS.index(candidate["method"])))
+            choices.append(dict(best, candidates=sorted(candidates, key=lambda candidate: candidate["latency_ms"])))
+        return choices
+
+    def save(self, path):
+        with open(path + ".tmp", "w", encoding="utf-8") as output:
+            json.dump({
+                "features": list(FEATURES),
+                "mean": self.mean.tolist(),
+                "scale": self.scale.tolist(),
+                "min_success": self.min_success,
+                "methods": self.methods,
+            }, output, indent=2)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as source:
+            data = json.load(source)
+        if data["features"] != list(FEATURES):
+            raise ValueError(f"{path} a été entraîné avec d'autres caractéristiques.")
+        return cls(data["mean"], data["scale"], data["methods"], data["min_success"])
@@ -0,0 +1,41 @@
+import numpy as np
+
+# Nombre de coefficients retenus (les plus bas degrés) et de caractéristiques par polynôme
+COEFFICIENT_COUNT = 10
+FEATURE_COUNT = 12
+# Classes du classifieur, dans l'ordre de leurs indices (ordre alphabétique de l'ancien LabelEncoder)
+CLASSES = ("Newton", "Quadratique")
+
+
+def coefficient_features(coefficients):
+    """
+    Ajoute aux coefficients alignés (n x 10, colonne j : degré 9 - j) le nombre de coefficients
+    non nuls et le coefficient maximal : matrice de caractéristiques n x 12.
+    """
+    coefficients = np.asarray(coefficients)
+    features = np.zeros((coefficients.shape[0], FEATURE_COUNT), dtype=coefficients.dtype)
+    features[:, :COEFFICIENT_COUNT] = coefficients
+    features[:, COEFFICIENT_COUNT] = np.count_nonzero(coefficients, axis=1)
+    features[:, COEFFICIENT_COUNT + 1] = coefficients.max(axis=1) if coefficients.size else 0
+    return features
+
+
+def build_feature_matrix(coefficient_vectors):
+    """
+    Construit la matrice de caractéristiques (n x 12) d'un lot de polynômes en une passe vectorisée :
+    les 10 coefficients de plus bas degré alignés à droite, puis le nombre de coefficients non nuls
+    et le coefficient maximal (mêmes colonnes que `parse_polynomial`). Lève `ValueError` pour un
+    coefficient non fini : le modèle compilé n'a pas de branche pour les valeurs manquantes.
+    """
+    vectors = [np.asarray(vector, dtype=float)[-COEFFICIENT_COUNT:] for vector in coefficient_vectors]
+    if not all(np.isfinite(vector).all() for vector in vectors):
+        raise ValueError("Les coefficients du polynôme doivent être finis.")
+    lengths = np.array([vector.size for vector in vectors], dtype=int)
+    coefficients = np.zeros((len(vectors), COEFFICIENT_COUNT))
+    if vectors:
+        # Dispersion de tous les coefficients à leur (ligne, colonne) en une seule affectation
+        rows = np.repeat(np.arange(len(vectors)), lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        columns = COEFFICIENT_COUNT - np.repeat(lengths, lengths) + offsets
+        coefficients[rows, columns] = np.concatenate(vectors)
+    return coefficient_features(coefficients)
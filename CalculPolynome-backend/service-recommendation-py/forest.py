@@ -0,0 +1,283 @@
+import json
+import logging
+import math
+import os
+import struct
+
+import numpy as np
+
+# En-tête du format : signature, puis longueur (8 octets) et contenu JSON de la description
+MAGIC = b"POLYFOREST1\n"
+# Alignement des tableaux dans le fichier (projection en mémoire sans copie)
+ALIGNMENT = 64
+# Profondeur maximale compilée : un arbre complet de profondeur D occupe 2^D feuilles
+MAX_DEPTH = 12
+# Nombre de couples (ligne, arbre) parcourus par bloc de prédiction
+BATCH_BUDGET = 1 << 18
+
+
+class ModelUnavailableError(Exception):
+    """Le modèle d'origine ne peut pas être chargé (dépendance absente, fichier illisible) : réponse 503."""
+
+    status = 503
+
+
+class CompiledForest:
+    """
+    Ensemble d'arbres de décision compilé en tableaux plats.
+
+    Chaque arbre est complété en arbre binaire parfait de profondeur `depth` (une feuille
+    prématurée est recopiée dans tout son sous-arbre, avec un seuil infini qui mène toujours à
+    gauche). Les nœuds du niveau k de tous les arbres sont rangés ensemble : un niveau de
+    parcours coûte quelques opérations NumPy pour tout le lot et tous les arbres, sans boucle Python
+    par arbre ni par ligne. Les étiquettes des classes sont portées par l'artefact.
+    """
+
+    def __init__(self, feature, threshold, leaf, base_margin, classes, depth, metadata=None):
+        self.feature = feature  # (arbres, 2^D - 1) indices de colonne
+        self.threshold = threshold  # (arbres, 2^D - 1) seuils float32 : à droite si x >= seuil
+        self.leaf = leaf  # (arbres, 2^D) valeurs des feuilles
+        self.base_margin = np.asarray(base_margin, dtype=np.float64)
+        self.classes = np.array(classes)
+        self.depth = depth
+        self.metadata = metadata or {}
+        # Arbre t -> classe t % K (ensembles multi-classes à un arbre par classe et par itération)
+        self.num_class = len(self.base_margin)
+        # Vues plates (ndarray simples sur la projection) : indexation globale nœud = base + local
+        nodes = feature.shape[1]
+        self._feature = np.asarray(feature).reshape(-1).astype(np.intp)
+        self._threshold = np.asarray(threshold).reshape(-1)
+        self._leaf = np.asarray(leaf).reshape(-1)
+        self._node_base = np.arange(feature.shape[0]) * nodes
+        self._leaf_base = np.arange(feature.shape[0]) * leaf.shape[1] - nodes
+        # Lignes traitées ensemble : les tableaux intermédiaires (lignes x arbres) restent bornés
+        self._chunk = max(1, BATCH_BUDGET // feature.shape[0])
+
+    @property
+    def trees(self):
+        return self.feature.shape[0]
+
+    def margins(self, X):
+        """Marges brutes (n x K) : somme des feuilles atteintes et marge de base."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[0] == 1:
+            values = self._row_leaves(X[0])[None, :]
+        else:
+            values = np.empty((X.shape[0], self.trees), dtype=np.float32)
+            for start in range(0, X.shape[0], self._chunk):
+                values[start:start + self._chunk] = self._leaves(X[start:start + self._chunk])
+        if self.num_class == 1:
+            return values.sum(axis=1, keepdims=True, dtype=np.float64) + self.base_margin
+        margins = values.reshape(X.shape[0], -1, self.num_class).sum(axis=1, dtype=np.float64)
+        return margins + self.base_margin
+
+    def _leaves(self, X):
+        # D sauts par niveau pour tous les arbres : nœud suivant = 2 * local + 1 + (x >= seuil)
+        values = np.ascontiguousarray(X).reshape(-1)
+        offsets = (np.arange(X.shape[0]) * X.shape[1])[:, None]
+        local = np.zeros((X.shape[0], self.trees), dtype=np.intp)
+        for _ in range(self.depth):
+            node = self._node_base + local
+            local += local + 1 + (values[offsets + self._feature[node]] >= self._threshold[node])
+        return self._leaf[self._leaf_base + local]
+
+    def _row_leaves(self, x):
+        # Même parcours pour une seule ligne (requête unitaire) : indexation 1-D, moins d'opérations
+        local = np.zeros(self.trees, dtype=np.intp)
+        for _ in range(self.depth):
+            node = self._node_base + local
+            local = 2 * local + 1 + (x[self._feature[node]] >= self._threshold[node])
+        return self._leaf[self._leaf_base + local]
+
+    def predict_codes(self, X):
+        margins = self.margins(X)
+        if self.num_class == 1:
+            return (margins[:, 0] > 0).astype(np.intp)
+        return margins.argmax(axis=1)
+
+    def predict(self, X):
+        """Étiquettes des classes prédites (mêmes noms que l'encodeur d'entraînement)."""
+        return self.classes[self.predict_codes(X)]
+
+    def save(self, path):
+        arrays = {"feature": self.feature, "threshold": self.threshold, "leaf": self.leaf}
+        description = {
+            "classes": self.classes.tolist(),
+            "depth": self.depth,
+            "base_margin": self.base_margin.tolist(),
+            "metadata": self.metadata,
+            "arrays": {},
+        }
+        # Les décalages dépendent de la taille de l'en-tête : deux passes suffisent à les stabiliser
+        for _ in range(2):
+            header = json.dumps(description).encode("utf-8")
+            offset = _align(len(MAGIC) + 8 + len(header) + ALIGNMENT)
+            for name, array in arrays.items():
+                description["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+                offset = _align(offset + array.nbytes)
+        header = json.dumps(description).encode("utf-8")
+
+        # Fichier temporaire propre au processus : plusieurs workers peuvent compiler le même modèle
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as output:
+            output.write(MAGIC + struct.pack("<Q", len(header)) + header)
+            for name, array in arrays.items():
+                output.write(b"\0" * (description["arrays"][name]["offset"] - output.tell()))
+                output.write(np.ascontiguousarray(array).tobytes())
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        """Chargement par projection en mémoire : les tableaux ne sont lus qu'à leur premier accès."""
+        with open(path, "rb") as source:
+            if source.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} n'est pas un modèle compilé.")
+            (length,) = struct.unpack("<Q", source.read(8))
+            description = json.loads(source.read(length))
+        arrays = {
+            name: np.memmap(path, dtype=np.dtype(spec["dtype"]), mode="r", offset=spec["offset"],
+                            shape=tuple(spec["shape"]))
+            for name, spec in description["arrays"].items()
+        }
+        return cls(arrays["feature"], arrays["threshold"], arrays["leaf"], description["base_margin"],
+                   description["classes"], description["depth"], description["metadata"])
+
+
+class LabeledModel:
+    """
+    Modèle d'origine (XGBClassifier chargé par joblib) dont les indices de classe prédits sont
+    convertis en étiquettes : même interface que CompiledForest pour le service.
+    """
+
+    def __init__(self, model, classes):
+        self.model = model
+        self.classes = np.array(classes)
+
+    def predict(self, X):
+        predicted = np.asarray(self.model.predict(X))
+        if np.issubdtype(predicted.dtype, np.integer):
+            return self.classes[predicted]
+        return predicted
+
+
+def load_model(pickle_path, classes, check=None):
+    """
+    Modèle du service. L'artefact compilé est rangé à côté du modèle d'origine (même nom, extension
+    `.forest`) : absent ou plus ancien que le `.pkl`, il est compilé une fois depuis celui-ci puis
+    relu par projection en mémoire. Si la compilation échoue (arbres trop profonds, désaccord sur les
+    lignes `check`, dossier en lecture seule), le modèle d'origine est utilisé ; s'il ne peut pas
+    être chargé (joblib ou xgboost absent, fichier incompatible), `ModelUnavailableError` est levée.
+    """
+    forest_path = os.path.splitext(pickle_path)[0] + ".forest"
+    if os.path.exists(forest_path) and (
+            not os.path.exists(pickle_path) or os.path.getmtime(forest_path) >= os.path.getmtime(pickle_path)):
+        return CompiledForest.load(forest_path)
+
+    try:
+        # Import différé : joblib et xgboost ne sont chargés que pour compiler l'artefact
+        import joblib
+
+        model = joblib.load(pickle_path)
+    except Exception as e:
+        raise ModelUnavailableError(f"Modèle de recommandation indisponible : {e}") from e
+    try:
+        forest = compile_xgboost(model, classes)
+        if check is not None:
+            parity = parity_check(forest, model, check)
+            if parity["mismatches"]:
+                raise ValueError(f"{parity['mismatches']} prédictions différentes du modèle d'origine")
+        forest.save(forest_path)
+    except (ValueError, OSError) as e:
+        logging.warning(f"Modèle non compilé ({e}) : modèle d'origine utilisé.")
+        return LabeledModel(model, classes)
+    logging.info(f"Modèle compilé dans '{forest_path}' ({forest.trees} arbres).")
+    return CompiledForest.load(forest_path)
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _tree_depth(node):
+    if "leaf" in node:
+        return 0
+    return 1 + max(_tree_depth(child) for child in node["children"])
+
+
+def _fill(node, position, level, depth, feature, threshold, leaf):
+    # Recopie d'un arbre XGBoost (JSON) dans l'arbre complet : enfant « yes » (x < seuil) à gauche
+    if level == depth:
+        leaf[position - (2 ** depth - 1)] = node["leaf"]
+        return
+    if "leaf" in node:
+        threshold[position] = np.inf
+        left = right = node
+    else:
+        feature[position] = int(node["split"].lstrip("f"))
+        threshold[position] = node["split_condition"]
+        children = {child["nodeid"]: child for child in node["children"]}
+        left, right = children[node["yes"]], children[node["no"]]
+    _fill(left, 2 * position + 1, level + 1, depth, feature, threshold, leaf)
+    _fill(right, 2 * position + 2, level + 1, depth, feature, threshold, leaf)
+
+
+def compile_xgboost(model, classes):
+    """
+    Compile un XGBClassifier entraîné (arbres retenus par l'arrêt anticipé uniquement) en
+    CompiledForest. `classes` donne l'étiquette de chaque indice de classe.
+    """
+    booster = model.get_booster()
+    config = json.loads(booster.save_config())
+    objective = config["learner"]["objective"]["name"]
+    num_class = max(int(config["learner"]["learner_model_param"].get("num_class", 0)), 1)
+    base_score = float(config["learner"]["learner_model_param"]["base_score"])
+    if objective == "binary:logistic":
+        base_margin = [math.log(base_score / (1 - base_score))]
+    elif objective.startswith("multi:"):
+        base_margin = [base_score] * num_class
+    else:
+        raise ValueError(f"Objectif non pris en charge : {objective}.")
+
+    rounds = getattr(model, "best_iteration", None)
+    dumps = booster.get_dump(dump_format="json")
+    if rounds is not None:
+        dumps = dumps[:(rounds + 1) * num_class]
+    trees = [json.loads(dump) for dump in dumps]
+
+    depth = max(max((_tree_depth(tree) for tree in trees), default=0), 1)
+    if depth > MAX_DEPTH:
+        raise ValueError(f"Arbres trop profonds pour être compilés ({depth} > {MAX_DEPTH}).")
+    feature = np.zeros((len(trees), 2 ** depth - 1), dtype=np.int16)
+    threshold = np.zeros((len(trees), 2 ** depth - 1), dtype=np.float32)
+    leaf = np.zeros((len(trees), 2 ** depth), dtype=np.float32)
+    for t, tree in enumerate(trees):
+        _fill(tree, 0, 0, depth, feature[t], threshold[t], leaf[t])
+
+    return CompiledForest(feature, threshold, leaf, base_margin, list(classes), depth,
+                          {"objective": objective, "trees": len(trees)})
+
+
+def parity_check(forest, model, X):
+    """
+    Compare les prédictions du modèle compilé à celles du modèle d'origine sur X.
+    Retourne le nombre de lignes, de désaccords et l'écart maximal de probabilité.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    expected = np.asarray(model.predict(X))
+    mismatches = int(np.count_nonzero(forest.predict_codes(X) != expected))
+
+    probabilities = np.asarray(model.predict_proba(X), dtype=np.float64)
+    margins = forest.margins(X)
+    if forest.num_class == 1:
+        compiled = 1 / (1 + np.exp(-margins[:, 0]))
+        difference = np.abs(compiled - probabilities[:, 1])
+    else:
+        exp = np.exp(margins - margins.max(axis=1, keepdims=True))
+        difference = np.abs(exp / exp.sum(axis=1, keepdims=True) - probabilities)
+    return {
+        "rows": int(X.shape[0]),
+        "mismatches": mismatches,
+        "max_probability_error": float(difference.max()) if difference.size else 0.0,
+    }
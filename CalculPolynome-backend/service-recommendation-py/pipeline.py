@@ -0,0 +1,144 @@
+import os
+import sys
+
+import numpy as np
+
+# Accès au paquet partagé polynome_commun
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from polynome_commun.admission import AdmissionRejected, admission
+from polynome_commun.factorization import fast_factorization, symbolic_result
+from polynome_commun.metrics import metrics
+from polynome_commun.newton_engine import newton_multi_start
+from polynome_commun.polynomial_parser import parse_terms
+from polynome_commun.quadratic_engine import format_roots, solve_quadratic_batch
+from polynome_commun.roots_engine import all_roots, format_root
+from polynome_commun.sampler import adaptive_sample, markers
+from polynome_commun.solver_log import solver_log
+from polynome_commun.symbolic_pool import SymbolicJobError, symbolic_pool
+
+# Parties du résultat combiné que le client peut demander
+PARTS = ("solution", "factorization", "roots", "plot")
+DEFAULT_PARTS = ("solution",)
+
+
+def solve(coefficients, method, initial_guess=0.0, tolerance=1e-7, max_iterations=100, equation=None, variable="x"):
+    """
+    Exécute dans le processus le solveur recommandé sur les coefficients déjà analysés :
+    formule quadratique pour un polynôme de degré 2, toutes les racines (Racines), factorisation
+    (Factorisation, à partir de `equation`), méthode de Newton sinon.
+    Chaque exécution est journalisée pour le modèle de coût, comme dans les services de résolution.
+    """
+    if method == "Racines":
+        return dict(roots(coefficients), method="Racines")
+    if method == "Factorisation" and equation is not None:
+        return dict(factorization(equation, variable), method="Factorisation")
+
+    if method == "Quadratique" and coefficients.size == 3:
+        a, b, c = coefficients
+        with solver_log.timed("Quadratique", coefficients=coefficients):
+            x1, x2, discriminant = solve_quadratic_batch([a], [b], [c])
+        return {"method": "Quadratique", "roots": format_roots(x1[0], x2[0], discriminant[0]), "success": True}
+
+    with solver_log.timed("Newton", coefficients=coefficients) as execution:
+        lanes = newton_multi_start(coefficients, [initial_guess], tolerance, max_iterations)
+        converged = bool(lanes["converged"][0])
+        execution.update(converged=converged, iterations=int(lanes["iterations"][0]))
+        if lanes["stalled"][0]:
+            raise ValueError("La dérivée est proche de zéro, la méthode de Newton ne peut pas continuer.")
+        if not converged:
+            raise ValueError("La méthode de Newton n'a pas convergé après le nombre maximum d'itérations.")
+    return {
+        "method": "Newton",
+        "solution": round(float(lanes["solutions"][0]), 2),
+        "iterations": int(lanes["iterations"][0]),
+        "success": True
+    }
+
+
+def _explicit(equation, variable):
+    # Termes exacts écrits avec multiplications explicites : SymPy n'analyse pas `6x^2`
+    terms = parse_terms(equation, variable)
+    return " + ".join(
+        f"({coefficient})*{variable}**{exponent}" for exponent, coefficient in sorted(terms.items(), reverse=True)
+    ) or "0"
+
+
+def factorization(equation, variable):
+    """
+    Factorisation structurée, admise selon son coût estimé (les grandes entrées passent par la voie
+    lente) : chemin rapide borné en temps pour les coefficients entiers ou rationnels, sinon
+    factorisation symbolique bornée par le délai du pool.
+    """
+    with admission.admit(equation, variable, "factor"):
+        with solver_log.timed("Factorisation", equation, variable) as execution:
+            result = fast_factorization(equation, variable)
+            if result is None:
+                execution.skip()  # Mesuré ci-dessous, avec le calcul symbolique
+        if result is None:
+            with solver_log.timed("Factorisation", equation, variable):
+                result = symbolic_result(symbolic_pool.run("factor", _explicit(equation, variable), variable))
+    return dict(result, success=True)
+
+
+def roots(coefficients):
+    """Toutes les racines complexes avec leurs multiplicités (même format que le service des racines)."""
+    with solver_log.timed("Racines", coefficients=coefficients):
+        found = all_roots(coefficients)
+    return {
+        "roots": [format_root(root) for root, _ in found],
+        "details": [
+            {"real": round(root.real, 2) + 0.0, "imag": round(root.imag, 2) + 0.0, "multiplicity": multiplicity}
+            for root, multiplicity in found
+        ],
+        "success": True
+    }
+
+
+def plot(coefficients, x_min=-10.0, x_max=10.0, budget=400, tolerance=1e-3):
+    """Points de la courbe (échantillonnage adaptatif) avec les racines réelles et les extrema."""
+    if not x_min < x_max or not 16 <= budget <= 100000:
+        raise ValueError("Intervalle ou nombre de points invalide.")
+    x, y = adaptive_sample(lambda values: np.polyval(coefficients, values), x_min, x_max, budget, tolerance)
+    return {
+        "x": x.tolist(),
+        "y": [value if np.isfinite(value) else None for value in y.tolist()],
+        "count": int(x.size),
+        **markers(coefficients, x_min, x_max),
+        "success": True
+    }
+
+
+def run_parts(parts, equation, variable, coefficients, method, options):
+    """
+    Calcule les parties demandées à partir de la même représentation analysée.
+    Une partie en échec donne une erreur pour elle seule, sans faire échouer les autres.
+    """
+    results = {}
+    for part in parts:
+        try:
+            with metrics.stage(part):
+                if part == "solution":
+                    results[part] = solve(
+                        coefficients, method,
+                        float(options.get("initial_guess", 0.0)),
+                        float(options.get("tolerance", 1e-7)),
+                        int(options.get("max_iterations", 100)),
+                        equation, variable
+                    )
+                elif part == "factorization":
+                    results[part] = factorization(equation, variable)
+                elif part == "roots":
+                    results[part] = roots(coefficients)
+                else:
+                    results[part] = plot(
+                        coefficients,
+                        float(options.get("x_min", -10)),
+                        float(options.get("x_max", 10)),
+                        int(options.get("budget", 400)),
+                        float(options.get("plot_tolerance", 1e-3))
+                    )
+        except (AdmissionRejected, SymbolicJobError) as e:
+            results[part] = e.to_dict()
+        except Exception as e:
+            results[part] = {"error": str(e), "success": False}
+    return results
@@ -0,0 +1,25 @@
+import numpy as np
+
+import app
+
+
+class _Classifier:
+    def predict(self, X):
+        return np.array(["Newton"] * len(X))
+
+
+# Cas de test 1 : /recommend, /recommend/batch et /solve donnent la même méthode et la même explication
+def test_routes_share_recommendation(monkeypatch):
+    monkeypatch.setattr(app, "_models", {"classifier": _Classifier(), "cost": None})
+    client = app.app.test_client()
+    polynomials = ["2x + 1", "x^2 - 4", "x^3 - 2x + 1"]
+
+    batch = client.post("/recommend/batch", json={"polynomials": polynomials}).get_json()["results"]
+    for polynomial, expected in zip(polynomials, batch):
+        single = client.post("/recommend", json={"polynomial": polynomial}).get_json()
+        solved = client.post("/solve", json={"equation": polynomial}).get_json()
+        assert single == {key: expected[key] for key in ("recommended_method", "explanation")}
+        assert (solved["recommended_method"], solved["explanation"]) == (single["recommended_method"], single["explanation"])
+
+    assert [result["recommended_method"] for result in batch] == ["Newton", "Quadratique", "Newton"]
+    assert batch[2]["explanation"] == "Le polynôme est de degré 3, donc la méthode Newton est directement recommandée."
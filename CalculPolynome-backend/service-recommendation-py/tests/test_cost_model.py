@@ -0,0 +1,55 @@
+import numpy as np
+
+from cost_model import CostModel, polynomial_features
+
+
+def solver_records(count=1500, seed=0):
+    """
+    Journal synthétique : formule quadratique instantanée (degré 2), Newton rapide mais en échec sans
+    changement de signe (pas de racine réelle atteinte), toutes les racines plus lentes mais toujours réussies.
+    """
+    rng = np.random.default_rng(seed)
+    records = []
+    for _ in range(count):
+        degree = int(rng.integers(2, 9))
+        coefficients = rng.integers(1, 10, degree + 1).astype(float)
+        if rng.random() < 0.5:
+            coefficients[1:] *= rng.choice([-1.0, 1.0], degree)
+        changes = int(polynomial_features([coefficients])[0, -1])
+        noise = float(np.exp(rng.normal(0, 0.1)))
+        if degree == 2:
+            records.append({"method": "Quadratique", "coefficients": coefficients.tolist(),
+                            "seconds": 1e-5 * noise, "success": True})
+        records.append({"method": "Newton", "coefficients": coefficients.tolist(),
+                        "seconds": 5e-5 * noise, "success": changes > 0})
+        records.append({"method": "Racines", "coefficients": coefficients.tolist(),
+                        "seconds": 2e-4 * degree * noise, "success": True})
+    return records
+
+
+# Cas de test 1 : La méthode la moins coûteuse parmi celles qui devraient réussir est retenue
+def test_choose_cheapest_successful_method():
+    model = CostModel.fit(solver_records(), min_success=0.9)
+    choices = model.choose([
+        [1.0, -3.0, 2.0],  # Degré 2 : formule quadratique
+        [1.0, -2.0, 0.0, 3.0, -1.0, 5.0],  # Changements de signe : Newton converge
+        [1.0, 2.0, 3.0, 4.0, 5.0],  # Coefficients positifs : Newton échoue, toutes les racines
+        [1.0] + [0.0] * 19 + [-1.0],  # Degré jamais observé : aucune méthode
+    ])
+
+    assert [choice and choice["method"] for choice in choices] == ["Quadratique", "Newton", "Racines", None]
+    quadratic = choices[0]
+    assert quadratic["latency_ms"] < 0.05 and quadratic["success_probability"] > 0.9
+    assert [candidate["method"] for candidate in quadratic["candidates"]] == ["Quadratique", "Newton", "Racines"]
+    assert 0.5 < choices[2]["latency_ms"] < 2.0
+
+
+# Cas de test 2 : Le modèle sauvegardé est relu à l'identique
+def test_save_and_load(tmp_path):
+    model = CostModel.fit(solver_records(300, seed=1))
+    path = str(tmp_path / "solver_cost_model.json")
+    model.save(path)
+    loaded = CostModel.load(path)
+
+    polynomials = [[1.0, -1.0, -6.0], [2.0, 0.0, 0.0, -3.0]]
+    assert loaded.choose(polynomials) == model.choose(polynomials)
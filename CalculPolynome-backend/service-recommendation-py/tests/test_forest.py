@@ -0,0 +1,123 @@
+import json
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from features import build_feature_matrix
+from forest import CompiledForest, LabeledModel, ModelUnavailableError, compile_xgboost, load_model, parity_check
+
+# Deux arbres au format de vidage JSON d'XGBoost (enfant « yes » si x < seuil), de profondeurs différentes
+TREES = [
+    {"nodeid": 0, "split": "f0", "split_condition": 0.5, "yes": 1, "no": 2, "children": [
+        {"nodeid": 1, "leaf": -1.0},
+        {"nodeid": 2, "split": "f11", "split_condition": 3.0, "yes": 3, "no": 4, "children": [
+            {"nodeid": 3, "leaf": 0.25},
+            {"nodeid": 4, "leaf": 2.0},
+        ]},
+    ]},
+    {"nodeid": 0, "split": "f10", "split_condition": 2.0, "yes": 2, "no": 1, "children": [
+        {"nodeid": 1, "leaf": 0.5},
+        {"nodeid": 2, "leaf": -0.5},
+    ]},
+]
+
+
+class _Booster:
+    def save_config(self):
+        return json.dumps({"learner": {
+            "objective": {"name": "binary:logistic"},
+            "learner_model_param": {"base_score": "5E-1", "num_class": "0"},
+        }})
+
+    def get_dump(self, dump_format):
+        return [json.dumps(tree) for tree in TREES] + [json.dumps({"nodeid": 0, "leaf": 100.0})]
+
+
+class _Model:
+    """XGBClassifier minimal : le troisième arbre est écarté par l'arrêt anticipé."""
+    best_iteration = 1
+
+    def get_booster(self):
+        return _Booster()
+
+    def margin(self, X):
+        first = np.where(X[:, 0] < 0.5, -1.0, np.where(X[:, 11] < 3.0, 0.25, 2.0))
+        second = np.where(X[:, 10] < 2.0, -0.5, 0.5)
+        return first + second
+
+    def predict(self, X):
+        return (self.margin(X) > 0).astype(int)
+
+    def predict_proba(self, X):
+        positive = 1 / (1 + np.exp(-self.margin(X)))
+        return np.column_stack([1 - positive, positive])
+
+
+# Cas de test 1 : Le modèle compilé reproduit les marges et les étiquettes du modèle d'origine
+def test_compile_matches_model():
+    model = _Model()
+    forest = compile_xgboost(model, ("Newton", "Quadratique"))
+    X = np.random.default_rng(0).uniform(-1, 5, (2000, 12)).astype(np.float32)
+
+    assert forest.trees == 2 and forest.depth == 2
+    assert np.allclose(forest.margins(X)[:, 0], model.margin(X))
+    assert np.array_equal(forest.margins(X[:1]), forest.margins(X)[:1])
+    assert list(forest.predict(X[:3])) == [("Newton", "Quadratique")[k] for k in model.predict(X[:3])]
+    parity = parity_check(forest, model, X)
+    assert parity["rows"] == 2000 and parity["mismatches"] == 0
+    assert parity["max_probability_error"] < 1e-6
+
+# Cas de test 2 : L'artefact est relu par projection en mémoire, étiquettes comprises
+def test_save_and_load(tmp_path):
+    forest = compile_xgboost(_Model(), ("Newton", "Quadratique"))
+    path = str(tmp_path / "method_classifier.forest")
+    forest.save(path)
+    loaded = CompiledForest.load(path)
+
+    assert isinstance(loaded.threshold, np.memmap)
+    assert list(loaded.classes) == ["Newton", "Quadratique"]
+    X = np.random.default_rng(1).uniform(-1, 5, (500, 12))
+    assert np.array_equal(loaded.predict(X), forest.predict(X))
+
+
+# Cas de test 3 : Sans artefact, le modèle est compilé une fois depuis le .pkl et mis en cache à côté
+def test_load_model_compiles_once(tmp_path, monkeypatch):
+    loads = []
+    joblib = types.ModuleType("joblib")
+    joblib.load = lambda path: loads.append(path) or _Model()
+    monkeypatch.setitem(sys.modules, "joblib", joblib)
+    pickle_path = tmp_path / "method_classifier.pkl"
+    pickle_path.write_bytes(b"")
+    X = np.random.default_rng(2).uniform(-1, 5, (200, 12))
+
+    first = load_model(str(pickle_path), ("Newton", "Quadratique"), check=X)
+    second = load_model(str(pickle_path), ("Newton", "Quadratique"))
+
+    assert isinstance(first, CompiledForest) and isinstance(second, CompiledForest)
+    assert (tmp_path / "method_classifier.forest").exists() and loads == [str(pickle_path)]
+    assert np.array_equal(second.predict(X), first.predict(X))
+
+    # Désaccord avec le modèle d'origine : rien n'est mis en cache, le modèle d'origine est utilisé
+    (tmp_path / "method_classifier.forest").unlink()
+    monkeypatch.setattr(_Model, "predict", lambda self, X: 1 - (self.margin(X) > 0).astype(int))
+    assert isinstance(load_model(str(pickle_path), ("Newton", "Quadratique"), check=X), LabeledModel)
+    assert not (tmp_path / "method_classifier.forest").exists()
+
+# Cas de test 4 : Modèle illisible ou joblib absent, une erreur de service indisponible (503)
+def test_load_model_unavailable(tmp_path, monkeypatch):
+    joblib = types.ModuleType("joblib")
+    joblib.load = lambda path: open(path, "rb")
+    monkeypatch.setitem(sys.modules, "joblib", joblib)
+
+    with pytest.raises(ModelUnavailableError) as error:
+        load_model(str(tmp_path / "method_classifier.pkl"), ("Newton", "Quadratique"))
+    assert error.value.status == 503
+
+# Cas de test 5 : Les coefficients non finis sont refusés avant le parcours des arbres
+def test_build_feature_matrix_rejects_non_finite():
+    with pytest.raises(ValueError):
+        build_feature_matrix([[1.0, np.inf]])
+    with pytest.raises(ValueError):
+        build_feature_matrix([[np.nan, 0.0]])
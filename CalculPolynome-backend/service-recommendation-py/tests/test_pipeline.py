@@ -0,0 +1,35 @@
+import numpy as np
+
+from pipeline import plot, roots, run_parts, solve
+
+# Cas de test 1 : Un polynôme de degré 2 est résolu par la formule quadratique
+def test_solve_quadratic():
+    result = solve(np.array([1.0, 0.0, -4.0]), "Quadratique")
+
+    assert result["method"] == "Quadratique"
+    assert result["roots"] == [-2.0, 2.0]
+
+# Cas de test 2 : Les autres degrés sont résolus par Newton depuis l'estimation initiale
+def test_solve_newton():
+    result = solve(np.array([1.0, -6.0, 11.0, -6.0]), "Newton", initial_guess=0.5)
+
+    assert result["method"] == "Newton"
+    assert result["solution"] == 1.0
+
+# Cas de test 3 : Racines avec multiplicités et points de la courbe à partir des mêmes coefficients
+def test_roots_and_plot():
+    coefficients = np.array([1.0, -2.0, 1.0])
+
+    assert roots(coefficients)["details"] == [{"real": 1.0, "imag": 0.0, "multiplicity": 2}]
+    points = plot(coefficients, -3.0, 3.0, budget=32)
+    assert points["count"] <= 32
+    assert points["extrema"][0]["kind"] == "min"
+
+# Cas de test 4 : Une partie en échec n'empêche pas le calcul des autres
+def test_run_parts_isolates_errors():
+    coefficients = np.array([1.0, 0.0, 1.0])
+    results = run_parts(["solution", "plot"], "x^2 + 1", "x", coefficients, "Newton", {"x_min": 1, "x_max": 0})
+
+    assert results["solution"]["success"] is False
+    assert results["plot"]["success"] is False
+    assert "Intervalle" in results["plot"]["error"]
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+# Dossier du service, pour le processus lancé par le test
+SERVICE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Cas de test 1 : L'import du service ne charge aucun modèle (ni joblib, ni xgboost, ni sklearn)
+def test_import_loads_no_model():
+    script = f"""
+import sys
+sys.path.insert(0, {SERVICE!r})
+import app
+assert app._models == {{}}
+print(",".join(name for name in ("joblib", "xgboost", "sklearn") if name in sys.modules))
+"""
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=120, check=True)
+    assert output.stdout.strip() == ""
+
+
+# Cas de test 2 : Un modèle indisponible donne 503, sans nouvelle tentative de chargement à chaque requête
+def test_model_unavailable_is_503(monkeypatch):
+    import app
+    from forest import ModelUnavailableError
+
+    calls = []
+
+    def load_model(*args, **kwargs):
+        calls.append(args)
+        raise ModelUnavailableError("Modèle de recommandation indisponible : absent")
+
+    monkeypatch.setattr(app, "load_model", load_model)
+    monkeypatch.setattr(app, "_models", {"cost": None})
+    client = app.app.test_client()
+
+    for _ in range(2):
+        response = client.post("/recommend", json={"polynomial": "2x + 1"})
+        assert response.status_code == 503
+    assert client.post("/recommend/batch", json={"polynomials": ["2x + 1"]}).status_code == 503
+    assert client.post("/recommend", json={"polynomial": "x^2 + 1"}).status_code == 200
+    assert len(calls) == 1
@@ -0,0 +1,36 @@
+import numpy as np
+
+from features import build_feature_matrix
+from train_model import NEWTON, QUADRATIQUE, generate_data, load_dataset, rank, synthetic_chunks, write_dataset
+
+# Cas de test 1 : Le corpus synthétique respecte le degré de chaque classe et les colonnes du service
+def test_generate_data():
+    X, y = generate_data(5000, rng=np.random.default_rng(0))
+
+    assert X.shape == (5000, 12) and X.dtype == np.float32
+    degrees = 9 - np.argmax(X[:, :10] != 0, axis=1)
+    assert (degrees[y == QUADRATIQUE] <= 2).all() and (degrees[y == NEWTON] >= 3).all()
+    assert 0.45 < np.mean(y == QUADRATIQUE) < 0.55
+
+    # Mêmes caractéristiques que celles calculées par le service à partir des coefficients
+    vectors = [row[np.argmax(row != 0):] for row in X[:50, :10]]
+    assert np.array_equal(build_feature_matrix(vectors), X[:50])
+
+# Cas de test 2 : Le jeu de données est écrit par tranches et relu par projection en mémoire
+def test_dataset_round_trip(tmp_path):
+    metadata = write_dataset(str(tmp_path), synthetic_chunks(1000, chunk_size=300, seed=1))
+    dataset = load_dataset(str(tmp_path))
+
+    assert sum(metadata["rows"].values()) == 1000
+    assert metadata["rows"]["train"] == 800
+    X_train, y_train = dataset["train"]
+    assert isinstance(X_train, np.memmap) and X_train.shape == (800, 12) and y_train.shape == (800,)
+
+# Cas de test 3 : À précision équivalente, le modèle le plus rapide est préféré
+def test_rank_prefers_fast_models():
+    results = [
+        {"accuracy": 0.990, "latency_us": 90.0},
+        {"accuracy": 0.988, "latency_us": 20.0},
+        {"accuracy": 0.950, "latency_us": 5.0},
+    ]
+    assert [r["latency_us"] for r in rank(results, accuracy_tolerance=0.005)] == [20.0, 90.0, 5.0]
@@ -0,0 +1,69 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from cost_model import MIN_SAMPLES, MIN_SUCCESS, CostModel
+
+# Accès au paquet partagé polynome_commun
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from polynome_commun.solver_log import DEFAULT_DIRECTORY, read_records
+
+# Part des enregistrements réservée à l'évaluation
+TEST_SHARE = 0.2
+
+
+def evaluate(model, records):
+    """
+    Qualité du modèle par méthode sur des enregistrements non vus : erreur médiane sur la durée
+    (rapport prédit / mesuré) et taux de réussite bien prédit.
+    """
+    report = {}
+    for method in model.methods:
+        rows = [record for record in records if record["method"] == method]
+        if not rows:
+            continue
+        latency, probability, _ = model.predict([record["coefficients"] for record in rows])[method]
+        measured = np.array([record["seconds"] * 1000 for record in rows])
+        success = np.array([record["success"] and not record.get("timed_out") for record in rows])
+        ratio = np.maximum(latency, measured) / np.maximum(np.minimum(latency, measured), 1e-9)
+        report[method] = {
+            "records": len(rows),
+            "median_latency_ratio": float(np.median(ratio)),
+            "success_accuracy": float(np.mean((probability >= 0.5) == success)),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entraînement du modèle de coût des solveurs (journal des exécutions).")
+    parser.add_argument("--log-dir", action="append", help="Dossier du journal (plusieurs possibles, un par service)")
+    parser.add_argument("--output", default="solver_cost_model.json")
+    parser.add_argument("--min-samples", type=int, default=MIN_SAMPLES, help="Exécutions minimales par méthode")
+    parser.add_argument("--min-success", type=float, default=MIN_SUCCESS,
+                        help="Probabilité de réussite minimale d'une méthode recommandée")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    records = [record for record in read_records(args.log_dir or [DEFAULT_DIRECTORY]) if record.get("coefficients")]
+    print(f"{len(records)} exécutions journalisées")
+
+    # Évaluation sur une partie réservée, puis modèle final sur tout le journal
+    order = np.random.default_rng(args.seed).permutation(len(records))
+    cut = int(len(records) * (1 - TEST_SHARE))
+    train = [records[i] for i in order[:cut]]
+    test = [records[i] for i in order[cut:]]
+    model = CostModel.fit(train, args.min_samples, args.min_success)
+    for method, scores in evaluate(model, test).items():
+        print(f"{method} : {scores['records']} exécutions de test, rapport médian durée prédite / mesurée "
+              f"{scores['median_latency_ratio']:.2f}, réussite bien prédite {scores['success_accuracy']:.1%}")
+
+    model = CostModel.fit(records, args.min_samples, args.min_success)
+    model.save(args.output)
+    print(f"Modèle de coût sauvegardé dans '{args.output}' : "
+          + ", ".join(f"{method} ({parameters['samples']})" for method, parameters in model.methods.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,59 +1,348 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
 import numpy as np
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report
-from sklearn.preprocessing import LabelEncoder
-from xgboost import XGBClassifier  # XGBoost
-import joblib
-
-def generate_data(num_samples=2000):
-    """
-    Génère des données équilibrées pour les classes Quadratique et Newton.
-    """
-    X = []
-    y = []
-    for i in range(num_samples):
-        coefficients = np.zeros(10)  # Initialise un tableau de coefficients de degré 10
-
-        if i < num_samples // 2:  # Quadratique
-            coefficients[8] = np.random.randint(-10, 10)  # Terme de degré 2
-            coefficients[9] = np.random.randint(-10, 10)  # Terme constant
-            y.append("Quadratique")
-        else:  # Newton
-            coefficients[0] = np.random.randint(1, 10)  # Terme de degré 5
-            coefficients[3] = np.random.randint(-10, 10)  # Terme de degré 2
-            coefficients[9] = np.random.randint(-10, 10)  # Terme constant
-            y.append("Newton")
-
-        # Ajouter des caractéristiques supplémentaires
-        num_nonzero = np.count_nonzero(coefficients)
-        max_coefficient = np.max(coefficients)  # Maximum des coefficients
-        coefficients = np.append(coefficients, [num_nonzero, max_coefficient])  # Ajouter des caractéristiques
-
-        X.append(coefficients)
-
-    return np.array(X), np.array(y)
-
-# Générer les données
-X, y = generate_data(num_samples=3000)
-
-# Encoder les étiquettes
-label_encoder = LabelEncoder()
-y = label_encoder.fit_transform(y)
-
-# Diviser en données d'entraînement et de test
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-# Entraîner un modèle Gradient Boosting (XGBoost)
-model = XGBClassifier(n_estimators=500, max_depth=10, random_state=42)
-model.fit(X_train, y_train)
-
-# Évaluer le modèle
-y_pred = model.predict(X_test)
-print("Rapport de classification :")
-print(classification_report(y_test, y_pred, target_names=label_encoder.classes_))
-
-# Sauvegarder le modèle et l'encodeur
-joblib.dump(model, "method_classifier.pkl")
-joblib.dump(label_encoder, "label_encoder.pkl")  # Sauvegarde du label encoder
-print("Modèle sauvegardé dans 'method_classifier.pkl'")
-print("Encodeur sauvegardé dans 'label_encoder.pkl'")
+
+from features import CLASSES, COEFFICIENT_COUNT, FEATURE_COUNT, build_feature_matrix, coefficient_features
+from forest import compile_xgboost, parity_check
+
+# Accès au paquet partagé polynome_commun
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from polynome_commun.polynomial_parser import PolynomialSyntaxError, coefficient_array
+
+# Les étiquettes sont stockées par indice dans CLASSES
+NEWTON, QUADRATIQUE = range(len(CLASSES))
+
+# Tables des services de résolution : chaque équation enregistrée est étiquetée par le service qui l'a traitée
+SOLVER_TABLES = {"Quadratique": "quadratic_equations", "Newton": "newton_results"}
+
+# Partitions du jeu de données et part de chaque tranche qui leur revient
+SPLITS = ("train", "val", "test")
+SPLIT_SHARES = (0.8, 0.1, 0.1)
+
+# Lignes générées ou lues à la fois : la mémoire utilisée ne dépend pas de la taille du corpus
+CHUNK_SIZE = 100000
+# Lignes de validation au plus utilisées pour mesurer la précision d'un essai
+VALIDATION_ROWS = 200000
+# Lignes utilisées pour vérifier que le modèle compilé prédit comme le modèle d'origine
+PARITY_ROWS = 100000
+
+# Espace de recherche des hyperparamètres ; le nombre d'arbres est borné par l'arrêt anticipé
+SEARCH_SPACE = {
+    "max_depth": (2, 3, 4, 6, 8, 10),
+    "learning_rate": (0.05, 0.1, 0.2, 0.3),
+    "min_child_weight": (1, 5, 10),
+    "subsample": (0.7, 0.85, 1.0),
+    "colsample_bytree": (0.7, 1.0),
+}
+MAX_ESTIMATORS = 500
+EARLY_STOPPING_ROUNDS = 20
+
+
+def generate_data(num_samples=2000, max_degree=9, coefficient_range=10, density=0.6, quadratic_share=0.5,
+                  rng=None):
+    """
+    Génère un corpus synthétique en quelques opérations vectorisées : polynômes de degré 1 ou 2
+    (classe Quadratique) et de degré 3 à `max_degree` (classe Newton), coefficients entiers dans
+    [-coefficient_range, coefficient_range] présents avec la probabilité `density`, coefficient
+    dominant non nul. Retourne la matrice de caractéristiques (n x 12, float32) et les indices de classe.
+    """
+    if not 3 <= max_degree < COEFFICIENT_COUNT:
+        raise ValueError(f"Le degré maximal doit être compris entre 3 et {COEFFICIENT_COUNT - 1}.")
+    rng = rng or np.random.default_rng()
+
+    quadratic = rng.random(num_samples) < quadratic_share
+    degrees = np.where(quadratic, rng.integers(1, 3, num_samples), rng.integers(3, max_degree + 1, num_samples))
+
+    # Colonne j : coefficient du degré 9 - j (alignement de `build_feature_matrix`)
+    exponents = np.arange(COEFFICIENT_COUNT - 1, -1, -1)
+    shape = (num_samples, COEFFICIENT_COUNT)
+    coefficients = rng.integers(-coefficient_range, coefficient_range + 1, shape).astype(np.float32)
+    coefficients *= (rng.random(shape) < density) & (exponents <= degrees[:, None])
+    leading = rng.integers(1, coefficient_range + 1, num_samples) * rng.choice((-1, 1), num_samples)
+    coefficients[np.arange(num_samples), COEFFICIENT_COUNT - 1 - degrees] = leading
+
+    return coefficient_features(coefficients), np.where(quadratic, QUADRATIQUE, NEWTON).astype(np.int8)
+
+
+def synthetic_chunks(num_samples, chunk_size=CHUNK_SIZE, seed=None, **options):
+    """Tranches (X, y) du corpus synthétique, générées au fur et à mesure."""
+    rng = np.random.default_rng(seed)
+    for start in range(0, num_samples, chunk_size):
+        yield generate_data(min(chunk_size, num_samples - start), rng=rng, **options)
+
+
+def solver_chunks(database_url, label, chunk_size=CHUNK_SIZE):
+    """
+    Tranches (X, y) des équations réelles de la table du service `label` (Quadratique ou Newton),
+    lues en flux côté serveur. Les équations hors grammaire polynomiale sont ignorées.
+    """
+    from sqlalchemy import create_engine, text
+
+    engine = create_engine(database_url)
+    try:
+        with engine.connect() as connection:
+            result = connection.execution_options(stream_results=True).execute(
+                text(f"SELECT DISTINCT equation FROM {SOLVER_TABLES[label]}")
+            )
+            for rows in result.partitions(chunk_size):
+                vectors = []
+                for (equation,) in rows:
+                    try:
+                        vectors.append(coefficient_array(equation, "x", fallback=False))
+                    except (PolynomialSyntaxError, ValueError):
+                        continue
+                if vectors:
+                    yield (build_feature_matrix(vectors).astype(np.float32),
+                           np.full(len(vectors), CLASSES.index(label), dtype=np.int8))
+    finally:
+        engine.dispose()
+
+
+def write_dataset(directory, chunks, shares=SPLIT_SHARES, seed=42):
+    """
+    Écrit les tranches (X, y) dans `directory` : un fichier binaire brut par partition, complété
+    tranche par tranche, et `dataset.json` (nombre de lignes). Chaque tranche est mélangée puis
+    répartie entre train, val et test selon `shares`.
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    rows = dict.fromkeys(SPLITS, 0)
+    files = {
+        split: (open(os.path.join(directory, f"X_{split}.f32"), "wb"),
+                open(os.path.join(directory, f"y_{split}.i8"), "wb"))
+        for split in SPLITS
+    }
+    try:
+        for X, y in chunks:
+            order = rng.permutation(len(y))
+            X, y = X[order], y[order]
+            bounds = np.rint(np.cumsum((0.0,) + tuple(shares)) * len(y)).astype(int)
+            for split, start, end in zip(SPLITS, bounds[:-1], bounds[1:]):
+                features, labels = files[split]
+                X[start:end].astype(np.float32).tofile(features)
+                y[start:end].astype(np.int8).tofile(labels)
+                rows[split] += int(end - start)
+    finally:
+        for features, labels in files.values():
+            features.close()
+            labels.close()
+
+    metadata = {"features": FEATURE_COUNT, "classes": list(CLASSES), "rows": rows}
+    with open(os.path.join(directory, "dataset.json"), "w", encoding="utf-8") as output:
+        json.dump(metadata, output)
+    return metadata
+
+
+def load_dataset(directory):
+    """Partitions du jeu de données en tableaux projetés en mémoire (lecture seule) : {partition: (X, y)}."""
+    with open(os.path.join(directory, "dataset.json"), encoding="utf-8") as source:
+        metadata = json.load(source)
+    dataset = {}
+    for split in SPLITS:
+        count = metadata["rows"][split]
+        if count == 0:
+            dataset[split] = (np.empty((0, metadata["features"]), dtype=np.float32), np.empty(0, dtype=np.int8))
+            continue
+        dataset[split] = (
+            np.memmap(os.path.join(directory, f"X_{split}.f32"), dtype=np.float32, mode="r",
+                      shape=(count, metadata["features"])),
+            np.memmap(os.path.join(directory, f"y_{split}.i8"), dtype=np.int8, mode="r", shape=(count,)),
+        )
+    return dataset
+
+
+def sample_configurations(count, seed=42):
+    """Configurations tirées au hasard dans l'espace de recherche (sans doublon)."""
+    rng = np.random.default_rng(seed)
+    configurations = []
+    for _ in range(count * 20):
+        configuration = {name: values[rng.integers(len(values))] for name, values in SEARCH_SPACE.items()}
+        if configuration not in configurations:
+            configurations.append(configuration)
+        if len(configurations) == count:
+            break
+    return configurations
+
+
+def build_model(configuration, early_stopping=True):
+    from xgboost import XGBClassifier
+
+    return XGBClassifier(
+        n_estimators=MAX_ESTIMATORS,
+        tree_method="hist",  # Histogrammes : données quantifiées, tableaux projetés en mémoire lus sans copie
+        n_jobs=1,
+        random_state=42,
+        eval_metric="logloss",
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS if early_stopping else None,
+        **configuration
+    )
+
+
+def measure_latency(model, X, repeats=200):
+    """Latence médiane (µs) d'une prédiction sur une seule ligne, comme pour une requête /recommend."""
+    row = np.ascontiguousarray(X[:1])
+    model.predict(row)
+    timings = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        model.predict(row)
+        timings[i] = time.perf_counter() - start
+    return float(np.median(timings) * 1e6)
+
+
+def export_forest(model, path, X):
+    """
+    Compile le modèle en tableaux plats (forest.CompiledForest) et l'enregistre dans `path` après
+    vérification sur X : toute prédiction différente du modèle d'origine fait échouer l'export.
+    """
+    forest = compile_xgboost(model, CLASSES)
+    parity = parity_check(forest, model, X[:PARITY_ROWS])
+    if parity["mismatches"]:
+        raise ValueError(f"Le modèle compilé diverge du modèle d'origine sur {parity['mismatches']} "
+                         f"ligne(s) sur {parity['rows']}.")
+    forest.metadata["parity"] = parity
+    forest.save(path)
+    return forest, parity
+
+
+def evaluate(configuration, directory, budget):
+    """
+    Essai d'une configuration sur les `budget` premières lignes d'entraînement, avec arrêt anticipé
+    sur la validation. Exécuté dans un processus du pool : le jeu de données est relu par projection.
+    """
+    dataset = load_dataset(directory)
+    X_train, y_train = dataset["train"]
+    X_val, y_val = (part[:VALIDATION_ROWS] for part in dataset["val"])
+
+    start = time.perf_counter()
+    model = build_model(configuration)
+    model.fit(X_train[:budget], y_train[:budget], eval_set=[(X_val, y_val)], verbose=False)
+    return {
+        "configuration": configuration,
+        "budget": budget,
+        "accuracy": float(np.mean(model.predict(X_val) == y_val)),
+        "latency_us": measure_latency(model, X_val),
+        "trees": int(model.best_iteration) + 1,
+        "training_seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def rank(results, accuracy_tolerance):
+    """
+    Classement précision / latence : les essais à moins de `accuracy_tolerance` de la meilleure
+    précision passent en tête, du plus rapide au plus lent, puis les autres par précision décroissante.
+    """
+    best = max(result["accuracy"] for result in results)
+    eligible = sorted((r for r in results if r["accuracy"] >= best - accuracy_tolerance),
+                      key=lambda r: (r["latency_us"], -r["accuracy"]))
+    others = sorted((r for r in results if r["accuracy"] < best - accuracy_tolerance),
+                    key=lambda r: (-r["accuracy"], r["latency_us"]))
+    return eligible + others
+
+
+def search(directory, trials=24, jobs=None, eta=3, min_budget=5000, accuracy_tolerance=0.005, seed=42):
+    """
+    Recherche d'hyperparamètres par divisions successives : toutes les configurations sont essayées
+    en parallèle sur un petit budget de lignes, seul le meilleur tiers (`eta`) continue avec un budget
+    multiplié par `eta`, jusqu'à la totalité des données d'entraînement. Chaque essai s'arrête de
+    lui-même quand la perte de validation ne baisse plus. Retourne (meilleur essai, tous les essais).
+    """
+    configurations = sample_configurations(trials, seed)
+    available = load_dataset(directory)["train"][1].shape[0]
+    budget = min(min_budget, available)
+    history = []
+    with ProcessPoolExecutor(jobs) as executor:
+        while True:
+            results = list(executor.map(evaluate, configurations, repeat(directory), repeat(budget)))
+            history.extend(results)
+            ranked = rank(results, accuracy_tolerance)
+            print(f"Budget {budget} lignes : {len(results)} essais, meilleur {ranked[0]['accuracy']:.4f} "
+                  f"en {ranked[0]['latency_us']:.1f} µs ({ranked[0]['trees']} arbres)")
+            if budget >= available or len(ranked) == 1:
+                return ranked[0], history
+            configurations = [result["configuration"] for result in ranked[:max(1, len(ranked) // eta)]]
+            budget = min(budget * eta, available)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entraînement du classifieur de méthode de résolution.")
+    parser.add_argument("--samples", type=int, default=100000, help="Taille du corpus synthétique")
+    parser.add_argument("--max-degree", type=int, default=9)
+    parser.add_argument("--coefficient-range", type=int, default=10)
+    parser.add_argument("--density", type=float, default=0.6, help="Probabilité qu'un coefficient soit non nul")
+    parser.add_argument("--quadratic-share", type=float, default=0.5)
+    parser.add_argument("--quadratique-database-url", help="Base du service quadratique (équations réelles)")
+    parser.add_argument("--newton-database-url", help="Base du service Newton (équations réelles)")
+    parser.add_argument("--dataset-dir", help="Dossier du jeu de données (par défaut : dossier temporaire)")
+    parser.add_argument("--reuse-dataset", action="store_true", help="Réutilise le jeu de données existant")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--trials", type=int, default=24)
+    parser.add_argument("--jobs", type=int, default=None, help="Essais en parallèle (par défaut : nombre de CPU)")
+    parser.add_argument("--accuracy-tolerance", type=float, default=0.005,
+                        help="Perte de précision acceptée pour un modèle plus rapide")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="method_classifier.pkl")
+    parser.add_argument("--forest-output", default="method_classifier.forest",
+                        help="Modèle compilé chargé par le service")
+    parser.add_argument("--export-only", action="store_true",
+                        help="Compile le modèle existant (--output) sans réentraîner")
+    args = parser.parse_args()
+
+    import joblib
+    from sklearn.metrics import classification_report
+
+    if args.export_only:
+        X_check, _ = generate_data(PARITY_ROWS, rng=np.random.default_rng(args.seed))
+        forest, parity = export_forest(joblib.load(args.output), args.forest_output, X_check)
+        print(f"Modèle compilé dans '{args.forest_output}' ({forest.trees} arbres) : {json.dumps(parity)}")
+        return
+
+    directory = args.dataset_dir or tempfile.mkdtemp(prefix="polynome-dataset-")
+    if not args.reuse_dataset:
+        sources = [synthetic_chunks(args.samples, args.chunk_size, args.seed, max_degree=args.max_degree,
+                                    coefficient_range=args.coefficient_range, density=args.density,
+                                    quadratic_share=args.quadratic_share)]
+        for label, url in (("Quadratique", args.quadratique_database_url), ("Newton", args.newton_database_url)):
+            if url:
+                sources.append(solver_chunks(url, label, args.chunk_size))
+        start = time.perf_counter()
+        metadata = write_dataset(directory, (chunk for source in sources for chunk in source), seed=args.seed)
+        print(f"Jeu de données écrit dans {directory} en {time.perf_counter() - start:.1f} s : {metadata['rows']}")
+
+    best, history = search(directory, args.trials, args.jobs, accuracy_tolerance=args.accuracy_tolerance,
+                           seed=args.seed)
+    print("Meilleure configuration :", json.dumps(best["configuration"]))
+
+    # Modèle final : meilleure configuration sur toutes les données d'entraînement
+    dataset = load_dataset(directory)
+    X_train, y_train = dataset["train"]
+    X_val, y_val = (part[:VALIDATION_ROWS] for part in dataset["val"])
+    X_test, y_test = dataset["test"]
+    model = build_model(best["configuration"])
+    model.set_params(n_jobs=os.cpu_count())
+    model.fit(X_train, y_train, eval_set=[(X_val, y_val)], verbose=False)
+
+    print("Rapport de classification :")
+    print(classification_report(y_test, model.predict(X_test), labels=range(len(CLASSES)), target_names=CLASSES))
+    print(f"Latence d'une prédiction : {measure_latency(model, X_test):.1f} µs ({int(model.best_iteration) + 1} arbres)")
+
+    with open(os.path.splitext(args.output)[0] + "_search.json", "w", encoding="utf-8") as output:
+        json.dump(history, output, indent=2)
+
+    # Sauvegarder le modèle d'origine puis sa version compilée (étiquettes incluses)
+    joblib.dump(model, args.output)
+    print(f"Modèle sauvegardé dans '{args.output}'")
+    forest, parity = export_forest(model, args.forest_output, X_test)
+    print(f"Modèle compilé sauvegardé dans '{args.forest_output}' : {parity['rows']} lignes identiques, "
+          f"latence {measure_latency(forest, X_test):.1f} µs")
+
+
+if __name__ == "__main__":
+    main()